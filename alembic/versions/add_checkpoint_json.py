@@ -0,0 +1,23 @@
+"""add translation_jobs.checkpoint_json for resumable pipelines
+
+Revision ID: d4e5f6a7b8c9
+Revises: c7d8e9f0a1b2
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'd4e5f6a7b8c9'
+down_revision = 'c7d8e9f0a1b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('translation_jobs', sa.Column('checkpoint_json', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('translation_jobs') as batch_op:
+        batch_op.drop_column('checkpoint_json')
@@ -0,0 +1,26 @@
+"""add glossaries.version and updated_at for worker-side glossary caching
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'f6a7b8c9d0e1'
+down_revision = 'e5f6a7b8c9d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('glossaries', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('glossaries', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute('UPDATE glossaries SET updated_at = created_at')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('glossaries') as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('version')
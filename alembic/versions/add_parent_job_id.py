@@ -0,0 +1,30 @@
+"""add translation_jobs.parent_job_id for multi-language requests
+
+Revision ID: c7d8e9f0a1b2
+Revises: b1c2d3e4f5a6
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'c7d8e9f0a1b2'
+down_revision = 'b1c2d3e4f5a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('translation_jobs') as batch_op:
+        batch_op.add_column(sa.Column('parent_job_id', sa.String(length=36), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_translation_jobs_parent_job_id', 'translation_jobs', ['parent_job_id'], ['id']
+        )
+        batch_op.create_index('ix_translation_jobs_parent_job_id', ['parent_job_id'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('translation_jobs') as batch_op:
+        batch_op.drop_index('ix_translation_jobs_parent_job_id')
+        batch_op.drop_constraint('fk_translation_jobs_parent_job_id', type_='foreignkey')
+        batch_op.drop_column('parent_job_id')
@@ -4,16 +4,18 @@ from redis import Redis
 
 
 # Lua script for atomic check-and-increment.
-# Returns 0 if the new count is within quota, or 1 if quota is exceeded.
+# Returns 0 if the new count is within quota, or 1 if quota is exceeded
+# (in which case nothing is charged).
 _CHECK_AND_INCREMENT_LUA = """
 local key = KEYS[1]
 local quota = tonumber(ARGV[1])
 local expiry = tonumber(ARGV[2])
+local amount = tonumber(ARGV[3])
 local current = tonumber(redis.call('GET', key) or '0')
-if current >= quota then
+if current + amount > quota then
     return 1
 end
-redis.call('INCR', key)
+redis.call('INCRBY', key, amount)
 redis.call('EXPIREAT', key, expiry)
 return 0
 """
@@ -30,16 +32,18 @@ def _midnight_timestamp() -> int:
     return int(midnight.timestamp())
 
 
-def check_and_increment_quota(org_id: str, daily_quota: int, redis_client: Redis) -> None:
+def check_and_increment_quota(org_id: str, daily_quota: int, redis_client: Redis, amount: int = 1) -> None:
     """Atomically check quota and increment if within limit.
 
     Uses a Lua script so the check+increment is a single atomic Redis operation,
     eliminating the TOCTOU race that existed with separate check/increment calls.
+    amount is the number of translations charged (one per target language);
+    they are charged all together or not at all.
     Raises 429 if the org has hit its daily translation quota.
     """
     key = _quota_key(org_id)
     midnight = _midnight_timestamp()
-    exceeded = redis_client.eval(_CHECK_AND_INCREMENT_LUA, 1, key, daily_quota, midnight)
+    exceeded = redis_client.eval(_CHECK_AND_INCREMENT_LUA, 1, key, daily_quota, midnight, amount)
     if exceeded:
         reset_at = datetime.fromtimestamp(midnight, UTC).isoformat()
         raise HTTPException(
@@ -13,7 +13,8 @@ from api.auth import authenticate_request
 from api.quota import check_and_increment_quota
 from db.database import get_db
 from db.models import TranslationJob
-from workers.tasks import run_translation_pipeline
+from workers.checkpoint import job_progress
+from workers.tasks import run_fanout_pipeline, run_translation_pipeline
 from workers.translator import SUPPORTED_TARGET_LANGUAGES
 
 logger = logging.getLogger(__name__)
@@ -41,7 +42,10 @@ LANGUAGES = [
 class TranslateRequest(BaseModel):
     content: str
     source_language: Literal["en"] = "en"
-    target_language: str
+    # Either one target_language, or target_languages for one job per language
+    # under a shared parent job (segmented once)
+    target_language: str | None = None
+    target_languages: list[str] | None = None
     # Tier controls human translator involvement:
     #   "instant"    — machine draft + AI scoring only, no human review
     #   "reviewed"   — machine draft reviewed and edited by a human translator
@@ -75,22 +79,68 @@ def create_translation_job(
         raise HTTPException(status_code=401, detail={"error": "missing_auth_header"})
     ctx = authenticate_request(authorization=authorization, db=db, redis_client=redis_client)
 
-    if request.target_language not in SUPPORTED_TARGET_LANGUAGES:
+    languages = _requested_languages(request)
+
+    if len(request.content) > 50_000:
+        raise HTTPException(status_code=422, detail={"error": "content_too_large"})
+
+    if request.target_languages is not None:
+        return _create_fanout_job(request, languages, ctx, db)
+
+    job_id = str(uuid.uuid4())
+    job = _new_job(request, job_id, request.target_language, ctx)
+    db.add(job)
+    db.commit()
+    db.refresh(job)  # ensure created_at is populated from DB
+
+    check_and_increment_quota(org_id=ctx.org_id, daily_quota=ctx.daily_quota, redis_client=redis_client)
+
+    try:
+        run_translation_pipeline.delay(job_id)
+    except Exception as e:
+        logger.error("Failed to enqueue pipeline for job %s: %s", job_id, e)
+        job.status = "failed"
+        job.error_message = "Failed to enqueue translation job"
+        db.commit()
+        raise HTTPException(status_code=503, detail={"error": "service_unavailable", "job_id": job_id})
+
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "tier": request.tier,
+        "source_language": request.source_language,
+        "target_language": request.target_language,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "links": {"self": f"/v1/translate/{job_id}"},
+    }
+
+
+def _requested_languages(request: TranslateRequest) -> list[str]:
+    if (request.target_language is None) == (request.target_languages is None):
+        raise HTTPException(
+            status_code=422,
+            detail={"error": "invalid_target_language", "message": "Send exactly one of target_language or target_languages"},
+        )
+    languages = (
+        list(dict.fromkeys(request.target_languages))
+        if request.target_languages is not None
+        else [request.target_language]
+    )
+    if not languages or any(lang not in SUPPORTED_TARGET_LANGUAGES for lang in languages):
         raise HTTPException(
             status_code=422,
             detail={"error": "unsupported_language", "supported": sorted(SUPPORTED_TARGET_LANGUAGES)},
         )
+    return languages
 
-    if len(request.content) > 50_000:
-        raise HTTPException(status_code=422, detail={"error": "content_too_large"})
 
-    job_id = str(uuid.uuid4())
-    job = TranslationJob(
+def _new_job(request: TranslateRequest, job_id: str, target_language: str, ctx, **overrides) -> TranslationJob:
+    fields = dict(
         id=job_id,
         org_id=ctx.org_id,
         api_key_id=ctx.api_key_id,
         source_language=request.source_language,
-        target_language=request.target_language,
+        target_language=target_language,
         tier=request.tier,
         content=request.content,
         content_type=request.content_type,
@@ -99,32 +149,65 @@ def create_translation_job(
         glossary_id=request.glossary_id,
         status="queued",
     )
-    db.add(job)
+    fields.update(overrides)
+    return TranslationJob(**fields)
+
+
+def _create_fanout_job(request: TranslateRequest, languages: list[str], ctx, db: Session) -> dict:
+    """One parent job plus a child job per language; the whole request is charged in one quota call."""
+    parent_id = str(uuid.uuid4())
+    # Webhooks fire per language from the child jobs
+    parent = _new_job(request, parent_id, "multi", ctx, callback_url=None)
+    children = [
+        _new_job(request, str(uuid.uuid4()), lang, ctx, parent_job_id=parent_id)
+        for lang in languages
+    ]
+    db.add(parent)
+    db.add_all(children)
     db.commit()
-    db.refresh(job)  # ensure created_at is populated from DB
+    db.refresh(parent)
 
-    check_and_increment_quota(org_id=ctx.org_id, daily_quota=ctx.daily_quota, redis_client=redis_client)
+    check_and_increment_quota(
+        org_id=ctx.org_id, daily_quota=ctx.daily_quota, redis_client=redis_client, amount=len(children)
+    )
 
     try:
-        run_translation_pipeline.delay(job_id)
+        run_fanout_pipeline.delay(parent_id)
     except Exception as e:
-        logger.error("Failed to enqueue pipeline for job %s: %s", job_id, e)
-        job.status = "failed"
-        job.error_message = "Failed to enqueue translation job"
+        logger.error("Failed to enqueue pipeline for job %s: %s", parent_id, e)
+        for job in [parent, *children]:
+            job.status = "failed"
+            job.error_message = "Failed to enqueue translation job"
         db.commit()
-        raise HTTPException(status_code=503, detail={"error": "service_unavailable", "job_id": job_id})
+        raise HTTPException(status_code=503, detail={"error": "service_unavailable", "job_id": parent_id})
 
     return {
-        "job_id": job_id,
+        "job_id": parent_id,
         "status": "queued",
         "tier": request.tier,
         "source_language": request.source_language,
-        "target_language": request.target_language,
-        "created_at": job.created_at.isoformat() if job.created_at else None,
-        "links": {"self": f"/v1/translate/{job_id}"},
+        "target_languages": languages,
+        "jobs": [
+            {"job_id": child.id, "target_language": child.target_language, "links": {"self": f"/v1/translate/{child.id}"}}
+            for child in children
+        ],
+        "created_at": parent.created_at.isoformat() if parent.created_at else None,
+        "links": {"self": f"/v1/translate/{parent_id}"},
     }
 
 
+def _combined_status(parent: TranslationJob, children: list[TranslationJob]) -> str:
+    """A parent's status once its children are running: theirs if they agree, else a summary."""
+    if parent.status != "dispatched" or not children:
+        return parent.status
+    statuses = {child.status for child in children}
+    if len(statuses) == 1:
+        return statuses.pop()
+    if statuses <= {"complete", "failed"}:
+        return "partially_failed"
+    return "in_progress"
+
+
 @router.get("/translate/{job_id}")
 def get_job(
     job_id: str,
@@ -150,6 +233,30 @@ def get_job(
         "completed_at": job.completed_at.isoformat() if job.completed_at else None,
     }
 
+    if job.parent_job_id:
+        response["parent_job_id"] = job.parent_job_id
+
+    progress = job_progress(job)
+    if progress is not None:
+        response["progress"] = progress
+
+    if job.target_language == "multi":
+        children = db.query(TranslationJob).filter(TranslationJob.parent_job_id == job.id).all()
+        response["status"] = _combined_status(job, children)
+        response["target_language"] = None
+        response["target_languages"] = [child.target_language for child in children]
+        response["jobs"] = [
+            {
+                "job_id": child.id,
+                "target_language": child.target_language,
+                "status": child.status,
+                "progress": job_progress(child),
+                "links": {"self": f"/v1/translate/{child.id}"},
+            }
+            for child in children
+        ]
+        return response
+
     if job.status == "complete":
         response["translated_content"] = job.translated_content
         response["quality_scores"] = job.quality_scores_json
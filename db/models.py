@@ -1,7 +1,7 @@
 from datetime import datetime, UTC
 from typing import Optional
-from sqlalchemy import String, Integer, Boolean, DateTime, Text, JSON, ForeignKey
-from sqlalchemy.orm import DeclarativeBase, relationship, mapped_column, Mapped
+from sqlalchemy import String, Integer, Boolean, DateTime, Text, JSON, ForeignKey, event
+from sqlalchemy.orm import DeclarativeBase, relationship, mapped_column, Mapped, object_session
 
 
 class Base(DeclarativeBase):
@@ -17,6 +17,12 @@ class Organization(Base):
     tier: Mapped[str] = mapped_column(String(20), nullable=False)
     daily_quota: Mapped[int] = mapped_column(Integer, nullable=False)
     active: Mapped[bool] = mapped_column(Boolean)
+    # Instant-tier jobs complete before quality scoring, which runs as its own
+    # task and sends a "scores_ready" webhook; overridable per request
+    defer_scoring: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Jobs also apply the shared glossaries for their language pair and this
+    # org's glossaries (workers/glossary_stack.py); overridable per request
+    stack_glossaries: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, insert_default=lambda: datetime.now(UTC))
 
     api_keys: Mapped[list["APIKey"]] = relationship("APIKey", back_populates="organization")
@@ -26,6 +32,8 @@ class Organization(Base):
         kwargs.setdefault("tier", "instant")
         kwargs.setdefault("daily_quota", 50)
         kwargs.setdefault("active", True)
+        kwargs.setdefault("defer_scoring", False)
+        kwargs.setdefault("stack_glossaries", False)
         super().__init__(**kwargs)
 
 
@@ -53,6 +61,11 @@ class TranslationJob(Base):
     id: Mapped[Optional[str]] = mapped_column(String(36), primary_key=True)
     org_id: Mapped[Optional[str]] = mapped_column(String(36), ForeignKey("organizations.id"), nullable=True)
     api_key_id: Mapped[Optional[str]] = mapped_column(String(36), ForeignKey("api_keys.id"), nullable=True)
+    # Set on the per-language child jobs of a multi-language request; the parent
+    # holds the shared source content and has target_language "multi"
+    parent_job_id: Mapped[Optional[str]] = mapped_column(
+        String(36), ForeignKey("translation_jobs.id"), nullable=True, index=True
+    )
     status: Mapped[str] = mapped_column(String(30), nullable=False)
     source_language: Mapped[str] = mapped_column(String(10), nullable=False)
     target_language: Mapped[str] = mapped_column(String(10), nullable=False)
@@ -63,6 +76,8 @@ class TranslationJob(Base):
     metadata_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     word_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     quality_scores_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # Resumable pipeline state (workers/checkpoint.py)
+    checkpoint_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     callback_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     glossary_id: Mapped[Optional[str]] = mapped_column(String(36), ForeignKey("glossaries.id"), nullable=True)
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -90,13 +105,31 @@ class Glossary(Base):
     language_pair: Mapped[str] = mapped_column(String(10), nullable=False)
     terms_json: Mapped[dict] = mapped_column(JSON, nullable=False)
     org_id: Mapped[Optional[str]] = mapped_column(String(36), ForeignKey("organizations.id"), nullable=True)
+    # Bumped on every ORM update (_bump_glossary_version below); workers key
+    # compiled glossaries on it (workers/glossary_cache.py)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
     created_at: Mapped[datetime] = mapped_column(DateTime, insert_default=lambda: datetime.now(UTC))
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        insert_default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
+        nullable=True,
+    )
 
     def __init__(self, **kwargs):
         kwargs.setdefault("terms_json", {})
         super().__init__(**kwargs)
 
 
+@event.listens_for(Glossary, "before_update")
+def _bump_glossary_version(mapper, connection, target: Glossary) -> None:
+    if not object_session(target).is_modified(target, include_collections=False):
+        return  # flushed as dirty without a net change: no UPDATE, so no new version
+    # Incremented in SQL, so concurrent edits each count instead of one
+    # overwriting the other (or failing, as optimistic locking would)
+    target.version = Glossary.version + 1
+
+
 class Reviewer(Base):
     """A professional human translator who reviews and edits machine-generated drafts.
 
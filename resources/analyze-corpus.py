@@ -36,7 +36,7 @@ _project_root = Path(__file__).parent.parent
 if str(_project_root) not in sys.path:
     sys.path.insert(0, str(_project_root))
 
-from workers.claude_runner import run_claude_p  # tmux-based, bypasses nested-session block
+from workers.claude_runner import run_claude_p  # warm executor pool, bypasses nested-session block
 
 RESOURCES_DIR = Path(__file__).parent
 CORPUS_PATH = RESOURCES_DIR / "corpus.jsonl"
@@ -57,7 +57,7 @@ SYNTHESIS_TIMEOUT = 360   # seconds — phase 3 prose report is much larger
 # ---------------------------------------------------------------------------
 
 def run_claude(prompt: str, label: str = "", timeout: int = CLAUDE_TIMEOUT) -> str | None:
-    """Run claude -p via tmux (bypasses nested-session restriction)."""
+    """Run claude -p via the shared runner (bypasses nested-session restriction)."""
     result = run_claude_p(prompt, session_prefix="analyze", timeout=timeout)
     if result is None:
         print(f"  [timeout/error] {label}", file=sys.stderr)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+apply_glossary cost with the compiled matcher vs term-by-term substitution.
+
+Builds a synthetic glossary of --terms entries (the corpus glossary's terms,
+padded with generated place and agency names), applies it to synthetic
+articles both ways — GlossaryMatcher.apply() and apply_sequential(), the
+one-regex-per-term reference — checks that every segment comes out
+identical, and reports compile time and per-segment latency.
+
+Usage:
+    python3 scripts/glossary-benchmark.py --terms 10000 --segments 500
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+_project_root = Path(__file__).parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+SYLLABLES = ["ber", "cam", "den", "ford", "ham", "lin", "mont", "new", "ton", "ville", "wood", "brook", "field"]
+SUFFIXES = ["Township", "Borough", "Board of Education", "Police Department", "County", "Housing Authority"]
+FILLER = "the council said on Tuesday that residents of the town would see new budget plans for schools".split()
+
+
+def build_glossary(size: int, rng: random.Random) -> dict[str, str]:
+    corpus = json.loads((_project_root / "resources" / "corpus-glossary.json").read_text())
+    terms = {t["term_en"]: t["term_es"] for t in corpus}
+    while len(terms) < size:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+        source = f"{name} {rng.choice(SUFFIXES)}" if rng.random() < 0.6 else name
+        terms[source] = f"{source} (ES)"
+    return terms
+
+
+def build_segments(terms: dict[str, str], count: int, rng: random.Random) -> list[str]:
+    sources = list(terms)
+    segments = []
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(15, 60))]
+        for _ in range(rng.randint(0, 4)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(sources))
+        segments.append(" ".join(words) + ".")
+    return segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Glossary matcher benchmark")
+    parser.add_argument("--terms", type=int, default=10000)
+    parser.add_argument("--segments", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    from workers.glossary import GlossaryMatcher
+
+    rng = random.Random(args.seed)
+    terms = build_glossary(args.terms, rng)
+    segments = build_segments(terms, args.segments, rng)
+
+    start = time.perf_counter()
+    matcher = GlossaryMatcher(terms)
+    compile_seconds = time.perf_counter() - start
+    print(f"{len(terms)} terms, {len(segments)} segments; compiled={matcher.compiled} in {compile_seconds:.2f}s")
+
+    timings = {"compiled": [], "sequential": []}
+    outputs = {"compiled": [], "sequential": []}
+    for mode, apply in (("compiled", matcher.apply), ("sequential", matcher.apply_sequential)):
+        for text in segments:
+            start = time.perf_counter()
+            outputs[mode].append(apply(text))
+            timings[mode].append(time.perf_counter() - start)
+        ms = [t * 1000 for t in timings[mode]]
+        print(f"  {mode:<10} per segment mean={statistics.mean(ms):.3f}ms max={max(ms):.3f}ms total={sum(ms):.0f}ms")
+
+    mismatches = sum(a != b for a, b in zip(outputs["compiled"], outputs["sequential"]))
+    speedup = sum(timings["sequential"]) / sum(timings["compiled"])
+    print(f"  {speedup:.0f}x faster; {mismatches} segment(s) differ")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Offline load and latency test for the claude -p translation path.
+
+Runs synthetic translation jobs through translate_segments() against the fake
+claude backend (workers/fake_claude.py) and reports throughput plus p50/p95/p99
+latency per claude call and per job. No network, no subscription capacity.
+
+Modes:
+  cli        real runner (warm pool + run_cli + timeout --foreground) exec'ing
+             scripts/fake-claude — measures our own process overhead too
+  inprocess  FakeClaudeBackend inside this process — isolates pipeline logic
+
+Usage:
+    python3 scripts/load-test.py --jobs 20 --segments 60 --concurrency 4
+    python3 scripts/load-test.py --mode inprocess --latency lognormal:0:0.5 --seed 7
+    python3 scripts/load-test.py --error-rate 0.05 --malformed-rate 0.05 --timeout-rate 0.01
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+_project_root = Path(__file__).parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+SAMPLE_PARAGRAPHS = [
+    "The Montclair Board of Education voted 5-2 on Tuesday to approve the $118 million budget.",
+    "Gov. Phil Murphy said the state would expand NJ FamilyCare coverage to 40,000 more residents.",
+    "Residents packed the council chambers to oppose the proposed warehouse on Route 1.",
+    "ICE agents detained three people outside the Elizabeth courthouse, according to witnesses.",
+    "Sign up for our newsletter to get the latest local news delivered to your inbox.",
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def summarize(label: str, values: list[float]) -> str:
+    if not values:
+        return f"  {label:<12} n=0"
+    return (
+        f"  {label:<12} n={len(values):<5} mean={statistics.mean(values):.3f}s "
+        f"p50={percentile(values, 50):.3f}s p95={percentile(values, 95):.3f}s "
+        f"p99={percentile(values, 99):.3f}s max={max(values):.3f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline claude -p load test")
+    parser.add_argument("--mode", choices=["cli", "inprocess"], default="cli")
+    parser.add_argument("--jobs", type=int, default=10)
+    parser.add_argument("--segments", type=int, default=60, help="segments per job")
+    parser.add_argument("--concurrency", type=int, default=2, help="jobs in flight at once")
+    parser.add_argument("--language", default="es")
+    parser.add_argument("--latency", default="uniform:0.2:0.8")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--seed", default="1")
+    args = parser.parse_args()
+
+    # Configure before importing workers.* — these are read at import time
+    os.environ["HAWK_FAKE_CLAUDE_LATENCY"] = args.latency
+    os.environ["HAWK_FAKE_CLAUDE_ERROR_RATE"] = str(args.error_rate)
+    os.environ["HAWK_FAKE_CLAUDE_TIMEOUT_RATE"] = str(args.timeout_rate)
+    os.environ["HAWK_FAKE_CLAUDE_MALFORMED_RATE"] = str(args.malformed_rate)
+    os.environ["HAWK_FAKE_CLAUDE_SEED"] = args.seed
+    if args.mode == "cli":
+        os.environ["HAWK_CLAUDE_BIN"] = str(_project_root / "scripts" / "fake-claude")
+        os.environ["HAWK_CLAUDE_BACKEND"] = "cli"
+    else:
+        os.environ["HAWK_CLAUDE_BACKEND"] = "fake"
+
+    from workers import claude_runner
+    from workers.translator import translate_segments
+
+    call_latencies: list[float] = []
+    failed_calls = 0
+    lock = threading.Lock()
+    inner = claude_runner.get_backend()
+
+    class TimedBackend(claude_runner.ClaudeBackend):
+        name = f"timed-{inner.name}"
+
+        def run(self, prompt, session_prefix, timeout, on_output=None):
+            nonlocal failed_calls
+            start = time.monotonic()
+            output = inner.run(prompt, session_prefix, timeout, on_output)
+            with lock:
+                call_latencies.append(time.monotonic() - start)
+                failed_calls += output is None
+            return output
+
+    claude_runner.set_backend(TimedBackend())
+
+    def run_job(job_num: int) -> tuple[float, int]:
+        segments = [
+            {
+                "index": i,
+                "tag": "p",
+                "text": f"{SAMPLE_PARAGRAPHS[i % len(SAMPLE_PARAGRAPHS)]} (job {job_num}, para {i})",
+                "inner_html": "",
+                "translated": None,
+            }
+            for i in range(args.segments)
+        ]
+        start = time.monotonic()
+        translate_segments(segments, target_language=args.language)
+        return time.monotonic() - start, sum(1 for s in segments if s.get("needs_review"))
+
+    print(f"Running {args.jobs} jobs x {args.segments} segments, concurrency {args.concurrency}, mode {args.mode}")
+    wall_start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(run_job, range(args.jobs)))
+    wall = time.monotonic() - wall_start
+
+    job_latencies = [r[0] for r in results]
+    fallback_segments = sum(r[1] for r in results)
+    total_segments = args.jobs * args.segments
+    print(f"\nWall time {wall:.2f}s — {args.jobs / wall:.2f} jobs/s, "
+          f"{len(call_latencies) / wall:.2f} claude calls/s, {total_segments / wall:.1f} segments/s")
+    print(summarize("claude call", call_latencies))
+    print(summarize("job", job_latencies))
+    print(f"  failed calls {failed_calls}/{len(call_latencies)}; "
+          f"segments needing review {fallback_segments}/{total_segments}")
+
+    if args.mode == "cli":
+        claude_runner.get_pool().close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Prompt size and latency of Spanish batches with full vs filtered style rules.
+
+Builds Spanish translation prompts for synthetic articles the way the
+translator does (same batch planner, same template) twice — once with the
+full SPANISH_STYLE_RULES and once with the blocks workers/style_rules.py
+selects — and reports prompt bytes, the classifier's own cost, and how often
+it fell back to the full rules.
+
+Latency is measured only with --live, which sends each prompt to the real
+claude CLI (uses subscription capacity); output length is the same in both
+modes, so the difference is the cost of reading the longer prompt.
+
+Usage:
+    python3 scripts/style-rules-benchmark.py --articles 20 --segments 30
+    python3 scripts/style-rules-benchmark.py --articles 2 --segments 10 --live
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+_project_root = Path(__file__).parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+SAMPLE_PARAGRAPHS = [
+    "The Montclair Board of Education voted 5-2 on Tuesday to approve the $118 million budget.",
+    "Gov. Phil Murphy said the state would expand NJ FamilyCare coverage to 40,000 more residents.",
+    "Residents packed the council chambers to oppose the proposed warehouse on Route 1.",
+    "ICE agents detained three people outside the Elizabeth courthouse, according to witnesses.",
+    "Sign up for our newsletter to get the latest local news delivered to your inbox.",
+    "The library will stay open later on weekends starting next month.",
+    "Parents lined up outside the school well before the doors opened.",
+    "Volunteers planted trees along the river path over the weekend.",
+    "The bakery on Main Street has been run by the same family for three generations.",
+    "Families who moved from Pennsylvania said rents here were already out of reach.",
+    "The bill, A1475, would cap insulin costs for people without insurance.",
+    "Neighbors described the fire as fast-moving and said nobody was hurt.",
+]
+
+
+def build_articles(count: int, segments: int, seed: int) -> list[list[str]]:
+    rng = random.Random(seed)
+    return [[rng.choice(SAMPLE_PARAGRAPHS) for _ in range(segments)] for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spanish style-rule filtering benchmark")
+    parser.add_argument("--articles", type=int, default=20)
+    parser.add_argument("--segments", type=int, default=30, help="segments per article")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--live", action="store_true", help="send prompts to the real claude CLI")
+    args = parser.parse_args()
+
+    from workers import style_rules
+    from workers.claude_runner import run_claude_p
+    from workers.batching import get_planner
+    from workers.translator import BATCH_SIZE, _build_prompt, _prompt_overhead
+
+    batches = []
+    for article in build_articles(args.articles, args.segments, args.seed):
+        segments = [{"text": text} for text in article]
+        batches.extend(
+            [s["text"] for s in batch.segments]
+            for batch in get_planner().plan(segments, "es", _prompt_overhead("es"), max_segments=BATCH_SIZE)
+        )
+
+    classify_seconds = []
+    full_fallbacks = 0
+    sizes = {"full": [], "filtered": []}
+    prompts = {"full": [], "filtered": []}
+    for texts in batches:
+        start = time.perf_counter()
+        full_fallbacks += style_rules.select_blocks(texts) is None
+        classify_seconds.append(time.perf_counter() - start)
+        for mode, enabled in (("full", False), ("filtered", True)):
+            with patch.object(style_rules, "STYLE_FILTER", enabled):
+                prompt = _build_prompt(texts, "es")
+            sizes[mode].append(len(prompt.encode()))
+            prompts[mode].append(prompt)
+
+    print(f"{len(batches)} Spanish batches from {args.articles} articles x {args.segments} segments")
+    for mode in ("full", "filtered"):
+        print(f"  {mode:<9} prompt bytes mean={statistics.mean(sizes[mode]):.0f} "
+              f"max={max(sizes[mode])} total={sum(sizes[mode])}")
+    saved = 1 - sum(sizes["filtered"]) / sum(sizes["full"])
+    print(f"  saved {saved:.1%} of prompt bytes; full rules sent for {full_fallbacks}/{len(batches)} batches")
+    print(f"  classifier mean={statistics.mean(classify_seconds) * 1e6:.0f}us "
+          f"max={max(classify_seconds) * 1e6:.0f}us per batch")
+
+    if not args.live:
+        print("  (latency not measured; rerun with --live)")
+        return
+
+    for mode in ("full", "filtered"):
+        durations = []
+        for prompt in prompts[mode]:
+            start = time.monotonic()
+            run_claude_p(prompt, session_prefix="bench-style", target_language="es")
+            durations.append(time.monotonic() - start)
+        print(f"  {mode:<9} claude latency mean={statistics.mean(durations):.2f}s "
+              f"p50={statistics.median(durations):.2f}s max={max(durations):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -126,6 +126,7 @@ def test_get_job_status(mock_db):
     mock_job.tier = "instant"
     mock_job.source_language = "en"
     mock_job.target_language = "es"
+    mock_job.parent_job_id = None
     mock_job.word_count = 10
     mock_job.translated_content = "<p>Hola mundo.</p>"
     mock_job.quality_scores_json = None
@@ -243,3 +244,89 @@ def test_translate_returns_503_when_celery_unavailable(mock_db, mock_auth_ctx):
         )
     assert response.status_code == 503
     assert response.json()["detail"]["error"] == "service_unavailable"
+
+
+def test_translate_multiple_languages_creates_parent_and_children(mock_db, mock_auth_ctx):
+    with patch("api.routes.translate.authenticate_request", return_value=mock_auth_ctx), \
+         patch("api.routes.translate.check_and_increment_quota") as mock_quota, \
+         patch("api.routes.translate.run_fanout_pipeline") as mock_fanout, \
+         patch("api.routes.translate.run_translation_pipeline") as mock_single:
+        response = client.post(
+            "/v1/translate",
+            headers={"Authorization": "Bearer hawk_live_test123"},
+            json={"content": "<p>Hello world.</p>", "target_languages": ["es", "pt", "ht", "es"]},
+        )
+    assert response.status_code == 202
+    data = response.json()
+    assert data["target_languages"] == ["es", "pt", "ht"]
+    assert [j["target_language"] for j in data["jobs"]] == ["es", "pt", "ht"]
+    mock_quota.assert_called_once()
+    assert mock_quota.call_args.kwargs["amount"] == 3
+    mock_fanout.delay.assert_called_once_with(data["job_id"])
+    mock_single.delay.assert_not_called()
+    children = mock_db.add_all.call_args[0][0]
+    assert all(child.parent_job_id == data["job_id"] for child in children)
+
+
+def test_translate_requires_exactly_one_language_field(mock_db, mock_auth_ctx):
+    with patch("api.routes.translate.authenticate_request", return_value=mock_auth_ctx):
+        response = client.post(
+            "/v1/translate",
+            headers={"Authorization": "Bearer hawk_live_test123"},
+            json={"content": "<p>Hi</p>", "target_language": "es", "target_languages": ["pt"]},
+        )
+    assert response.status_code == 422
+    assert response.json()["detail"]["error"] == "invalid_target_language"
+
+
+def test_translate_rejects_unsupported_language_in_list(mock_db, mock_auth_ctx):
+    with patch("api.routes.translate.authenticate_request", return_value=mock_auth_ctx):
+        response = client.post(
+            "/v1/translate",
+            headers={"Authorization": "Bearer hawk_live_test123"},
+            json={"content": "<p>Hi</p>", "target_languages": ["es", "xx"]},
+        )
+    assert response.status_code == 422
+    assert response.json()["detail"]["error"] == "unsupported_language"
+
+
+def test_get_parent_job_lists_children(mock_db):
+    mock_ctx = MagicMock()
+    mock_ctx.org_id = "org-123"
+    parent = MagicMock(
+        id="parent-1", org_id="org-123", status="dispatched", tier="instant", source_language="en",
+        target_language="multi", parent_job_id=None, word_count=None, created_at=None, completed_at=None,
+    )
+    children = [
+        MagicMock(id="child-es", target_language="es", status="complete"),
+        MagicMock(id="child-pt", target_language="pt", status="scoring"),
+    ]
+    mock_db.get.return_value = parent
+    mock_db.query.return_value.filter.return_value.all.return_value = children
+
+    with patch("api.routes.translate.authenticate_request", return_value=mock_ctx):
+        response = client.get("/v1/translate/parent-1", headers={"Authorization": "Bearer hawk_live_test123"})
+    data = response.json()
+    assert data["status"] == "in_progress"
+    assert data["target_languages"] == ["es", "pt"]
+    assert [j["status"] for j in data["jobs"]] == ["complete", "scoring"]
+
+    children[1].status = "complete"
+    with patch("api.routes.translate.authenticate_request", return_value=mock_ctx):
+        response = client.get("/v1/translate/parent-1", headers={"Authorization": "Bearer hawk_live_test123"})
+    assert response.json()["status"] == "complete"
+
+
+def test_get_job_reports_progress(mock_db):
+    mock_ctx = MagicMock()
+    mock_ctx.org_id = "org-123"
+    job = MagicMock(
+        id="job-abc", org_id="org-123", status="translating", tier="instant", source_language="en",
+        target_language="es", parent_job_id=None, word_count=None, created_at=None, completed_at=None,
+        checkpoint_json={"stage": "translating", "segments": [{}, {}, {}], "translated": [0, 1], "scored": []},
+    )
+    mock_db.get.return_value = job
+
+    with patch("api.routes.translate.authenticate_request", return_value=mock_ctx):
+        response = client.get("/v1/translate/job-abc", headers={"Authorization": "Bearer hawk_live_test123"})
+    assert response.json()["progress"]["summary"] == "2 of 3 segments translated"
@@ -0,0 +1,98 @@
+from workers.batching import (
+    CHAR_BUDGET,
+    MAX_TIMEOUT,
+    MIN_CHAR_BUDGET,
+    MIN_TIMEOUT,
+    BatchPlanner,
+)
+
+
+def make_segment(text, index=0):
+    return {"index": index, "tag": "p", "text": text, "inner_html": f"<p>{text}</p>", "translated": None}
+
+
+def test_plan_packs_short_segments_up_to_max_segments():
+    segments = [make_segment("Cell.", i) for i in range(120)]
+    batches = BatchPlanner().plan(segments, "es", max_segments=50)
+    assert [len(b.segments) for b in batches] == [50, 50, 20]
+    assert not any(b.full for b in batches)
+
+
+def test_plan_splits_long_segments_by_character_budget():
+    paragraph = "x" * 2000
+    segments = [make_segment(paragraph, i) for i in range(20)]
+    batches = BatchPlanner().plan(segments, "pt", max_segments=50)
+    assert len(batches) > 1
+    assert all(b.chars <= CHAR_BUDGET for b in batches)
+    assert [s["index"] for b in batches for s in b.segments] == list(range(20))
+
+
+def test_overhead_reduces_batch_capacity():
+    segments = [make_segment("x" * 1000, i) for i in range(40)]
+    planner = BatchPlanner()
+    without = planner.plan(segments, "es")
+    with_rules = planner.plan(segments, "es", overhead_chars=6000)
+    assert len(with_rules) > len(without)
+
+
+def test_oversized_segment_gets_its_own_batch():
+    segments = [make_segment("a"), make_segment("x" * (CHAR_BUDGET * 2)), make_segment("b")]
+    batches = BatchPlanner().plan(segments, "fr")
+    assert [len(b.segments) for b in batches] == [1, 1, 1]
+
+
+def test_timeout_scales_with_batch_size_within_bounds():
+    planner = BatchPlanner()
+    assert planner.timeout_for("es", 0) == MIN_TIMEOUT
+    assert planner.timeout_for("es", 10_000) > planner.timeout_for("es", 2_000)
+    assert planner.timeout_for("es", 10_000_000) == MAX_TIMEOUT
+
+
+def test_timeout_floor_is_the_unplanned_timeout():
+    from workers.translator import SUBPROCESS_TIMEOUT
+
+    assert BatchPlanner().timeout_for("pt", 10) >= SUBPROCESS_TIMEOUT
+
+
+def test_timeout_counts_prompt_overhead():
+    planner = BatchPlanner()
+    assert planner.timeout_for("es", 8_000, overhead_chars=5_000) > planner.timeout_for("es", 8_000)
+
+
+def test_timeouts_raise_the_timeout_even_as_batches_shrink():
+    planner = BatchPlanner()
+    before = planner.timeout_for("es", 10_000)
+    for _ in range(3):
+        chars = planner.budget("es")
+        timeout = planner.timeout_for("es", chars)
+        planner.observe("es", chars=chars, duration=timeout, timeout=timeout, timed_out=True)
+    assert planner.budget("es") < CHAR_BUDGET
+    assert planner.timeout_for("es", planner.budget("es")) > before
+
+
+def test_timeouts_shrink_the_budget_for_that_language_only():
+    planner = BatchPlanner()
+    for _ in range(20):
+        planner.observe("es", chars=10_000, duration=60, timeout=60, timed_out=True)
+    assert planner.budget("es") == MIN_CHAR_BUDGET
+    assert planner.budget("pt") == CHAR_BUDGET
+
+
+def test_fast_full_batches_grow_the_budget():
+    planner = BatchPlanner()
+    planner.observe("es", chars=10_000, duration=5, timeout=60, timed_out=False, full=True)
+    assert planner.budget("es") > CHAR_BUDGET
+
+
+def test_partial_batches_do_not_grow_the_budget():
+    planner = BatchPlanner()
+    planner.observe("es", chars=100, duration=5, timeout=60, timed_out=False, full=False)
+    assert planner.budget("es") == CHAR_BUDGET
+
+
+def test_slow_calls_raise_the_learned_timeout():
+    planner = BatchPlanner()
+    before = planner.timeout_for("ko", 5_000)
+    for _ in range(10):
+        planner.observe("ko", chars=5_000, duration=70, timeout=120, timed_out=False)
+    assert planner.timeout_for("ko", 5_000) > before
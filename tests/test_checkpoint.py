@@ -0,0 +1,80 @@
+from unittest.mock import MagicMock
+
+from workers.checkpoint import JobCheckpoint, job_progress
+
+
+def make_segments(n):
+    return [{"index": i, "text": f"S{i}.", "translated": None} for i in range(n)]
+
+
+def test_progress_counts_finished_batches():
+    job = MagicMock(checkpoint_json=None)
+    checkpoint = JobCheckpoint(job, MagicMock())
+    assert job_progress(job) is None
+
+    checkpoint.start(make_segments(4), "")
+    batch = checkpoint.pending_translation()[:3]
+    for seg in batch:
+        seg["translated"] = "T"
+    checkpoint.record_translated(batch)
+
+    progress = job_progress(job)
+    assert progress["segments_translated"] == 3
+    assert progress["summary"] == "3 of 4 segments translated"
+    assert [s["index"] for s in JobCheckpoint(job, MagicMock()).pending_translation()] == [3]
+
+
+def test_every_record_commits_a_new_value():
+    job = MagicMock(checkpoint_json=None)
+    db = MagicMock()
+    checkpoint = JobCheckpoint(job, db)
+    checkpoint.start(make_segments(1), "")
+    first = job.checkpoint_json
+    checkpoint.record_scores([0], [])
+    assert job.checkpoint_json is not first
+    assert first["scored"] == []
+    assert db.commit.call_count == 2
+
+
+def test_fallbacks_are_checkpointed_with_their_flag():
+    job = MagicMock(checkpoint_json=None)
+    checkpoint = JobCheckpoint(job, MagicMock())
+    checkpoint.start(make_segments(1), "")
+    seg = dict(checkpoint.segments[0], translated="S0.", needs_review=True)
+    checkpoint.record_translated([seg])
+    assert job.checkpoint_json["segments"][0]["needs_review"] is True
+
+
+def test_translator_copies_are_applied_only_when_recorded():
+    job = MagicMock(checkpoint_json=None)
+    checkpoint = JobCheckpoint(job, MagicMock())
+    checkpoint.start(make_segments(2), "")
+    pending = checkpoint.pending_translation()
+    pending[0]["translated"] = "T0"
+    assert checkpoint.segments[0]["translated"] is None
+    checkpoint.record_translated(pending[:1])
+    assert checkpoint.segments[0]["translated"] == "T0"
+    assert checkpoint.state["translated"] == [0]
+
+
+def test_each_batch_is_written_to_the_database():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from db.models import Base, TranslationJob
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(TranslationJob(id="job-1", status="translating", source_language="en", target_language="es",
+                              tier="instant", content="", content_type="article"))
+        db.commit()
+        checkpoint = JobCheckpoint(db.get(TranslationJob, "job-1"), db)
+        checkpoint.start(make_segments(3), "")
+        for seg in checkpoint.pending_translation():
+            seg["translated"] = f"T{seg['index']}"
+            checkpoint.record_translated([seg])
+            with Session(engine) as reader:
+                saved = reader.get(TranslationJob, "job-1").checkpoint_json
+            assert saved["translated"] == list(range(seg["index"] + 1))
+            assert saved["segments"][seg["index"]]["translated"] == f"T{seg['index']}"
@@ -0,0 +1,322 @@
+import stat
+import textwrap
+import threading
+
+import pytest
+
+from workers.claude_runner import ClaudeProcessPool
+
+
+def write_fake_claude(path, body: str) -> str:
+    """Write an executable stand-in for the claude CLI and return its path."""
+    script = path / "claude"
+    script.write_text("#!/usr/bin/env python3\nimport os, sys, time\n" + textwrap.dedent(body))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script)
+
+
+@pytest.fixture
+def echo_claude(tmp_path, monkeypatch):
+    """Fake claude that echoes the prompt back with its parent pid.
+
+    Set both in the environment (for pool executor processes) and on the
+    module (for in-process run_cli calls).
+    """
+    from workers import claude_runner
+
+    fake = write_fake_claude(tmp_path, """
+        prompt = sys.argv[sys.argv.index("-p") + 1]
+        if prompt == "sleep":
+            time.sleep(30)
+        if prompt.startswith("nap"):
+            time.sleep(0.4)
+        if prompt == "stream":
+            for part in ["one ", "two ", "three"]:
+                sys.stdout.write(part)
+                sys.stdout.flush()
+                time.sleep(0.05)
+            sys.exit(0)
+        if prompt != "empty":
+            print(f"{prompt}|{os.getppid()}")
+    """)
+    monkeypatch.setenv("HAWK_CLAUDE_BIN", fake)
+    monkeypatch.setattr(claude_runner, "CLAUDE_BIN", fake)
+
+
+def test_pool_returns_cli_output(echo_claude):
+    pool = ClaudeProcessPool(size=1)
+    try:
+        output = pool.run("Hola", session_prefix="test", timeout=10)
+    finally:
+        pool.close()
+    assert output is not None
+    assert output.startswith("Hola|")
+
+
+def test_pool_returns_none_for_empty_output(echo_claude):
+    pool = ClaudeProcessPool(size=1)
+    try:
+        assert pool.run("empty", session_prefix="test", timeout=10) is None
+    finally:
+        pool.close()
+
+
+def test_pool_reuses_warm_executor(echo_claude):
+    pool = ClaudeProcessPool(size=1, max_calls=10)
+    try:
+        executor = pool._acquire()
+        pid = executor.proc.pid
+        pool._release(executor, healthy=True)
+        pool.run("one", session_prefix="test", timeout=10)
+        pool.run("two", session_prefix="test", timeout=10)
+        executor = pool._acquire()
+        assert executor.proc.pid == pid
+        pool._release(executor, healthy=True)
+    finally:
+        pool.close()
+
+
+def test_pool_recycles_after_max_calls(echo_claude):
+    pool = ClaudeProcessPool(size=1, max_calls=1)
+    try:
+        executor = pool._acquire()
+        first_pid = executor.proc.pid
+        pool._release(executor, healthy=True)
+        pool.run("one", session_prefix="test", timeout=10)
+        executor = pool._acquire()
+        assert executor.proc.pid != first_pid
+        pool._release(executor, healthy=True)
+    finally:
+        pool.close()
+
+
+def test_pool_replaces_dead_executor(echo_claude):
+    pool = ClaudeProcessPool(size=1)
+    try:
+        executor = pool._acquire()
+        executor.proc.kill()
+        executor.proc.wait()
+        pool._release(executor, healthy=True)
+        assert pool.run("alive", session_prefix="test", timeout=10).startswith("alive|")
+    finally:
+        pool.close()
+
+
+def test_pool_waiters_start_a_replacement_for_a_retired_executor(echo_claude):
+    """With every executor recycled after one call, callers queued on a full pool still get served."""
+    pool = ClaudeProcessPool(size=1, max_calls=1)
+    results = []
+
+    def call(n):
+        results.append(pool.run(f"nap{n}", session_prefix="test", timeout=10))
+
+    threads = [threading.Thread(target=call, args=(n,), daemon=True) for n in range(3)]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=20)
+        assert not any(t.is_alive() for t in threads)
+        assert sorted(r.split("|")[0] for r in results) == ["nap0", "nap1", "nap2"]
+    finally:
+        pool.close()
+
+
+def test_pool_takes_fleet_slots_only_once_an_executor_is_free(echo_claude, monkeypatch):
+    """Callers queued for the one local executor must not hold fleet-wide slots meanwhile."""
+    from contextlib import contextmanager
+
+    from workers import claude_runner
+
+    lock = threading.Lock()
+    held = [0, 0]  # current, peak
+
+    class CountingGovernor:
+        @contextmanager
+        def slot(self, timeout):
+            with lock:
+                held[0] += 1
+                held[1] = max(held)
+            try:
+                yield True
+            finally:
+                with lock:
+                    held[0] -= 1
+
+    monkeypatch.setattr(claude_runner, "get_governor", lambda: CountingGovernor())
+    pool = ClaudeProcessPool(size=1)
+    threads = [
+        threading.Thread(target=pool.run, args=(f"nap{n}", "test", 10), daemon=True) for n in range(3)
+    ]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=20)
+        assert not any(t.is_alive() for t in threads)
+    finally:
+        pool.close()
+    assert held == [0, 1]
+
+
+def test_pool_timeout_returns_none(echo_claude):
+    pool = ClaudeProcessPool(size=1)
+    try:
+        assert pool.run("sleep", session_prefix="test", timeout=1) is None
+    finally:
+        pool.close()
+
+
+def test_run_claude_p_uses_pool(monkeypatch):
+    from workers import claude_runner
+
+    class FakePool:
+        def run(self, prompt, session_prefix, timeout, on_output=None):
+            return f"pooled:{prompt}"
+
+    monkeypatch.setattr(claude_runner, "POOL_SIZE", 2)
+    monkeypatch.setattr(claude_runner, "get_pool", lambda: FakePool())
+    assert claude_runner.run_claude_p("hi", session_prefix="test") == "pooled:hi"
+
+
+def test_pool_size_must_be_positive():
+    with pytest.raises(ValueError):
+        ClaudeProcessPool(size=0)
+
+
+def test_run_cli_reports_exit_code_and_output(echo_claude):
+    from workers.claude_runner import run_cli
+
+    result = run_cli("Hola", timeout=10)
+    assert result.exit_code == 0
+    assert result.text.startswith("Hola|")
+    assert result.timed_out is False
+
+
+def test_run_cli_timeout_uses_timeout_exit_code(echo_claude):
+    from workers.claude_runner import run_cli
+
+    result = run_cli("sleep", timeout=1)
+    assert result.timed_out is True
+    assert result.exit_code == 124
+
+
+def test_run_cli_missing_binary_reports_exit_code(monkeypatch):
+    from workers import claude_runner
+
+    monkeypatch.setattr(claude_runner, "CLAUDE_BIN", "/nonexistent/claude")
+    result = claude_runner.run_cli("Hola", timeout=5)
+    assert result.exit_code == 127  # `timeout` could not exec the command
+
+
+def test_run_cli_leaves_no_tmp_files(echo_claude):
+    import glob
+    from workers.claude_runner import run_cli
+
+    before = set(glob.glob("/tmp/hawk-*"))
+    run_cli("Hola", timeout=10)
+    assert set(glob.glob("/tmp/hawk-*")) == before
+
+
+def test_run_claude_p_in_process_when_pool_disabled(echo_claude, monkeypatch):
+    from workers import claude_runner
+
+    monkeypatch.setattr(claude_runner, "POOL_SIZE", 0)
+    assert claude_runner.run_claude_p("Hola", session_prefix="test", timeout=10).startswith("Hola|")
+
+
+async def test_run_claude_p_async_returns_output(echo_claude):
+    from workers.claude_runner import run_claude_p_async
+
+    output = await run_claude_p_async("Hola", session_prefix="test", timeout=10)
+    assert output.startswith("Hola|")
+
+
+async def test_run_claude_p_async_timeout_returns_none(echo_claude):
+    from workers.claude_runner import run_claude_p_async
+
+    assert await run_claude_p_async("sleep", session_prefix="test", timeout=1) is None
+
+
+def test_run_claude_p_many_preserves_order(echo_claude):
+    from workers.claude_runner import run_claude_p_many
+
+    outputs = run_claude_p_many(["a", "b", "c"], session_prefix="test", timeout=10)
+    assert [o.split("|")[0] for o in outputs] == ["a", "b", "c"]
+
+
+def test_run_claude_p_many_runs_concurrently(echo_claude):
+    import time
+    from workers.claude_runner import run_claude_p_many
+
+    start = time.monotonic()
+    run_claude_p_many([f"nap{i}" for i in range(4)], session_prefix="test", timeout=10, concurrency=4)
+    assert time.monotonic() - start < 1.6  # four sequential naps would take >= 1.6s
+
+
+def test_run_claude_p_many_respects_concurrency_bound(echo_claude):
+    import time
+    from workers.claude_runner import run_claude_p_many
+
+    start = time.monotonic()
+    run_claude_p_many([f"nap{i}" for i in range(4)], session_prefix="test", timeout=10, concurrency=1)
+    assert time.monotonic() - start >= 1.6
+
+
+def test_run_cli_streams_chunks(echo_claude):
+    from workers.claude_runner import run_cli
+
+    chunks = []
+    result = run_cli("stream", timeout=10, on_output=chunks.append)
+    assert "".join(chunks) == "one two three"
+    assert len(chunks) > 1
+    assert result.text == "one two three"
+
+
+def test_pool_streams_chunks(echo_claude):
+    pool = ClaudeProcessPool(size=1)
+    chunks = []
+    try:
+        output = pool.run("stream", session_prefix="test", timeout=10, on_output=chunks.append)
+    finally:
+        pool.close()
+    assert output == "one two three"
+    assert "".join(chunks) == "one two three"
+
+
+def test_run_cli_reports_spawn_and_first_byte_timings(echo_claude):
+    from workers.claude_runner import run_cli
+
+    result = run_cli("Hola", timeout=10)
+    assert result.spawn_latency is not None
+    assert result.time_to_first_byte >= result.spawn_latency
+
+
+def test_run_claude_p_records_pool_timings(echo_claude):
+    from workers import claude_runner, metrics
+
+    sink = metrics.InMemorySink()
+    metrics.set_sink(sink)
+    try:
+        claude_runner.run_claude_p("Hola", session_prefix="test", timeout=10, target_language="es")
+    finally:
+        metrics.set_sink(None)
+    call = sink.calls[0]
+    assert call.exit_code == 0
+    assert call.spawn_latency is not None
+    assert call.time_to_first_byte is not None
+    assert call.output_bytes > 0
+
+
+def test_run_claude_p_records_timeout(echo_claude, monkeypatch):
+    from workers import claude_runner, metrics
+
+    monkeypatch.setattr(claude_runner, "POOL_SIZE", 0)
+    sink = metrics.InMemorySink()
+    metrics.set_sink(sink)
+    try:
+        assert claude_runner.run_claude_p("sleep", session_prefix="test", timeout=1) is None
+    finally:
+        metrics.set_sink(None)
+    assert sink.calls[0].failure == "timeout"
+    assert sink.calls[0].exit_code == 124
@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from workers import claude_runner
+from workers.fake_claude import FakeClaudeBackend, FakeClaudeConfig, sample_latency, simulate
+from workers.scorer import SCORING_PROMPT_TEMPLATE, score_translation
+from workers.translator import translate_segments
+
+FAKE_CLAUDE = str(Path(__file__).parent.parent / "scripts" / "fake-claude")
+
+
+def make_segment(text, index=0):
+    return {"index": index, "tag": "p", "text": text, "inner_html": f"<p>{text}</p>", "translated": None}
+
+
+@pytest.fixture
+def fake_backend():
+    backend = FakeClaudeBackend(FakeClaudeConfig(seed="test"))
+    claude_runner.set_backend(backend)
+    yield backend
+    claude_runner.set_backend(None)
+
+
+def test_translation_prompt_returns_array_of_same_length(fake_backend):
+    segments = [make_segment("Hello.", 0), make_segment("World.", 1)]
+    result = translate_segments(segments, target_language="es")
+    assert [s["translated"] for s in result] == ["[Spanish] Hello.", "[Spanish] World."]
+    assert not any(s.get("needs_review") for s in result)
+
+
+def test_generic_prompt_uses_language_name(fake_backend):
+    result = translate_segments([make_segment("Hello.")], target_language="pt")
+    assert result[0]["translated"] == "[Portuguese (Brazilian)] Hello."
+
+
+def test_scoring_prompt_returns_score_object(fake_backend):
+    result = score_translation(original="Hello.", translated="Hola.", target_lang="es")
+    assert result is not None
+    assert 3.0 <= result.overall <= 5.0
+    assert result.flags == []
+
+
+def test_outcomes_are_deterministic_for_a_seed():
+    config = FakeClaudeConfig(latency="uniform:0:1", malformed_rate=0.5, seed="abc")
+    prompt = SCORING_PROMPT_TEMPLATE.format(target_lang="es", original="Hi.", translated="Hola.")
+    assert simulate(prompt, config) == simulate(prompt, config)
+
+
+def test_error_rate_one_always_errors():
+    outcome = simulate("anything", FakeClaudeConfig(error_rate=1.0, seed="x"))
+    assert outcome.kind == "error"
+    assert outcome.exit_code == 1
+
+
+def test_malformed_output_is_not_the_clean_answer():
+    prompt = 'Translate these English journalism segments to French.\n\nReturn a JSON array of translated strings in the same order. No other text.\n\n["A", "B"]'
+    clean = simulate(prompt, FakeClaudeConfig(seed="x")).output
+    for seed in range(20):
+        outcome = simulate(prompt, FakeClaudeConfig(malformed_rate=1.0, seed=str(seed)))
+        assert outcome.kind == "malformed"
+        assert outcome.output != clean
+
+
+def test_timeout_outcome_returns_none_in_process():
+    backend = FakeClaudeBackend(FakeClaudeConfig(timeout_rate=1.0, seed="x"))
+    assert backend.run("anything", session_prefix="test", timeout=0) is None
+
+
+def test_latency_distributions():
+    import random
+    rng = random.Random(1)
+    assert sample_latency("fixed:0.25", rng) == 0.25
+    assert 0.1 <= sample_latency("uniform:0.1:0.2", rng) <= 0.2
+    assert sample_latency("normal:0:0.0001", rng) >= 0
+    assert sample_latency("lognormal:0:1", rng) > 0
+    with pytest.raises(ValueError):
+        sample_latency("pareto:1", rng)
+
+
+def test_executable_speaks_cli_contract(monkeypatch):
+    monkeypatch.setattr(claude_runner, "CLAUDE_BIN", FAKE_CLAUDE)
+    prompt = 'Translate these English journalism segments to Korean.\n\nReturn a JSON array of translated strings in the same order. No other text.\n\n["Hello."]'
+    result = claude_runner.run_cli(prompt, timeout=10)
+    assert result.exit_code == 0
+    assert json.loads(result.text) == ["[Korean] Hello."]
+
+
+def test_executable_exit_code_on_error(monkeypatch):
+    monkeypatch.setattr(claude_runner, "CLAUDE_BIN", FAKE_CLAUDE)
+    monkeypatch.setenv("HAWK_FAKE_CLAUDE_ERROR_RATE", "1")
+    result = claude_runner.run_cli("anything", timeout=10)
+    assert result.exit_code == 1
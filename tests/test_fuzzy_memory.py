@@ -0,0 +1,189 @@
+"""Tests for the fuzzy translation-memory index.
+
+The Redis store test at the bottom skips when REDIS_URL is unreachable.
+"""
+import json
+import os
+import random
+import uuid
+from unittest.mock import patch
+
+import pytest
+from redis import Redis
+
+from workers.fuzzy_memory import (
+    MAX_BUCKET_SIZE,
+    MAX_CANDIDATES,
+    InMemoryFuzzyIndex,
+    RedisFuzzyIndex,
+    reuse_numeric,
+    signature,
+    similarity,
+)
+from workers.translation_memory import TranslationMemory
+from workers.translator import translate_segments
+
+MEETING_EN = "The council meets at 7 p.m. on March 5 at City Hall."
+MEETING_ES = "El concejo se reúne a las 7 p.m. el 5 de marzo en el Ayuntamiento."
+
+
+class DictCache:
+    def __init__(self):
+        self.data = {}
+
+    def get_many(self, keys):
+        return {k: self.data[k] for k in keys if k in self.data}
+
+    def set_many(self, items):
+        self.data.update(items)
+
+
+def make_segment(text, index=0):
+    return {"index": index, "tag": "p", "text": text, "inner_html": f"<p>{text}</p>", "translated": None}
+
+
+def test_signature_is_deterministic_and_ignores_numbers():
+    assert signature(MEETING_EN) == signature(MEETING_EN)
+    assert signature(MEETING_EN) == signature("The council meets at 8 p.m. on March 12 at City Hall.")
+
+
+def test_query_finds_near_duplicate_and_skips_unrelated_text():
+    index = InMemoryFuzzyIndex()
+    index.add("k1", MEETING_EN, MEETING_ES, "es")
+    index.add("k2", "Residents voted against the school budget.", "Los residentes votaron...", "es")
+
+    matches = index.query("The council meets at 7 p.m. on April 5 at City Hall.", "es")
+    assert [m.source for m in matches] == [MEETING_EN]
+    assert 0.6 <= matches[0].similarity < 1
+    assert index.query("A completely different sentence about weather.", "es") == []
+
+
+def test_query_is_partitioned_by_context():
+    index = InMemoryFuzzyIndex()
+    index.add("k1", MEETING_EN, MEETING_ES, "es")
+    assert index.query(MEETING_EN, "pt") == []
+
+
+def test_query_scores_a_bounded_number_of_candidates():
+    index = InMemoryFuzzyIndex()
+    rng = random.Random(1)
+    words = "the city council voted to approve a new budget for the school district on tuesday".split()
+    for i in range(2000):
+        text = " ".join(rng.choice(words) for _ in range(12))
+        index.add(str(i), text, text, "es")
+    with patch.object(index, "_entries", wraps=index._entries) as entries:
+        index.query(" ".join(words), "es")
+    assert len(entries.call_args[0][0]) <= MAX_CANDIDATES
+
+
+def test_mostly_numeric_text_is_not_indexed_or_queried():
+    index = InMemoryFuzzyIndex()
+    index.add_many([("k1", "1,204", "1.204"), ("k2", "$4.2 million", "4,2 millones de dólares")], "es")
+    assert len(index) == 0
+    index.add("k3", "12,345", "12.345", "es")
+    with patch.object(index, "_buckets", wraps=index._buckets) as buckets:
+        assert index.query("12,346", "es") == []
+    buckets.assert_not_called()
+
+
+def test_buckets_keep_only_their_newest_entries():
+    index = InMemoryFuzzyIndex()
+    for i in range(MAX_BUCKET_SIZE + 10):
+        index.add(str(i), MEETING_EN, MEETING_ES, "es")  # same text: every entry shares all buckets
+    assert all(len(members) == MAX_BUCKET_SIZE for members in index._bucket_members.values())
+    assert "0" not in next(iter(index._bucket_members.values()))
+
+
+def test_query_many_reads_every_segment_in_one_batch():
+    index = InMemoryFuzzyIndex()
+    index.add("k1", MEETING_EN, MEETING_ES, "es")
+    texts = ["The council meets at 9 p.m. on March 5 at City Hall.", "42", "Residents voted on the budget."]
+    with patch.object(index, "_buckets", wraps=index._buckets) as buckets, \
+         patch.object(index, "_entries", wraps=index._entries) as entries:
+        results = index.query_many(texts, "es")
+    assert buckets.call_count == 1
+    assert entries.call_count == 1
+    assert results == [index.query(text, "es") for text in texts]
+    assert [m.source for m in results[0]] == [MEETING_EN]
+
+
+def test_similarity_masks_numbers():
+    assert similarity("Page 4 of 10", "Page 5 of 12") == 1.0
+    assert similarity("Page 4 of 10", "Chapter 4 of 10") < 1.0
+
+
+def test_reuse_numeric_swaps_numbers_in_translation():
+    new = "The council meets at 8 p.m. on March 12 at City Hall."
+    assert reuse_numeric(MEETING_EN, MEETING_ES, new) == (
+        "El concejo se reúne a las 8 p.m. el 12 de marzo en el Ayuntamiento."
+    )
+
+
+def test_reuse_numeric_refuses_when_translation_reformats_numbers():
+    source, translation = "The bill costs $1.3 billion.", "El proyecto cuesta $1,300 millones."
+    assert reuse_numeric(source, translation, "The bill costs $2.5 billion.") is None
+
+
+def test_reuse_numeric_refuses_when_words_differ():
+    assert reuse_numeric(MEETING_EN, MEETING_ES, "The council meets at 7 p.m. on April 5 at City Hall.") is None
+
+
+def test_translator_reuses_numeric_variant_without_calling_claude():
+    memory = TranslationMemory(DictCache(), fuzzy=InMemoryFuzzyIndex())
+    with patch("workers.translator.run_claude_p", return_value=json.dumps([MEETING_ES])):
+        translate_segments([make_segment(MEETING_EN)], target_language="es", memory=memory)
+
+    segment = make_segment("The council meets at 6 p.m. on March 19 at City Hall.")
+    with patch("workers.translator.run_claude_p") as mock_run:
+        translate_segments([segment], target_language="es", memory=memory)
+    mock_run.assert_not_called()
+    assert segment["translated"] == "El concejo se reúne a las 6 p.m. el 19 de marzo en el Ayuntamiento."
+
+
+def test_translator_sends_near_matches_as_references():
+    memory = TranslationMemory(DictCache(), fuzzy=InMemoryFuzzyIndex())
+    with patch("workers.translator.run_claude_p", return_value=json.dumps([MEETING_ES])):
+        translate_segments([make_segment(MEETING_EN)], target_language="pt", memory=memory)
+
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["..."])) as mock_run:
+        translate_segments(
+            [make_segment("The council meets at 7 p.m. on April 5 at City Hall.")],
+            target_language="pt", memory=memory,
+        )
+    prompt = mock_run.call_args[0][0]
+    assert "REFERENCE TRANSLATIONS" in prompt
+    assert MEETING_ES in prompt
+
+
+def test_prompt_without_references_has_no_reference_section():
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["Olá."])) as mock_run:
+        translate_segments([make_segment("Hello.")], target_language="pt")
+    assert "REFERENCE TRANSLATIONS" not in mock_run.call_args[0][0]
+
+
+@pytest.fixture
+def redis_index():
+    client = Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    try:
+        client.ping()
+    except Exception:
+        pytest.skip("Redis not available")
+    prefix = f"test_fz_{uuid.uuid4().hex[:8]}"
+    yield RedisFuzzyIndex(client, prefix=prefix, ttl_seconds=60)
+    keys = client.keys(f"{prefix}:*")
+    if keys:
+        client.delete(*keys)
+
+
+def test_redis_index_round_trip(redis_index):
+    redis_index.add("k1", MEETING_EN, MEETING_ES, "es")
+    matches = redis_index.query("The council meets at 9 p.m. on March 5 at City Hall.", "es")
+    assert [m.translation for m in matches] == [MEETING_ES]
+
+
+def test_redis_buckets_are_trimmed(redis_index):
+    for i in range(MAX_BUCKET_SIZE + 5):
+        redis_index.add(f"k{i}", MEETING_EN, MEETING_ES, "es")
+    buckets = redis_index.redis.keys(f"{redis_index.prefix}:z:*")
+    assert buckets
+    assert all(redis_index.redis.zcard(b) == MAX_BUCKET_SIZE for b in buckets)
@@ -1,4 +1,8 @@
-from workers.glossary import apply_glossary
+import json
+import random
+from pathlib import Path
+
+from workers.glossary import GlossaryMatcher, apply_glossary, compile_glossary, glossary_version
 
 
 def test_applies_known_term():
@@ -51,3 +55,67 @@ def test_backslash_in_replacement_does_not_raise():
     terms = {"Governor": r"Gobernador\a"}  # \a would crash non-lambda re.sub
     result = apply_glossary(text, terms)
     assert r"Gobernador\a" in result
+
+
+def test_glossary_version_tracks_terms():
+    assert glossary_version({}) == ""
+    assert glossary_version({"a": "b", "c": "d"}) == glossary_version({"c": "d", "a": "b"})
+    assert glossary_version({"a": "b"}) != glossary_version({"a": "x"})
+
+
+def test_longest_term_wins_when_terms_overlap():
+    terms = {"New Jersey": "Nueva Jersey", "Jersey City Council": "Concejo de Jersey City"}
+    text = "The New Jersey City Council met."
+    assert apply_glossary(text, terms) == "The New Concejo de Jersey City met."
+
+
+def test_replacement_containing_a_shorter_term_is_replaced_again():
+    """Terms apply in turn, so a shorter term inside a longer term's replacement is substituted too."""
+    terms = {"Board of Education": "Board de Educación", "Board": "Junta"}
+    assert apply_glossary("The Board of Education met.", terms) == "The Junta de Educación met."
+
+
+def test_case_variants_of_one_term_both_apply():
+    terms = {"ice": "ICE", "ICE": "Servicio de Inmigración"}
+    assert apply_glossary("Agents from ice arrived.", terms) == "Agents from Servicio de Inmigración arrived."
+
+
+def test_shorter_term_matches_where_longer_fails_word_boundary():
+    terms = {"New Jersey": "Nueva Jersey", "New": "Nuevo"}
+    assert apply_glossary("New Jerseyans voted.", terms) == "Nuevo Jerseyans voted."
+
+
+def test_compiled_matcher_matches_term_by_term_on_corpus_glossary():
+    """Equivalence with the reference (one regex per term) over the corpus glossary and text built from it."""
+    corpus = json.loads((Path(__file__).parent.parent / "resources" / "corpus-glossary.json").read_text())
+    terms = {t["term_en"]: t["term_es"] for t in corpus}
+    matcher = GlossaryMatcher(terms)
+    assert matcher.compiled
+
+    rng = random.Random(3)
+    words = [w for term in terms for w in term.split()] + "the said on of New Jersey ICE U.S. Gov.".split()
+    for _ in range(500):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(3, 40)))
+        assert matcher.apply(text) == matcher.apply_sequential(text), text
+
+
+def test_compiled_matcher_matches_term_by_term_on_generated_glossaries():
+    """Small alphabets force overlapping terms, cascades, punctuation and case variants."""
+    rng = random.Random(7)
+    pieces = ["a", "b", "ab", "ba", "A", "B", "c.", "x-y", "é", "É", " "]
+
+    def phrase(n):
+        return "".join(rng.choice(pieces) for _ in range(n)).strip() or "a"
+
+    for _ in range(500):
+        terms = {phrase(rng.randint(1, 4)): phrase(rng.randint(0, 5)) for _ in range(rng.randint(1, 8))}
+        matcher = GlossaryMatcher(terms)
+        for _ in range(5):
+            text = " ".join(phrase(rng.randint(1, 4)) for _ in range(rng.randint(1, 8)))
+            assert matcher.apply(text) == matcher.apply_sequential(text), (terms, text)
+
+
+def test_compile_glossary_reuses_matchers():
+    terms = {"Governor": "Gobernador"}
+    assert compile_glossary(terms) is compile_glossary(dict(terms))
+    assert compile_glossary({"Mayor": "Alcalde"}) is not compile_glossary(terms)
@@ -0,0 +1,174 @@
+"""Tests for the per-process compiled glossary cache. The pub/sub test skips when REDIS_URL is unreachable."""
+import os
+import time
+import uuid
+from unittest.mock import patch
+
+import pytest
+from redis import Redis
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from db.models import Base, Glossary
+from workers import metrics
+from workers.glossary_cache import GlossaryCache
+from workers.glossary_stack import StackSpec
+
+ORG_STACK = StackSpec("en-fr", "org-1", automatic=True)
+TOWN_STACK = StackSpec("en-fr", "org-2", automatic=True)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        with patch("workers.glossary_cache.publish_invalidation"):
+            session.add(Glossary(id="g1", name="NJ Gov", language_pair="en-fr", org_id="org-1",
+                                 terms_json={"Governor": "Gouverneur"}))
+            session.add(Glossary(id="g2", name="Towns", language_pair="en-fr", org_id="org-2",
+                                 terms_json={"Township": "Canton"}))
+            session.commit()
+        yield session
+
+
+@pytest.fixture
+def sink():
+    sink = metrics.InMemorySink()
+    metrics.set_sink(sink)
+    yield sink
+    metrics.set_sink(None)
+
+
+def _edit(db, glossary_id, terms):
+    with patch("workers.glossary_cache.publish_invalidation") as mock_publish:
+        db.get(Glossary, glossary_id).terms_json = terms
+        db.commit()
+    return mock_publish
+
+
+def test_get_compiles_once_per_version(db, sink):
+    cache = GlossaryCache(max_entries=4)
+    first = cache.get(ORG_STACK, db)
+    assert [layer.version for layer in first.layers] == [1]
+    assert first.matcher.apply("The Governor spoke.") == "The Gouverneur spoke."
+    assert cache.get(ORG_STACK, db) is first
+    assert sink.counter("glossary_cache.misses") == 1
+    assert sink.counter("glossary_cache.hits") == 1
+
+
+def test_version_bump_recompiles(db):
+    cache = GlossaryCache(max_entries=4)
+    first = cache.get(ORG_STACK, db)
+    _edit(db, "g1", {"Governor": "Gouverneure"})
+
+    second = cache.get(ORG_STACK, db)
+    assert [layer.version for layer in second.layers] == [2]
+    assert second.matcher.apply("The Governor spoke.") == "The Gouverneure spoke."
+    assert second.glossary_version != first.glossary_version
+
+
+def test_listening_skips_the_version_check_until_max_age(db):
+    cache = GlossaryCache(max_entries=4, max_age=300)
+    cache.listening = True
+    cache.get(ORG_STACK, db)
+    _edit(db, "g1", {"Governor": "Gouverneure"})
+
+    # No invalidation message arrived, so the cached copy is trusted until it ages out
+    assert cache.get(ORG_STACK, db).layers[0].version == 1
+    cache.max_age = 0
+    assert cache.get(ORG_STACK, db).layers[0].version == 2
+
+
+def test_invalidate_forces_a_reload(db):
+    cache = GlossaryCache(max_entries=4)
+    cache.listening = True
+    cache.get(ORG_STACK, db)
+    _edit(db, "g1", {"Governor": "Gouverneure"})
+    cache.invalidate("g1")
+    assert cache.get(ORG_STACK, db).layers[0].version == 2
+
+
+def test_invalidation_of_a_new_glossary_rechecks_every_stack(db):
+    cache = GlossaryCache(max_entries=4)
+    cache.listening = True
+    cache.get(ORG_STACK, db)
+    with patch("workers.glossary_cache.publish_invalidation"):
+        db.add(Glossary(id="g3", name="Shared", language_pair="en-fr", terms_json={"Mayor": "Maire"}))
+        db.commit()
+    cache.invalidate("g3")
+    assert [layer.glossary_id for layer in cache.get(ORG_STACK, db).layers] == ["g3", "g1"]
+
+
+def test_lru_bound(db):
+    cache = GlossaryCache(max_entries=1)
+    cache.get(ORG_STACK, db)
+    entry = cache.get(TOWN_STACK, db)
+    assert list(cache._entries.values()) == [entry]
+    assert list(cache._current) == [TOWN_STACK]
+
+
+def test_zero_size_disables_caching(db, sink):
+    cache = GlossaryCache(max_entries=0)
+    cache.get(ORG_STACK, db)
+    cache.get(ORG_STACK, db)
+    assert sink.counter("glossary_cache.misses") == 2
+    assert not cache._entries
+
+
+def test_committed_edit_publishes_invalidation(db):
+    mock_publish = _edit(db, "g1", {"Governor": "Gouverneure"})
+    assert mock_publish.call_args[0][1] == {"g1"}
+
+
+def test_rolled_back_edit_publishes_nothing(db):
+    with patch("workers.glossary_cache.publish_invalidation") as mock_publish:
+        db.get(Glossary, "g1").terms_json = {"Governor": "Gouverneure"}
+        db.flush()
+        db.rollback()
+        db.commit()
+    mock_publish.assert_not_called()
+
+
+@pytest.fixture
+def redis_client():
+    client = Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    try:
+        client.ping()
+    except Exception:
+        pytest.skip("Redis not available")
+    return client
+
+
+def test_invalidation_over_pubsub(db, redis_client):
+    channel = f"test_glossary_{uuid.uuid4().hex[:8]}"
+    cache = GlossaryCache(max_entries=4, redis_client=redis_client, channel=channel)
+    cache.start_listener()
+    deadline = time.monotonic() + 5
+    while not cache.listening and time.monotonic() < deadline:
+        time.sleep(0.01)
+    cache.get(ORG_STACK, db)
+
+    redis_client.publish(channel, "g1")
+    while cache._entries and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not cache._entries
+
+
+def test_concurrent_edits_each_bump_the_version(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'glossaries.db'}")
+    Base.metadata.create_all(engine)
+    with patch("workers.glossary_cache.publish_invalidation"):
+        with Session(engine) as db:
+            db.add(Glossary(id="g1", name="NJ Gov", language_pair="en-fr", terms_json={}))
+            db.commit()
+        with Session(engine) as first, Session(engine) as second:
+            a, b = first.get(Glossary, "g1"), second.get(Glossary, "g1")
+            a.terms_json = {"Governor": "Gouverneur"}
+            first.commit()
+            b.name = "NJ Government"  # loaded before the first edit: no StaleDataError
+            second.commit()
+            assert b.version == 3
+            b.name = "NJ Government"
+            second.commit()
+            assert b.version == 3
@@ -0,0 +1,118 @@
+"""Tests for layered glossary stacks."""
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from db.models import Base, Glossary
+from workers import glossary_stack
+from workers.glossary import GlossaryMatcher
+from workers.glossary_stack import StackSpec, global_glossary, load_stack, merge_terms, resolve_layers
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session, patch("workers.glossary_cache.publish_invalidation"):
+        session.add_all([
+            Glossary(id="shared", name="Spanish desk", language_pair="en-es",
+                     terms_json={"Governor": "Gobernador", "Mayor": "Alcalde", "Township": "Municipio"},
+                     created_at=datetime(2026, 1, 1)),
+            Glossary(id="org-old", name="House style", language_pair="en-es", org_id="org-1",
+                     terms_json={"governor": "Gobernadora"}, created_at=datetime(2026, 2, 1)),
+            Glossary(id="org-new", name="Election desk", language_pair="en-es", org_id="org-1",
+                     terms_json={"Mayor": "Alcaldesa"}, created_at=datetime(2026, 3, 1)),
+            Glossary(id="other-org", name="Elsewhere", language_pair="en-es", org_id="org-2",
+                     terms_json={"Mayor": "Intendente"}, created_at=datetime(2026, 3, 1)),
+            Glossary(id="portuguese", name="Portuguese desk", language_pair="en-pt",
+                     terms_json={"Mayor": "Prefeito"}, created_at=datetime(2026, 1, 1)),
+            Glossary(id="request", name="This story", language_pair="en-es", org_id="org-1",
+                     terms_json={"Township": "Pueblo"}, created_at=datetime(2026, 1, 15)),
+        ])
+        session.commit()
+        yield session
+
+
+def test_layers_in_precedence_order(db):
+    layers = resolve_layers(StackSpec("en-es", "org-1", "request", automatic=True), db)
+    assert [(layer.name, layer.glossary_id) for layer in layers] == [
+        ("language", "shared"), ("org", "org-old"), ("org", "org-new"), ("request", "request"),
+    ]
+    assert [layer.glossary_id for layer in resolve_layers(StackSpec("en-es", automatic=True), db)] == ["shared"]
+
+
+def test_language_and_org_layers_are_opt_in(db):
+    assert [layer.glossary_id for layer in resolve_layers(StackSpec("en-es", "org-1", "request"), db)] == ["request"]
+    assert resolve_layers(StackSpec("en-es", "org-1"), db) == ()
+
+
+def test_request_layer_must_be_shared_or_the_jobs_org(db):
+    assert resolve_layers(StackSpec("en-es", "org-2", "request"), db) == ()
+    assert resolve_layers(StackSpec("en-es", None, "request"), db) == ()
+    assert [layer.glossary_id for layer in resolve_layers(StackSpec("en-es", "org-2", "shared"), db)] == ["shared"]
+    spec = StackSpec("en-es", "org-2", "request", automatic=True)
+    assert [layer.glossary_id for layer in resolve_layers(spec, db)] == ["shared", "other-org"]
+
+
+def test_later_layers_override_case_insensitively(db):
+    spec = StackSpec("en-es", "org-1", "request", automatic=True)
+    terms = load_stack(spec, resolve_layers(spec, db), db)
+    assert terms["governor"] == "Gobernadora"
+    assert "Governor" not in terms
+    assert terms["Mayor"] == "Alcaldesa"
+    assert terms["Township"] == "Pueblo"
+
+
+@pytest.fixture
+def curated_global():
+    global_glossary.cache_clear()
+    with patch.object(glossary_stack, "GLOBAL_GLOSSARY_FILES", "resources/glossary-curated.json"):
+        yield
+    global_glossary.cache_clear()
+
+
+def test_global_layer_sits_under_every_other_layer(db, curated_global):
+    spec = StackSpec("en-es", "org-1", automatic=True)
+    terms = load_stack(spec, resolve_layers(spec, db), db)
+    assert terms["new jersey"] == "Nueva Jersey"  # from resources/glossary-curated.json
+    assert terms["governor"] == "Gobernadora"
+    portuguese = StackSpec("en-pt", automatic=True)
+    assert load_stack(portuguese, resolve_layers(portuguese, db), db) == {"Mayor": "Prefeito"}
+
+
+def test_no_global_layer_by_default():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    global_glossary.cache_clear()
+    with Session(engine) as session:
+        spec = StackSpec("en-es")
+        terms = load_stack(spec, resolve_layers(spec, session), session)
+    text = "Bill Smith said the roads were covered in ice."
+    assert terms == {}
+    assert GlossaryMatcher(terms).apply(text) == text
+
+
+def test_global_glossary_reads_bundled_files(tmp_path):
+    path = tmp_path / "terms.json"
+    path.write_text(json.dumps([
+        {"term_en": "county", "term_es": "condado", "term_pt": "condado"},
+        {"term_en": "bill (legislation)", "term_es": "proyecto de ley"},
+        {"term_en": "freeholder", "term_es": "comisionado"},
+    ]))
+    global_glossary.cache_clear()
+    try:
+        with patch.object(glossary_stack, "GLOBAL_GLOSSARY_FILES", f"{path}, {tmp_path / 'missing.json'}"):
+            assert global_glossary("en-es") == {"county": "condado", "freeholder": "comisionado"}
+            assert global_glossary("en-pt") == {"county": "condado"}
+    finally:
+        global_glossary.cache_clear()
+
+
+def test_merge_terms_keeps_one_entry_per_term():
+    assert merge_terms([{"ICE": "ICE", "Mayor": "Alcalde"}, {"ice": "Servicio de Inmigración"}]) == {
+        "ice": "Servicio de Inmigración", "Mayor": "Alcalde",
+    }
@@ -0,0 +1,150 @@
+"""Tests for the fleet-wide claude -p governor.
+
+Unit tests mock Redis; the integration tests at the bottom run the Lua
+admission script against a real Redis and skip when REDIS_URL is unreachable.
+"""
+import os
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+from redis import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from workers import governor as governor_module
+from workers.governor import ClaudeGovernor
+
+
+def make_governor(admissions, max_wait=5.0):
+    redis_client = MagicMock()
+    redis_client.eval.side_effect = admissions
+    return ClaudeGovernor(redis_client, limit=2, prefix="test_gov", max_wait=max_wait), redis_client
+
+
+def test_limit_must_be_positive():
+    with pytest.raises(ValueError):
+        ClaudeGovernor(MagicMock(), limit=0)
+
+
+def test_acquire_returns_token_when_admitted():
+    gov, redis_client = make_governor([1, 0])  # acquire script, then record-wait script
+    token = gov.acquire(lease_seconds=60)
+    assert token is not None
+    assert redis_client.eval.call_count == 2
+
+
+def test_acquire_polls_until_admitted():
+    gov, redis_client = make_governor([0, 0, 1, 0])
+    with patch("workers.governor.time.sleep") as mock_sleep:
+        token = gov.acquire(lease_seconds=60)
+    assert token is not None
+    assert mock_sleep.call_count == 2
+
+
+def test_acquire_gives_up_after_max_wait_and_leaves_queue():
+    gov, redis_client = make_governor(lambda *args: 0, max_wait=0)
+    assert gov.acquire(lease_seconds=60) is None
+    pipe = redis_client.pipeline.return_value
+    assert pipe.zrem.call_count == 2
+    pipe.hincrby.assert_called_once_with("test_gov:stats", "timeouts", 1)
+
+
+def test_slot_releases_lease():
+    gov, redis_client = make_governor([1, 0])
+    with gov.slot(timeout=60) as admitted:
+        assert admitted is True
+    redis_client.zrem.assert_called_once()
+    assert redis_client.zrem.call_args[0][0] == "test_gov:holders"
+
+
+def test_slot_fails_open_when_redis_is_down():
+    redis_client = MagicMock()
+    redis_client.eval.side_effect = RedisConnectionError("down")
+    gov = ClaudeGovernor(redis_client, limit=2)
+    with gov.slot(timeout=60) as admitted:
+        assert admitted is True
+
+
+def test_run_claude_p_returns_none_without_slot(monkeypatch):
+    from workers import claude_runner
+
+    gov, _ = make_governor(lambda *args: 0, max_wait=0)
+    backend = MagicMock(holds_fleet_slot=False)
+    monkeypatch.setattr(claude_runner, "get_governor", lambda: gov)
+    claude_runner.set_backend(backend)
+    try:
+        assert claude_runner.run_claude_p("hi", session_prefix="test") is None
+    finally:
+        claude_runner.set_backend(None)
+    backend.run.assert_not_called()
+
+
+def test_run_claude_p_runs_inside_slot(monkeypatch):
+    from workers import claude_runner
+
+    gov, redis_client = make_governor([1, 0])
+    backend = MagicMock(holds_fleet_slot=False)
+    backend.run.return_value = "ok"
+    monkeypatch.setattr(claude_runner, "get_governor", lambda: gov)
+    claude_runner.set_backend(backend)
+    try:
+        assert claude_runner.run_claude_p("hi", session_prefix="test") == "ok"
+    finally:
+        claude_runner.set_backend(None)
+    redis_client.zrem.assert_called_once()
+
+
+def test_get_governor_disabled_by_default(monkeypatch):
+    monkeypatch.setattr(governor_module, "CLUSTER_LIMIT", 0)
+    assert governor_module.get_governor() is None
+
+
+# --- Integration (real Redis) ---
+
+@pytest.fixture
+def redis_gov():
+    client = Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    try:
+        client.ping()
+    except Exception:
+        pytest.skip("Redis not available")
+    prefix = f"test_gov_{uuid.uuid4().hex[:8]}"
+    yield ClaudeGovernor(client, limit=2, prefix=prefix, max_wait=0)
+    client.delete(*(f"{prefix}:{k}" for k in ("holders", "queue", "queue_seen", "ticket", "stats")))
+
+
+def test_integration_caps_in_flight_calls(redis_gov):
+    first = redis_gov.acquire(lease_seconds=60)
+    second = redis_gov.acquire(lease_seconds=60)
+    assert first and second
+    assert redis_gov.acquire(lease_seconds=60) is None
+    assert redis_gov.stats()["in_flight"] == 2
+
+    redis_gov.release(first)
+    assert redis_gov.acquire(lease_seconds=60) is not None
+
+
+def test_integration_admits_in_arrival_order(redis_gov):
+    held = [redis_gov.acquire(lease_seconds=60) for _ in range(2)]
+    assert redis_gov.try_acquire("early", 60) is False
+    assert redis_gov.try_acquire("late", 60) is False
+
+    redis_gov.release(held[0])
+    assert redis_gov.try_acquire("late", 60) is False  # "early" is ahead in line
+    assert redis_gov.try_acquire("early", 60) is True
+
+
+def test_integration_expired_leases_free_slots(redis_gov):
+    redis_gov.acquire(lease_seconds=0)
+    redis_gov.acquire(lease_seconds=0)
+    assert redis_gov.acquire(lease_seconds=60) is not None
+
+
+def test_integration_stats_track_waits(redis_gov):
+    redis_gov.acquire(lease_seconds=60)
+    redis_gov.acquire(lease_seconds=60)
+    redis_gov.acquire(lease_seconds=60)  # times out immediately (max_wait=0)
+    stats = redis_gov.stats()
+    assert stats["acquired"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["limit"] == 2
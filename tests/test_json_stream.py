@@ -0,0 +1,70 @@
+import json
+
+from workers.json_stream import JSONArrayStream
+
+
+def feed_all(stream, chunks):
+    items = []
+    for chunk in chunks:
+        items.extend(stream.feed(chunk))
+    return items
+
+
+def test_emits_elements_as_they_complete():
+    stream = JSONArrayStream()
+    assert stream.feed('["Hola", "Mun') == ["Hola"]
+    assert stream.feed('do", "Adi') == ["Mundo"]
+    assert stream.feed('ós"]') == ["Adiós"]
+    assert stream.closed is True
+    assert stream.count == 3
+
+
+def test_char_by_char_matches_json_loads():
+    text = json.dumps(["a, b", {"k": [1, 2]}, 12.5, "quote \" ]", None, True], ensure_ascii=False)
+    stream = JSONArrayStream()
+    assert feed_all(stream, list(text)) == json.loads(text)
+    assert stream.closed
+
+
+def test_number_split_across_chunks_is_not_cut_short():
+    stream = JSONArrayStream()
+    assert stream.feed("[12") == []
+    assert stream.feed("34, 5]") == [1234, 5]
+
+
+def test_skips_prefix_and_fence():
+    stream = JSONArrayStream()
+    assert feed_all(stream, ["Here you go:\n```json\n[", '"a"]', "\n```"]) == ["a"]
+    assert stream.closed
+
+
+def test_truncated_array_keeps_completed_elements():
+    stream = JSONArrayStream()
+    assert stream.feed('["one", "two", "thr') == ["one", "two"]
+    assert stream.started is True
+    assert stream.closed is False
+
+
+def test_non_array_reply_never_starts():
+    stream = JSONArrayStream()
+    assert stream.feed("not valid json") == []
+    assert stream.started is False
+
+
+def test_empty_array():
+    stream = JSONArrayStream()
+    assert stream.feed("[]") == []
+    assert stream.closed
+
+
+def test_finish_tells_garbage_from_truncation():
+    for text, malformed in [
+        ('["Uno.", "Do', False),
+        ('["Uno.", {"k": [1, 2', False),
+        ('["Uno.", Dos., "Tres."]', True),
+        ('["Uno.", {broken', True),
+    ]:
+        stream = JSONArrayStream()
+        assert stream.feed(text) == ["Uno."]
+        stream.finish()
+        assert stream.malformed is malformed, text
@@ -0,0 +1,107 @@
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+
+from workers import claude_runner, metrics
+from workers.fake_claude import FakeClaudeBackend, FakeClaudeConfig
+from workers.metrics import ClaudeCallRecord, InMemorySink, LoggingSink
+
+
+@pytest.fixture
+def sink():
+    sink = InMemorySink()
+    metrics.set_sink(sink)
+    yield sink
+    metrics.set_sink(None)
+
+
+@pytest.fixture
+def fake_backend():
+    backend = FakeClaudeBackend(FakeClaudeConfig(seed="metrics"))
+    claude_runner.set_backend(backend)
+    yield backend
+    claude_runner.set_backend(None)
+
+
+def test_in_memory_sink_sums_counters_by_label():
+    sink = InMemorySink()
+    sink.incr("tm.hits", language="es")
+    sink.incr("tm.hits", 2, language="es")
+    sink.incr("tm.hits", language="pt")
+    assert sink.counter("tm.hits", language="es") == 3
+    assert sink.counter("tm.hits") == 4
+    assert sink.counter("tm.misses") == 0
+
+
+def test_run_claude_p_records_one_call_per_invocation(sink, fake_backend):
+    output = claude_runner.run_claude_p("Say hi", session_prefix="translator", target_language="es")
+    assert len(sink.calls) == 1
+    call = sink.calls[0]
+    assert call.session_prefix == "translator"
+    assert call.target_language == "es"
+    assert call.backend == "fake"
+    assert call.prompt_bytes == len(b"Say hi")
+    assert call.output_bytes == len(output.encode())
+    assert call.duration >= 0
+    assert call.failure is None
+
+
+def test_failed_call_is_recorded_with_reason(sink, monkeypatch):
+    backend = MagicMock(name="backend")
+    backend.name = "mock"
+    backend.run.return_value = None
+    claude_runner.set_backend(backend)
+    try:
+        assert claude_runner.run_claude_p("x", session_prefix="scorer") is None
+    finally:
+        claude_runner.set_backend(None)
+    assert sink.calls[0].failure == "no_output"
+
+
+def test_governor_refusal_is_recorded_as_no_slot(sink, fake_backend, monkeypatch):
+    governor = MagicMock()
+    governor.slot.return_value.__enter__.return_value = False
+    monkeypatch.setattr(claude_runner, "get_governor", lambda: governor)
+    assert claude_runner.run_claude_p("x", session_prefix="scorer") is None
+    assert sink.calls[0].failure == "no_slot"
+
+
+async def test_async_call_is_recorded(sink, fake_backend):
+    await claude_runner.run_claude_p_async("x", session_prefix="scorer", target_language="pt")
+    assert [c.target_language for c in sink.calls] == ["pt"]
+
+
+def test_broken_sink_does_not_break_the_call(fake_backend):
+    broken = MagicMock()
+    broken.record_call.side_effect = RuntimeError("sink down")
+    metrics.set_sink(broken)
+    try:
+        assert claude_runner.run_claude_p("x", session_prefix="test") is not None
+    finally:
+        metrics.set_sink(None)
+
+
+def test_logging_sink_writes_one_line_per_call(caplog):
+    record = ClaudeCallRecord(
+        session_prefix="translator", target_language="es", backend="cli",
+        prompt_bytes=10, output_bytes=20, spawn_latency=0.01, time_to_first_byte=1.5,
+        duration=2.0, exit_code=0,
+    )
+    with caplog.at_level(logging.INFO, logger="workers.metrics"):
+        LoggingSink().record_call(record)
+    assert "prefix=translator lang=es" in caplog.text
+    assert "ttfb=1.500" in caplog.text
+
+
+def test_prometheus_sink_exports_calls_and_counters():
+    prometheus_client = pytest.importorskip("prometheus_client")
+    registry = prometheus_client.CollectorRegistry()
+    sink = metrics.PrometheusSink(registry=registry)
+    sink.record_call(ClaudeCallRecord(
+        session_prefix="scorer", target_language="es", backend="cli", prompt_bytes=5, duration=1.0,
+    ))
+    sink.incr("tm.hits", language="es")
+    labels = {"session_prefix": "scorer", "target_language": "es", "backend": "cli", "failure": ""}
+    assert registry.get_sample_value("hawk_claude_calls_total", labels) == 1
+    assert registry.get_sample_value("hawk_tm_hits_total", {"language": "es"}) == 1
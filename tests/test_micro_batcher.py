@@ -0,0 +1,191 @@
+"""Tests for cross-job micro-batching.
+
+The coalescing tests run against a real Redis and skip when REDIS_URL is
+unreachable; the rest use mocks.
+"""
+import hashlib
+import os
+import threading
+import time
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+from redis import Redis
+from redis.exceptions import RedisError
+
+from workers import metrics
+from workers.micro_batcher import MicroBatcher
+
+
+def make_segments(*texts):
+    return [{"index": i, "text": t, "translated": None} for i, t in enumerate(texts)]
+
+
+class RecordingTranslate:
+    def __init__(self, fail_on=None, delay=0.0):
+        self.calls = []
+        self.references = []
+        self.lock = threading.Lock()
+        self.fail_on = fail_on
+        self.delay = delay
+
+    def __call__(self, segments, references):
+        with self.lock:
+            self.calls.append([s["text"] for s in segments])
+            self.references.append(references)
+        time.sleep(self.delay)
+        for seg in segments:
+            if seg["text"] == self.fail_on:
+                seg["translated"] = seg["text"]
+                seg["needs_review"] = True
+            else:
+                seg["translated"] = f"[es] {seg['text']}"
+
+
+@pytest.fixture
+def sink():
+    sink = metrics.InMemorySink()
+    metrics.set_sink(sink)
+    yield sink
+    metrics.set_sink(None)
+
+
+def test_eligible_only_for_small_jobs():
+    batcher = MicroBatcher(MagicMock(), max_segments=2)
+    assert batcher.eligible(make_segments("a", "b"))
+    assert not batcher.eligible(make_segments("a", "b", "c"))
+    assert not batcher.eligible([])
+
+
+def test_redis_error_translates_alone(sink):
+    client = MagicMock()
+    client.pipeline.return_value.execute.side_effect = RedisError("down")
+    translate = RecordingTranslate()
+    segments = make_segments("Hello.")
+    MicroBatcher(client, window_ms=50).translate(segments, "es", translate)
+    assert translate.calls == [["Hello."]]
+    assert segments[0]["translated"] == "[es] Hello."
+    assert sink.counter("micro_batch.translated_alone") == 1
+
+
+@pytest.fixture
+def redis_client():
+    client = Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    try:
+        client.ping()
+    except Exception:
+        pytest.skip("Redis not available")
+    prefix = f"test_mb_{uuid.uuid4().hex[:8]}"
+    yield client, prefix
+    keys = client.keys(f"{prefix}:*")
+    if keys:
+        client.delete(*keys)
+
+
+def test_concurrent_small_jobs_share_one_call(redis_client):
+    client, prefix = redis_client
+    translate = RecordingTranslate(fail_on="job 1 b")
+    jobs = {n: make_segments(f"job {n} a", f"job {n} b") for n in range(3)}
+
+    def run(n):
+        MicroBatcher(client, window_ms=300, prefix=prefix).translate(jobs[n], "es", translate)
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in jobs]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(translate.calls) == 1
+    assert sorted(translate.calls[0]) == sorted(s["text"] for segs in jobs.values() for s in segs)
+    assert jobs[0][1]["translated"] == "[es] job 0 b"
+    assert jobs[1][1]["needs_review"] is True
+    assert "needs_review" not in jobs[2][0]
+
+
+def test_lone_job_waits_at_most_the_window(redis_client):
+    client, prefix = redis_client
+    translate = RecordingTranslate()
+    segments = make_segments("Alone.")
+    start = time.monotonic()
+    MicroBatcher(client, window_ms=200, prefix=prefix).translate(segments, "es", translate)
+    assert time.monotonic() - start < 1.0
+    assert translate.calls == [["Alone."]]
+    assert segments[0]["translated"] == "[es] Alone."
+
+
+def test_groups_are_not_mixed(redis_client):
+    client, prefix = redis_client
+    translate = RecordingTranslate()
+    threads = [
+        threading.Thread(
+            target=MicroBatcher(client, window_ms=200, prefix=prefix).translate,
+            args=(make_segments(f"{lang} text"), lang, translate),
+        )
+        for lang in ("es", "pt")
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(translate.calls) == [["es text"], ["pt text"]]
+
+
+def test_references_travel_with_the_request(redis_client):
+    client, prefix = redis_client
+    translate = RecordingTranslate()
+    jobs = {n: make_segments(f"job {n}") for n in range(2)}
+    references = {n: [[[f"source {n}", f"translation {n}", 0.9]]] for n in jobs}
+
+    def run(n):
+        MicroBatcher(client, window_ms=300, prefix=prefix).translate(jobs[n], "es", translate, references[n])
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in jobs]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(translate.calls) == 1
+    by_text = dict(zip(translate.calls[0], translate.references[0]))
+    assert by_text == {f"job {n}": references[n][0] for n in jobs}
+
+
+def test_followers_wait_out_a_call_longer_than_the_heartbeat(redis_client):
+    client, prefix = redis_client
+    translate = RecordingTranslate(delay=1.0)
+    jobs = {n: make_segments(f"job {n}") for n in range(2)}
+
+    def run(n):
+        MicroBatcher(client, window_ms=200, heartbeat=0.3, prefix=prefix).translate(jobs[n], "es", translate)
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in jobs]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(translate.calls) == 1
+    assert [segs[0]["translated"] for segs in jobs.values()] == ["[es] job 0", "[es] job 1"]
+
+
+def test_follower_translates_alone_when_the_leader_dies(redis_client, sink):
+    client, prefix = redis_client
+    translate = RecordingTranslate()
+    segments = make_segments("Orphaned.")
+    batcher = MicroBatcher(client, window_ms=200, heartbeat=0.3, prefix=prefix)
+    group = hashlib.sha256(b"es").hexdigest()[:16]
+    client.set(f"{prefix}:lead:{group}", "dead-leader")
+    follower = threading.Thread(target=batcher.translate, args=(segments, "es", translate))
+    follower.start()
+    time.sleep(0.1)
+    # The leader takes the queue and dies without ever refreshing the request
+    client.delete(f"{prefix}:q:{group}")
+    start = time.monotonic()
+    follower.join(timeout=5)
+
+    assert not follower.is_alive()
+    assert time.monotonic() - start < 3.0
+    assert translate.calls == [["Orphaned."]]
+    assert sink.counter("micro_batch.translated_alone") == 1
@@ -0,0 +1,130 @@
+from unittest.mock import patch
+
+from workers import metrics
+from workers.prescorer import PreScore, evaluate, prescore, prescore_segments
+from workers.scorer import ScoreResult
+
+LONG_SOURCE = "The Montclair Board of Education voted on Tuesday to approve the $118 million budget for next year."
+LONG_SPANISH = (
+    "La Junta de Educación de Montclair votó el martes para aprobar el presupuesto "
+    "de $118 millones para el próximo año."
+)
+
+
+def test_short_clean_segment_passes():
+    result = prescore("Photo by Jane Doe.", "Foto de Jane Doe.", "es")
+    assert result.verdict == "pass"
+    assert result.provisional.needs_review is False
+
+
+def test_names_only_segment_passes_even_when_unchanged():
+    assert prescore("TRENTON, N.J.", "TRENTON, N.J.", "es").verdict == "pass"
+
+
+def test_long_clean_segment_is_ambiguous():
+    assert prescore(LONG_SOURCE, LONG_SPANISH, "es").verdict == "ambiguous"
+
+
+def test_identical_output_fails():
+    result = prescore(LONG_SOURCE, LONG_SOURCE, "es")
+    assert result.verdict == "fail"
+    assert result.provisional.needs_review is True
+    assert result.provisional.flags == ["translation is identical to the source"]
+
+
+def test_empty_output_fails():
+    assert prescore("Hello world.", "", "es").verdict == "fail"
+
+
+def test_mostly_untranslated_output_fails():
+    output = "La Junta voted on Tuesday to approve the $118 million budget for next year."
+    result = prescore(LONG_SOURCE, output, "es")
+    assert result.verdict == "fail"
+    assert any("untranslated" in flag for flag in result.flags)
+
+
+def test_dropped_number_fails():
+    output = LONG_SPANISH.replace("$118 millones", "el presupuesto")
+    result = prescore(LONG_SOURCE, output, "es")
+    assert result.verdict == "fail"
+    assert "numbers missing from translation: 118" in result.flags
+
+
+def test_reformatted_numbers_are_preserved():
+    result = prescore("The state spent 1.3 billion on 40,000 homes.", "El estado gastó 1,300 millones en 40.000 viviendas.", "es")
+    assert not any("numbers" in flag for flag in result.flags)
+
+
+def test_spelled_out_small_numbers_are_allowed():
+    assert prescore("Three people and 5 dogs.", "Tres personas y cinco perros.", "es").verdict == "pass"
+
+
+def test_missing_bill_number_fails():
+    result = prescore("The bill, A1475, caps costs.", "El proyecto de ley limita los costos.", "es")
+    assert result.verdict == "fail"
+    assert "bill numbers missing from translation: A1475" in result.flags
+
+
+def test_changed_html_characters_fail():
+    result = prescore("Smith & Sons opened.", "Smith y Sons abrió.", "es")
+    assert result.verdict == "fail"
+
+
+def test_length_ratio_far_off_fails():
+    assert prescore(LONG_SOURCE, "Presupuesto de $118.", "es").verdict == "fail"
+
+
+def test_length_ratio_uses_language_expectation():
+    chinese = "蒙特克莱尔教育委员会周二投票批准了明年1.18亿美元的预算。"
+    assert not any("length ratio" in flag for flag in prescore(LONG_SOURCE, chinese, "zh").flags)
+
+
+def test_missing_glossary_term_is_ambiguous():
+    source = "The Junta de Educación met."
+    result = prescore(source, "La junta se reunió.", "es", glossary_targets=["Junta de Educación"])
+    assert result.verdict == "ambiguous"
+    assert result.flags == ["glossary term missing: Junta de Educación"]
+
+
+def test_prescore_segments_counts_verdicts():
+    sink = metrics.InMemorySink()
+    metrics.set_sink(sink)
+    try:
+        prescores = prescore_segments([("Hello.", "Hola."), (LONG_SOURCE, LONG_SOURCE)], "es")
+    finally:
+        metrics.set_sink(None)
+    assert [p.verdict for p in prescores] == ["pass", "fail"]
+    assert sink.counter("prescorer.pass", target_language="es") == 1
+    assert sink.counter("prescorer.fail", target_language="es") == 1
+
+
+def test_prescore_segments_off():
+    with patch("workers.prescorer.PRESCORE_MODE", "off"):
+        assert prescore_segments([("Hello.", "Hola.")], "es") is None
+
+
+def test_evaluate_counts_avoidable_and_agreement():
+    good = ScoreResult(overall=4.5, fluency=4.5, accuracy=4.5)
+    bad = ScoreResult(overall=2.0, fluency=2.0, accuracy=2.0)
+    prescores = [PreScore("pass"), PreScore("fail", ["x"]), PreScore("pass"), PreScore("ambiguous")]
+    summary = evaluate(prescores, [good, good, None, bad], "es")
+    assert summary == {"segments": 4, "avoidable": 3, "compared": 2, "agreed": 1}
+
+
+def test_untranslated_headlines_fail():
+    for headline in ("Murphy Signs State Budget Into Law", "NJ Transit Fare Hike Approved"):
+        assert prescore(headline, headline, "es").verdict == "fail"
+        assert prescore(headline, headline.upper() + ".", "es").verdict == "fail"
+
+
+def test_unchanged_names_only_segment_needs_claude_unless_trivially_short():
+    assert prescore("Jane Doe", "Jane Doe", "es").verdict == "pass"
+    source = "Phil Murphy, Tahesha Way, NJ Transit"
+    assert prescore(source, source, "es").verdict == "fail"
+    assert prescore(source, "Phil Murphy, Tahesha Way y NJ Transit", "es").verdict == "pass"
+
+
+def test_segment_marked_needs_review_never_passes():
+    assert prescore("Photo by Jane Doe.", "Foto de Jane Doe.", "es", needs_review=True).verdict == "ambiguous"
+    prescores = prescore_segments([("Hello.", "Hola."), ("Hello.", "Hola.")], "es", needs_review=[False, True])
+    assert [p.verdict for p in prescores] == ["pass", "ambiguous"]
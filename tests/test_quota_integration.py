@@ -93,3 +93,16 @@ def test_quota_key_has_ttl(redis_client, org_id):
     assert ttl <= 86400, f"TTL {ttl}s exceeds 24 hours"
 
     redis_client.delete(key)
+
+
+def test_multi_language_charge_is_all_or_nothing(redis_client, org_id):
+    """A request for several languages is charged in one step, or not at all."""
+    from fastapi import HTTPException
+
+    check_and_increment_quota(org_id, daily_quota=4, redis_client=redis_client, amount=3)
+    with pytest.raises(HTTPException):
+        check_and_increment_quota(org_id, daily_quota=4, redis_client=redis_client, amount=2)
+
+    key = _quota_key(org_id)
+    assert int(redis_client.get(key)) == 3
+    redis_client.delete(key)
@@ -109,3 +109,31 @@ def test_approve_fires_webhook_when_status_becomes_complete():
     payload = mock_deliver.delay.call_args[0][2]
     assert payload["status"] == "complete"
     assert payload["job_id"] == "job-999"
+
+
+def _render_review_page(quality_scores_json):
+    mock_db = MagicMock()
+    mock_db.get.return_value = _make_mock_job(quality_scores_json=quality_scores_json)
+    app.dependency_overrides[get_db] = lambda: mock_db
+    try:
+        return TestClient(app).get("/review/job-999")
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_review_page_lists_segment_scores():
+    response = _render_review_page([{"index": 0, "overall": 2.5, "needs_review": True}])
+    assert response.status_code == 200
+    assert "1 segment(s) scored" in response.text
+    assert "seg 0: 2.5/5" in response.text
+
+
+def test_review_page_shows_sampled_estimate():
+    response = _render_review_page({
+        "segments": [{"index": 3, "overall": 4.0, "needs_review": False}],
+        "estimate": {"overall": 4.1, "ci_low": 3.8, "ci_high": 4.4, "segments_scored": 30, "segments_total": 120},
+    })
+    assert response.status_code == 200
+    assert "Estimated score: <strong>4.1/5</strong>" in response.text
+    assert "sampled 30 of 120" in response.text
+    assert "seg 3: 4.0/5" in response.text
@@ -0,0 +1,79 @@
+from unittest.mock import patch
+
+import pytest
+
+from workers import sampling
+from workers.sampling import SamplePlan, estimate, plan
+
+
+def _article(paragraphs=120, headlines=3):
+    segments = [{"index": i, "tag": "h2", "text": f"Headline {i}"} for i in range(headlines)]
+    for i in range(headlines, headlines + paragraphs):
+        length = (40, 150, 400)[i % 3]
+        segments.append({"index": i, "tag": "li" if i % 10 == 0 else "p", "text": "x" * length})
+    return segments
+
+
+def test_short_articles_are_not_sampled():
+    assert plan(_article(paragraphs=20), "instant", seed="job") is None
+
+
+def test_certified_tier_scores_everything():
+    assert plan(_article(), "certified", seed="job") is None
+
+
+def test_headlines_always_scored_and_sample_sized_by_tier():
+    segments = _article()
+    result = plan(segments, "instant", seed="job")
+    assert result.always == [0, 1, 2]
+    assert len(result.sampled) == 30
+    assert not result.sampled & set(result.always)
+    assert len(plan(segments, "reviewed", seed="job").sampled) == 50
+
+
+def test_sample_covers_every_stratum_in_proportion():
+    result = plan(_article(), "instant", seed="job")
+    for name, indexes in result.strata.items():
+        picked = result.sampled.intersection(indexes)
+        assert picked
+        assert abs(len(picked) - 30 * len(indexes) / 120) <= 1.5
+
+
+def test_sample_is_reproducible_per_job():
+    segments = _article()
+    assert plan(segments, "instant", seed="job-1").sampled == plan(segments, "instant", seed="job-1").sampled
+    assert plan(segments, "instant", seed="job-1").sampled != plan(segments, "instant", seed="job-2").sampled
+
+
+def test_policy_is_configurable_per_tier():
+    policy = sampling.SamplingPolicy(sample_size=10, always_tags=frozenset({"h2", "li"}))
+    with patch.dict(sampling.POLICIES, {"instant": policy}):
+        result = plan(_article(), "instant", seed="job")
+    assert len(result.sampled) == 10
+    assert all(i < 3 or i % 10 == 0 for i in result.always)
+
+
+def test_estimate_of_uniform_scores_is_exact():
+    result = plan(_article(), "instant", seed="job")
+    scores = {i: 4.0 for i in result.selected}
+    summary = estimate(result, scores)
+    assert summary["overall"] == 4.0
+    assert summary["ci_low"] == summary["ci_high"] == 4.0
+    assert summary["segments_scored"] == 33
+    assert summary["segments_total"] == 123
+
+
+def test_estimate_weights_strata_by_size():
+    sample_plan = SamplePlan(total=12, always=[0], strata={"a": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10], "b": [11]})
+    sample_plan.sampled = {1, 2, 11}
+    summary = estimate(sample_plan, {0: 5.0, 1: 2.0, 2: 4.0, 11: 1.0})
+    # (5 + 10 * 3 + 1 * 1) / 12
+    assert summary["overall"] == pytest.approx(3.0)
+    assert summary["ci_low"] < 3.0 < summary["ci_high"]
+
+
+def test_estimate_skips_unscored_segments():
+    sample_plan = SamplePlan(total=4, always=[0], strata={"a": [1, 2, 3]})
+    sample_plan.sampled = {1}
+    assert estimate(sample_plan, {0: 4.0})["overall"] == 4.0
+    assert estimate(sample_plan, {}) is None
@@ -0,0 +1,115 @@
+"""Tests for the quality score cache. The BoundedRedisCache test skips when REDIS_URL is unreachable."""
+import json
+import os
+import uuid
+from unittest.mock import patch
+
+import pytest
+from redis import Redis
+
+from workers import metrics
+from workers.cache import BoundedRedisCache
+from workers.score_cache import ScoreCache, score_key
+from workers.scorer import ScoreResult, score_translation, score_translations_batch
+
+
+class DictCache:
+    def __init__(self):
+        self.data = {}
+
+    def get_many(self, keys):
+        return {k: self.data[k] for k in keys if k in self.data}
+
+    def set_many(self, items):
+        self.data.update(items)
+
+
+@pytest.fixture
+def sink():
+    sink = metrics.InMemorySink()
+    metrics.set_sink(sink)
+    yield sink
+    metrics.set_sink(None)
+
+
+def _reply(prompt, **kwargs):
+    if prompt.startswith("Score this translation"):
+        return '{"overall": 4.0, "fluency": 4, "accuracy": 4, "flags": []}'
+    items = json.loads(prompt[prompt.rindex("\n[") + 1:])
+    return json.dumps([{"id": i["id"], "overall": 4.0, "fluency": 4, "accuracy": 4, "flags": []} for i in items])
+
+
+def test_key_depends_on_every_input():
+    base = score_key("Hello.", "Hola.", "es")
+    assert score_key("Hello.", "Hola.", "es") == base
+    assert score_key("Hello.", "Hola.", "pt") != base
+    assert score_key("Hello.", "Hola!", "es") != base
+    assert score_key("Hello.  ", "Hola.", "es") == base  # whitespace-normalized
+    with patch("workers.scorer.SCORING_PROMPT_TEMPLATE", "changed {target_lang}"):
+        assert score_key("Hello.", "Hola.", "es") != base
+
+
+def test_second_run_skips_claude(sink):
+    cache = ScoreCache(DictCache())
+    pairs = [("One.", "Uno."), ("Two.", "Dos."), ("Three.", "Tres.")]
+    with patch("workers.scorer.run_claude_p", side_effect=_reply) as mock_run:
+        first = score_translations_batch(pairs, target_lang="es", cache=cache)
+        second = score_translations_batch(pairs, target_lang="es", cache=cache)
+    assert mock_run.call_count == 1
+    assert second == first
+    assert sink.counter("score_cache.misses", target_language="es") == 3
+    assert sink.counter("score_cache.hits", target_language="es") == 3
+
+
+def test_only_misses_are_scored():
+    cache = ScoreCache(DictCache())
+    cache.store([("One.", "Uno.")], [ScoreResult(overall=2.0, fluency=2, accuracy=2, flags=["odd"])], "es")
+    seen = []
+    with patch("workers.scorer.run_claude_p", side_effect=_reply) as mock_run:
+        results = score_translations_batch(
+            [("One.", "Uno."), ("Two.", "Dos.")], target_lang="es", cache=cache,
+            on_batch=lambda positions, batch: seen.append(positions),
+        )
+    assert mock_run.call_count == 1
+    assert "One." not in mock_run.call_args[0][0]
+    assert results[0].flags == ["odd"] and results[0].needs_review
+    assert seen == [[0], [1]]
+
+
+def test_failed_scores_are_not_cached():
+    cache = ScoreCache(DictCache())
+    with patch("workers.scorer.run_claude_p", return_value=None):
+        assert score_translation("Hello.", "Hola.", "es", cache=cache) is None
+    assert cache.cache.data == {}
+
+
+def test_single_score_uses_cache():
+    cache = ScoreCache(DictCache())
+    with patch("workers.scorer.run_claude_p", side_effect=_reply) as mock_run:
+        score_translation("Hello.", "Hola.", "es", cache=cache)
+        result = score_translation("Hello.", "Hola.", "es", cache=cache)
+    assert mock_run.call_count == 1
+    assert result.overall == 4.0
+
+
+@pytest.fixture
+def redis_client():
+    client = Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    try:
+        client.ping()
+    except Exception:
+        pytest.skip("Redis not available")
+    return client
+
+
+def test_redis_backed_score_cache(redis_client):
+    namespace = f"test_scores_{uuid.uuid4().hex[:8]}"
+    cache = ScoreCache(BoundedRedisCache(redis_client, namespace=namespace, max_entries=10, ttl_seconds=60))
+    try:
+        cache.store([("Hello.", "Hola.")], [ScoreResult(overall=4.5, fluency=4, accuracy=5, flags=[])], "es")
+        assert cache.lookup([("Hello.", "Hola."), ("Bye.", "Adiós.")], "es") == {
+            0: ScoreResult(overall=4.5, fluency=4, accuracy=5, flags=[])
+        }
+    finally:
+        for key in redis_client.scan_iter(f"{namespace}:*"):
+            redis_client.delete(key)
@@ -1,6 +1,11 @@
 import pytest
-from unittest.mock import patch
-from workers.scorer import score_translation, ScoreResult, MAX_RETRIES
+from unittest.mock import AsyncMock, patch
+import json
+
+from workers import metrics
+from workers.scorer import (
+    score_translation, score_translations, score_translations_batch, ScoreResult, MAX_RETRIES,
+)
 
 
 def test_parses_valid_score_output():
@@ -76,3 +81,100 @@ def test_curly_braces_in_content_do_not_raise():
         )
     assert result is not None
     assert result.overall == 4.0
+
+
+def test_score_translations_returns_results_in_order():
+    outputs = {
+        "Hello.": '{"overall": 4.0, "fluency": 4, "accuracy": 4, "flags": []}',
+        "Bye.": '{"overall": 2.0, "fluency": 2, "accuracy": 2, "flags": ["awkward"]}',
+    }
+
+    async def fake_run(prompt, **kwargs):
+        return outputs["Hello." if "Hello." in prompt else "Bye."]
+
+    with patch("workers.scorer.run_claude_p_async", side_effect=fake_run):
+        results = score_translations([("Hello.", "Hola."), ("Bye.", "Adiós.")], target_lang="es")
+    assert [r.overall for r in results] == [4.0, 2.0]
+    assert results[1].needs_review is True
+
+
+def test_score_translations_timeout_retries_then_returns_none():
+    with patch("workers.scorer.run_claude_p_async", new=AsyncMock(return_value=None)) as mock_run:
+        results = score_translations([("Hello.", "Hola.")], target_lang="es")
+    assert results == [None]
+    assert mock_run.call_count == MAX_RETRIES + 1
+
+
+def _batch_reply(prompt, overall=4.0):
+    if prompt.startswith("Score this translation"):
+        return json.dumps({"overall": overall, "fluency": 4, "accuracy": 4, "flags": []})
+    items = json.loads(prompt[prompt.rindex("\n[") + 1:])
+    return json.dumps([
+        {"id": item["id"], "overall": overall, "fluency": 4, "accuracy": 4, "flags": []}
+        for item in items
+    ])
+
+
+def test_batch_scores_many_pairs_in_one_call():
+    pairs = [(f"Sentence {i}.", f"Oración {i}.") for i in range(5)]
+    with patch("workers.scorer.run_claude_p", side_effect=lambda prompt, **kw: _batch_reply(prompt)) as mock_run:
+        results = score_translations_batch(pairs, target_lang="es")
+    assert mock_run.call_count == 1
+    assert mock_run.call_args[0][0].startswith("Score these translations")
+    assert [r.overall for r in results] == [4.0] * 5
+
+
+def test_batch_packs_by_character_budget():
+    pairs = [("x" * 1000, "y" * 1000) for _ in range(5)]
+    with patch("workers.scorer.SCORE_CHAR_BUDGET", 4000), \
+         patch("workers.scorer.run_claude_p", side_effect=lambda prompt, **kw: _batch_reply(prompt)) as mock_run:
+        results = score_translations_batch(pairs, target_lang="es")
+    # 2 + 2 pairs in batches, the fifth alone through score_translation
+    assert mock_run.call_count == 3
+    assert all(r is not None for r in results)
+
+
+def test_batch_matches_results_by_id():
+    pairs = [("One.", "Uno."), ("Two.", "Dos.")]
+    reply = json.dumps([
+        {"id": 1, "overall": 2.0, "fluency": 2, "accuracy": 2, "flags": ["wrong"]},
+        {"id": 0, "overall": 5.0, "fluency": 5, "accuracy": 5, "flags": []},
+    ])
+    with patch("workers.scorer.run_claude_p", return_value=reply):
+        results = score_translations_batch(pairs, target_lang="es")
+    assert results[0].overall == 5.0
+    assert results[1].needs_review is True
+
+
+def test_batch_falls_back_per_item_for_missing_or_malformed_entries():
+    pairs = [(f"S{i}.", f"T{i}.") for i in range(3)]
+    reply = json.dumps([
+        {"id": 0, "overall": 4.0, "fluency": 4, "accuracy": 4, "flags": []},
+        {"id": 1, "overall": None, "fluency": 4, "accuracy": 4, "flags": []},
+    ])
+    single = '{"overall": 3.5, "fluency": 3, "accuracy": 4, "flags": []}'
+    sink = metrics.InMemorySink()
+    metrics.set_sink(sink)
+    with patch("workers.scorer.run_claude_p", side_effect=[reply, single, single]) as mock_run:
+        results = score_translations_batch(pairs, target_lang="es")
+    assert mock_run.call_count == 3
+    assert [r.overall for r in results] == [4.0, 3.5, 3.5]
+    metrics.set_sink(None)
+    assert sink.counter("scorer.batch_fallbacks", target_language="es") == 2
+
+
+def test_batch_timeout_retries_then_gives_up():
+    pairs = [("One.", "Uno."), ("Two.", "Dos.")]
+    with patch("workers.scorer.run_claude_p", return_value=None) as mock_run:
+        results = score_translations_batch(pairs, target_lang="es")
+    assert results == [None, None]
+    assert mock_run.call_count == MAX_RETRIES + 1
+
+
+def test_batch_reports_each_batch():
+    pairs = [("x" * 1000, "y" * 1000) for _ in range(4)]
+    seen = []
+    with patch("workers.scorer.SCORE_CHAR_BUDGET", 4000), \
+         patch("workers.scorer.run_claude_p", side_effect=lambda prompt, **kw: _batch_reply(prompt)):
+        score_translations_batch(pairs, target_lang="es", on_batch=lambda positions, results: seen.append(positions))
+    assert seen == [[0, 1], [2, 3]]
@@ -0,0 +1,52 @@
+from unittest.mock import patch
+
+from workers.style_rules import (
+    RULE_TRIGGERS,
+    SPANISH_RULE_BLOCKS,
+    SPANISH_STYLE_RULES,
+    select_blocks,
+    spanish_style_rules,
+)
+
+
+def test_every_block_has_a_trigger():
+    assert set(RULE_TRIGGERS) == set(SPANISH_RULE_BLOCKS)
+
+
+def test_full_rules_contain_every_block():
+    for block in SPANISH_RULE_BLOCKS.values():
+        assert block.strip("\n") in SPANISH_STYLE_RULES
+
+
+def test_blocks_follow_content():
+    assert "money" in select_blocks(["The program costs $20 million."])
+    assert "acronyms" in select_blocks(["Officers from ICE arrived."])
+    assert "state_names" in select_blocks(["She moved to Pennsylvania."])
+    assert "bill_numbers" in select_blocks(["Lawmakers advanced A1475."])
+    assert select_blocks(["Residents packed the hall."]) == []
+
+
+def test_selected_rules_keep_guide_order():
+    rules = spanish_style_rules(["The U.S. spent $1 billion, officials said."])
+    assert rules.index("LARGE NUMBERS & MONEY") < rules.index("UNITED STATES") < rules.index("ATTRIBUTIVE VERBS")
+    assert "STATE NAMES" not in rules
+
+
+def test_unsure_classifier_sends_full_rules():
+    assert spanish_style_rules([]) == SPANISH_STYLE_RULES
+    assert spanish_style_rules(["BREAKING: COUNCIL APPROVES NEW BUDGET"]) == SPANISH_STYLE_RULES
+
+
+def test_nearly_every_block_needed_sends_full_rules():
+    dense = (
+        'Gov. Phil Murphy said "the U.S. and/or New Jersey", on Tuesday, March 4, 2025 at 3:00 p.m., '
+        "would fund the $1.3 billion ICE, ACLU and GOP bill A1475 in Bergen County for a former "
+        "charter school 20 miles away, according to Medicaid officials."
+    )
+    assert select_blocks([dense]) is None
+    assert spanish_style_rules([dense]) == SPANISH_STYLE_RULES
+
+
+def test_filter_can_be_disabled():
+    with patch("workers.style_rules.STYLE_FILTER", False):
+        assert spanish_style_rules(["Residents packed the hall."]) == SPANISH_STYLE_RULES
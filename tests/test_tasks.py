@@ -19,6 +19,7 @@ def _make_mock_job(**overrides):
     mock_job.target_language = "es"
     mock_job.tier = "instant"
     mock_job.glossary_id = None
+    mock_job.org_id = None
     mock_job.callback_url = None
     for k, v in overrides.items():
         setattr(mock_job, k, v)
@@ -33,7 +34,7 @@ def test_translation_task_updates_job_status():
 
     with patch("workers.tasks.get_db_session", return_value=mock_db), \
          patch("workers.tasks.translate_segments", return_value=[SEGMENT]), \
-         patch("workers.tasks.score_translation", return_value=None), \
+         patch("workers.tasks.score_translations_batch", return_value=[]), \
          patch("workers.tasks.deliver_webhook"):
         from workers.tasks import run_translation_pipeline
         run_translation_pipeline("job-123")
@@ -51,13 +52,17 @@ def test_pipeline_sets_translating_status():
     class TrackedJob:
         id = "job-123"
         content = "<p>Hello world.</p>"
+        source_language = "en"
         target_language = "es"
         tier = "instant"
         glossary_id = None
+        org_id = None
         callback_url = None
         word_count = 0
         translated_content = ""
         quality_scores_json = None
+        metadata_json = None
+        checkpoint_json = None
         error_message = None
         completed_at = None
 
@@ -74,7 +79,7 @@ def test_pipeline_sets_translating_status():
 
     with patch("workers.tasks.get_db_session", return_value=mock_db), \
          patch("workers.tasks.translate_segments", return_value=[SEGMENT]), \
-         patch("workers.tasks.score_translation", return_value=None), \
+         patch("workers.tasks.score_translations_batch", return_value=[]), \
          patch("workers.tasks.deliver_webhook"):
         from workers.tasks import run_translation_pipeline
         run_translation_pipeline("job-123")
@@ -97,7 +102,7 @@ def test_pipeline_commits_at_least_three_times():
 
     with patch("workers.tasks.get_db_session", return_value=mock_db), \
          patch("workers.tasks.translate_segments", return_value=[SEGMENT]), \
-         patch("workers.tasks.score_translation", return_value=None), \
+         patch("workers.tasks.score_translations_batch", return_value=[]), \
          patch("workers.tasks.deliver_webhook"):
         from workers.tasks import run_translation_pipeline
         run_translation_pipeline("job-123")
@@ -337,39 +342,33 @@ def test_pipeline_returns_early_when_job_not_found():
     assert result is None
 
 
-def test_pipeline_applies_glossary_when_glossary_id_set():
-    """When job.glossary_id is set, apply_glossary is called with the glossary's terms."""
-    from db.models import Glossary, TranslationJob
+def test_pipeline_applies_glossary_stack():
+    """The job's glossary stack is resolved through the compiled-glossary cache and applied in one pass."""
+    from workers.glossary import GlossaryMatcher
+    from workers.glossary_cache import CompiledGlossary
+    from workers.glossary_stack import StackSpec
 
     mock_db = MagicMock()
-    mock_job = _make_mock_job(glossary_id="gloss-1")
-
-    mock_glossary = MagicMock()
-    mock_glossary.terms_json = {"Assembly": "Asamblea"}
-
-    def get_side_effect(model, id):
-        if model == TranslationJob:
-            return mock_job
-        if model == Glossary:
-            return mock_glossary
-        return None
-
-    mock_db.get.side_effect = get_side_effect
+    mock_job = _make_mock_job(glossary_id="gloss-1", content="<p>The Assembly met.</p>")
+    mock_db.get.return_value = mock_job
+    terms = {"Assembly": "Asamblea"}
+    mock_cache = MagicMock()
+    mock_cache.get.return_value = CompiledGlossary(
+        key=(), layers=(), terms=terms, matcher=GlossaryMatcher(terms), glossary_version="g1"
+    )
 
     with patch("workers.tasks.get_db_session", return_value=mock_db), \
-         patch("workers.tasks.translate_segments", return_value=[SEGMENT]), \
-         patch("workers.tasks.score_translation", return_value=None), \
-         patch("workers.tasks.apply_glossary") as mock_apply_glossary, \
+         patch("workers.tasks.translate_segments", return_value=[SEGMENT]) as mock_translate, \
+         patch("workers.tasks.score_translations_batch", return_value=[]), \
+         patch("workers.tasks.get_glossary_cache", return_value=mock_cache), \
          patch("workers.tasks.deliver_webhook"):
-        mock_apply_glossary.side_effect = lambda text, terms: text
         from workers.tasks import run_translation_pipeline
         run_translation_pipeline("job-123")
 
-    assert mock_apply_glossary.called, "apply_glossary was never called"
-    called_terms = mock_apply_glossary.call_args[0][1]
-    assert called_terms == {"Assembly": "Asamblea"}, (
-        f"Expected apply_glossary called with glossary terms, got: {called_terms}"
-    )
+    assert mock_cache.get.call_args_list[0].args[0] == StackSpec("en-es", None, "gloss-1")
+    segments = mock_translate.call_args[0][0]
+    assert segments[0]["text"] == "The Asamblea met."
+    assert mock_translate.call_args.kwargs["glossary_version"] == "g1"
 
 
 def test_pipeline_does_not_fire_webhook_for_review_tier():
@@ -382,7 +381,7 @@ def test_pipeline_does_not_fire_webhook_for_review_tier():
 
     with patch("workers.tasks.get_db_session", return_value=mock_db), \
          patch("workers.tasks.translate_segments", return_value=[SEGMENT]), \
-         patch("workers.tasks.score_translation", return_value=None), \
+         patch("workers.tasks.score_translations_batch", return_value=[]), \
          patch("workers.tasks.assign_reviewer", return_value=None), \
          patch("workers.tasks.deliver_webhook", mock_deliver):
         from workers.tasks import run_translation_pipeline
@@ -404,7 +403,7 @@ def test_pipeline_calls_assign_reviewer_for_review_tier():
 
     with patch("workers.tasks.get_db_session", return_value=mock_db), \
          patch("workers.tasks.translate_segments", return_value=[SEGMENT]), \
-         patch("workers.tasks.score_translation", return_value=None), \
+         patch("workers.tasks.score_translations_batch", return_value=[]), \
          patch("workers.tasks.assign_reviewer", mock_assign), \
          patch("workers.tasks.deliver_webhook"):
         from workers.tasks import run_translation_pipeline
@@ -427,7 +426,7 @@ def test_pipeline_handles_empty_segments():
          patch("workers.tasks.segment_html", return_value=[]), \
          patch("workers.tasks.translate_segments", return_value=[]), \
          patch("workers.tasks.reassemble_html", return_value="") as mock_reassemble, \
-         patch("workers.tasks.score_translation", return_value=None), \
+         patch("workers.tasks.score_translations_batch", return_value=[]), \
          patch("workers.tasks.deliver_webhook"):
         from workers.tasks import run_translation_pipeline
         run_translation_pipeline("job-123")
@@ -438,3 +437,498 @@ def test_pipeline_handles_empty_segments():
     assert mock_job.status == "complete", (
         f"Expected status='complete', got: {mock_job.status}"
     )
+
+
+def test_job_parallelism_reads_metadata_and_clamps():
+    from workers.tasks import job_parallelism
+    from workers.translator import BATCH_PARALLELISM, MAX_BATCH_PARALLELISM
+
+    assert job_parallelism(_make_mock_job(metadata_json=None)) == BATCH_PARALLELISM
+    assert job_parallelism(_make_mock_job(metadata_json={"parallelism": 3})) == 3
+    assert job_parallelism(_make_mock_job(metadata_json={"parallelism": 99})) == MAX_BATCH_PARALLELISM
+    assert job_parallelism(_make_mock_job(metadata_json={"parallelism": 0})) == 1
+    assert job_parallelism(_make_mock_job(metadata_json={"parallelism": "lots"})) == BATCH_PARALLELISM
+
+
+def test_fanout_prepares_once_and_dispatches_each_language():
+    from workers.segmenter import segment_html
+
+    mock_db = MagicMock()
+    parent = _make_mock_job(id="parent-1", target_language="multi", content="<p>Hello world.</p>")
+    children = [_make_mock_job(id=f"child-{lang}", target_language=lang) for lang in ("es", "pt", "ht")]
+    mock_db.get.return_value = parent
+    mock_db.query.return_value.filter.return_value.all.return_value = children
+
+    with patch("workers.tasks.get_db_session", return_value=mock_db), \
+         patch("workers.tasks.segment_html", wraps=segment_html) as seg, \
+         patch("workers.tasks.run_translation_pipeline") as mock_pipeline:
+        from workers.tasks import run_fanout_pipeline
+        run_fanout_pipeline("parent-1")
+
+    seg.assert_called_once()
+    assert parent.status == "dispatched"
+    assert "word_count" not in vars(parent)  # never assigned: the children carry the usage
+    dispatched = [c.args for c in mock_pipeline.delay.call_args_list]
+    assert [job_id for job_id, _ in dispatched] == ["child-es", "child-pt", "child-ht"]
+    prepared = dispatched[0][1]
+    assert prepared == {"segments": [dict(prepared["segments"][0], text="Hello world.")]}
+
+
+def test_child_job_applies_its_own_glossary_stack():
+    from workers.glossary import GlossaryMatcher
+    from workers.glossary_cache import CompiledGlossary
+
+    mock_db = MagicMock()
+    mock_job = _make_mock_job(id="child-pt", target_language="pt", metadata_json=None)
+    mock_db.get.return_value = mock_job
+    terms = {"world": "mundo"}
+    mock_cache = MagicMock()
+    mock_cache.get.return_value = CompiledGlossary(
+        key=(), layers=(), terms=terms, matcher=GlossaryMatcher(terms), glossary_version="pt1"
+    )
+
+    with patch("workers.tasks.get_db_session", return_value=mock_db), \
+         patch("workers.tasks.segment_html") as seg, \
+         patch("workers.tasks.translate_segments", return_value=[SEGMENT]) as mock_translate, \
+         patch("workers.tasks.score_translations_batch", return_value=[]), \
+         patch("workers.tasks.get_glossary_cache", return_value=mock_cache), \
+         patch("workers.tasks.deliver_webhook"):
+        from workers.tasks import run_translation_pipeline
+        run_translation_pipeline("child-pt", {"segments": [dict(SEGMENT, translated=None)]})
+
+    seg.assert_not_called()
+    assert mock_cache.get.call_args_list[0].args[0].language_pair == "en-pt"
+    assert mock_translate.call_args[0][0][0]["text"] == "Hello mundo."
+    assert mock_translate.call_args.kwargs["glossary_version"] == "pt1"
+
+
+def test_child_job_skips_segmentation():
+    from workers.glossary import GlossaryMatcher
+    from workers.glossary_cache import CompiledGlossary
+
+    mock_db = MagicMock()
+    mock_job = _make_mock_job(id="child-pt", target_language="pt", metadata_json=None)
+    mock_db.get.return_value = mock_job
+    prepared = {"segments": [dict(SEGMENT, translated=None)]}
+    mock_cache = MagicMock()
+    mock_cache.get.return_value = CompiledGlossary(
+        key=(), layers=(), terms={}, matcher=GlossaryMatcher({}), glossary_version=""
+    )
+
+    with patch("workers.tasks.get_db_session", return_value=mock_db), \
+         patch("workers.tasks.segment_html") as seg, \
+         patch("workers.tasks.translate_segments", return_value=[SEGMENT]) as mock_translate, \
+         patch("workers.tasks.score_translations_batch", return_value=[]), \
+         patch("workers.tasks.get_glossary_cache", return_value=mock_cache), \
+         patch("workers.tasks.deliver_webhook"):
+        from workers.tasks import run_translation_pipeline
+        run_translation_pipeline("child-pt", prepared)
+
+    seg.assert_not_called()
+    assert mock_translate.call_args.kwargs["glossary_version"] == ""
+    assert mock_translate.call_args.kwargs["target_language"] == "pt"
+    assert mock_job.status == "complete"
+
+
+class _Score:
+    overall = 4.0
+    fluency = 4.0
+    accuracy = 4.0
+    flags = []
+    needs_review = False
+
+
+def _score_all(pairs, target_lang, on_batch=None, cache=None):
+    results = [_Score() for _ in pairs]
+    if on_batch is not None:
+        on_batch(list(range(len(pairs))), results)
+    return results
+
+
+def test_retry_resumes_from_checkpoint():
+    """A retry translates only unfinished segments and scores only unscored ones."""
+    segments = [
+        {"index": i, "tag": "p", "text": f"Sentence {i}.", "inner_html": f"<p>Sentence {i}.</p>", "translated": None}
+        for i in range(3)
+    ]
+    segments[0]["translated"] = "Oración 0."
+    mock_db = MagicMock()
+    mock_job = _make_mock_job(metadata_json=None, checkpoint_json={
+        "stage": "translating",
+        "glossary_version": "",
+        "segments": segments,
+        "translated": [0],
+        "scores": [],
+        "scored": [],
+    })
+    mock_db.get.return_value = mock_job
+
+    def fake_translate(pending, **kwargs):
+        for seg in pending:
+            seg["translated"] = seg["text"].replace("Sentence", "Oración")
+        return pending
+
+    with patch("workers.tasks.get_db_session", return_value=mock_db), \
+         patch("workers.tasks.segment_html") as seg, \
+         patch("workers.tasks.translate_segments", side_effect=fake_translate) as mock_translate, \
+         patch("workers.tasks.score_translations_batch", side_effect=_score_all) as mock_score, \
+         patch("workers.prescorer.PRESCORE_MODE", "off"), \
+         patch("workers.tasks.deliver_webhook"):
+        from workers.tasks import run_translation_pipeline
+        run_translation_pipeline("job-123")
+
+    seg.assert_not_called()
+    assert [s["index"] for s in mock_translate.call_args[0][0]] == [1, 2]
+    assert len(mock_score.call_args[0][0]) == 3
+    assert "Oración 0." in mock_job.translated_content
+    assert mock_job.checkpoint_json == {"stage": "done", "total": 3, "translated": 3, "scored": 3}
+
+
+def test_scoring_resumes_after_scored_segments():
+    segments = [
+        {"index": i, "tag": "p", "text": f"S{i}.", "inner_html": f"<p>S{i}.</p>", "translated": f"T{i}."}
+        for i in range(2)
+    ]
+    previous = {"index": 0, "overall": 4.5, "fluency": 4.5, "accuracy": 4.5, "flags": [], "needs_review": False}
+    mock_db = MagicMock()
+    mock_job = _make_mock_job(metadata_json=None, checkpoint_json={
+        "stage": "scoring",
+        "glossary_version": "",
+        "segments": segments,
+        "translated": [0, 1],
+        "scores": [previous],
+        "scored": [0],
+    })
+    mock_db.get.return_value = mock_job
+
+    with patch("workers.tasks.get_db_session", return_value=mock_db), \
+         patch("workers.tasks.translate_segments") as mock_translate, \
+         patch("workers.tasks.score_translations_batch", side_effect=_score_all) as mock_score, \
+         patch("workers.prescorer.PRESCORE_MODE", "off"), \
+         patch("workers.tasks.deliver_webhook"):
+        from workers.tasks import run_translation_pipeline
+        run_translation_pipeline("job-123")
+
+    mock_translate.assert_not_called()
+    assert mock_score.call_args[0][0] == [("S1.", "T1.")]
+    assert [s["index"] for s in mock_job.quality_scores_json] == [0, 1]
+    assert mock_job.quality_scores_json[0]["overall"] == 4.5
+
+
+def _pipeline_with_scoring_segments(texts, mode):
+    segments = [
+        {"index": i, "tag": "p", "text": source, "inner_html": f"<p>{source}</p>", "translated": translated}
+        for i, (source, translated) in enumerate(texts)
+    ]
+    mock_db = MagicMock()
+    mock_job = _make_mock_job(metadata_json=None, checkpoint_json={
+        "stage": "scoring",
+        "glossary_version": "",
+        "segments": segments,
+        "translated": list(range(len(segments))),
+        "scores": [],
+        "scored": [],
+    })
+    mock_db.get.return_value = mock_job
+    with patch("workers.tasks.get_db_session", return_value=mock_db), \
+         patch("workers.tasks.score_translations_batch", side_effect=_score_all) as mock_score, \
+         patch("workers.prescorer.PRESCORE_MODE", mode), \
+         patch("workers.tasks.deliver_webhook"):
+        from workers.tasks import run_translation_pipeline
+        run_translation_pipeline("job-123")
+    return mock_job, mock_score
+
+
+LONG_SEGMENT = (
+    "The Montclair Board of Education voted on Tuesday to approve the budget for next year.",
+    "La Junta de Educación de Montclair votó el martes para aprobar el presupuesto del próximo año.",
+)
+
+
+def test_prescorer_settles_clear_segments_without_claude():
+    texts = [("Photo by Jane Doe.", "Foto de Jane Doe."), LONG_SEGMENT, (LONG_SEGMENT[0], LONG_SEGMENT[0])]
+    mock_job, mock_score = _pipeline_with_scoring_segments(texts, "on")
+
+    assert mock_score.call_args[0][0] == [LONG_SEGMENT]
+    scores = mock_job.quality_scores_json
+    assert [s["index"] for s in scores] == [0, 1, 2]
+    assert scores[0]["needs_review"] is False
+    assert scores[2]["needs_review"] is True
+    assert scores[2]["flags"] == ["translation is identical to the source"]
+
+
+def test_prescorer_eval_mode_still_scores_everything():
+    texts = [("Photo by Jane Doe.", "Foto de Jane Doe."), LONG_SEGMENT]
+    mock_job, mock_score = _pipeline_with_scoring_segments(texts, "eval")
+
+    assert len(mock_score.call_args[0][0]) == 2
+    assert [s["index"] for s in mock_job.quality_scores_json] == [0, 1]
+
+
+def _scoring_checkpoint():
+    return {
+        "stage": "translating",
+        "glossary_version": "",
+        "segments": [dict(SEGMENT, translated=None)],
+        "translated": [],
+        "scores": [],
+        "scored": [],
+    }
+
+
+def _translate_all(pending, **kwargs):
+    for seg in pending:
+        seg["translated"] = "Hola mundo."
+    return pending
+
+
+def test_deferred_scoring_completes_before_scores():
+    mock_db = MagicMock()
+    mock_job = _make_mock_job(
+        metadata_json={"defer_scoring": True},
+        callback_url="https://example.com/hook",
+        checkpoint_json=_scoring_checkpoint(),
+        quality_scores_json=None,
+    )
+    mock_db.get.return_value = mock_job
+
+    with patch("workers.tasks.get_db_session", return_value=mock_db), \
+         patch("workers.tasks.translate_segments", side_effect=_translate_all), \
+         patch("workers.tasks.score_translations_batch") as mock_score, \
+         patch("workers.tasks.score_job") as mock_score_job, \
+         patch("workers.tasks.deliver_webhook") as mock_webhook:
+        from workers.tasks import run_translation_pipeline
+        run_translation_pipeline("job-123")
+
+    mock_score.assert_not_called()
+    mock_score_job.delay.assert_called_once_with("job-123")
+    assert mock_job.status == "complete"
+    payload = mock_webhook.delay.call_args[0][2]
+    assert payload["scores_pending"] is True
+    assert payload["quality_scores"] is None
+    assert mock_job.checkpoint_json["stage"] == "scoring"
+
+
+def test_deferred_scoring_is_queued_before_the_webhook():
+    mock_db = MagicMock()
+    mock_job = _make_mock_job(
+        metadata_json={"defer_scoring": True},
+        callback_url="https://example.com/hook",
+        checkpoint_json=_scoring_checkpoint(),
+    )
+    mock_db.get.return_value = mock_job
+    calls = MagicMock()
+
+    with patch("workers.tasks.get_db_session", return_value=mock_db), \
+         patch("workers.tasks.translate_segments", side_effect=_translate_all), \
+         patch("workers.tasks.score_translations_batch"), \
+         patch("workers.tasks.score_job", calls.score_job), \
+         patch("workers.tasks.deliver_webhook", calls.deliver_webhook):
+        from workers.tasks import run_translation_pipeline
+        run_translation_pipeline("job-123")
+
+    assert [c[0] for c in calls.mock_calls] == ["score_job.delay", "deliver_webhook.delay"]
+
+
+def test_deferred_scoring_runs_inline_when_it_cannot_be_queued():
+    mock_db = MagicMock()
+    mock_job = _make_mock_job(
+        metadata_json={"defer_scoring": True},
+        callback_url="https://example.com/hook",
+        checkpoint_json=_scoring_checkpoint(),
+        quality_scores_json=None,
+    )
+    mock_db.get.return_value = mock_job
+
+    with patch("workers.tasks.get_db_session", return_value=mock_db), \
+         patch("workers.tasks.translate_segments", side_effect=_translate_all), \
+         patch("workers.tasks.score_translations_batch", side_effect=_score_all), \
+         patch("workers.tasks.score_job") as mock_score_job, \
+         patch("workers.tasks.deliver_webhook") as mock_webhook:
+        mock_score_job.delay.side_effect = ConnectionError("broker down")
+        from workers.tasks import run_translation_pipeline
+        run_translation_pipeline("job-123")
+
+    assert mock_job.status == "complete"
+    payload = mock_webhook.delay.call_args[0][2]
+    assert "scores_pending" not in payload
+    assert payload["quality_scores"] == mock_job.quality_scores_json
+    assert mock_job.quality_scores_json
+    assert mock_job.checkpoint_json["stage"] == "done"
+
+
+def test_deferred_scoring_follows_org_setting():
+    from workers.tasks import defer_scoring
+
+    org = MagicMock(defer_scoring=True)
+    mock_db = MagicMock()
+    mock_db.get.return_value = org
+    assert defer_scoring(_make_mock_job(metadata_json=None, org_id="org-1"), mock_db) is True
+    # The request's metadata wins over the organization
+    assert defer_scoring(_make_mock_job(metadata_json={"defer_scoring": False}, org_id="org-1"), mock_db) is False
+    org.defer_scoring = False
+    assert defer_scoring(_make_mock_job(metadata_json=None, org_id="org-1"), mock_db) is False
+
+
+def test_glossary_layers_follow_org_setting():
+    from workers.tasks import stack_glossaries
+
+    org = MagicMock(stack_glossaries=True)
+    mock_db = MagicMock()
+    mock_db.get.return_value = org
+    assert stack_glossaries(_make_mock_job(metadata_json=None, org_id="org-1"), mock_db) is True
+    assert stack_glossaries(_make_mock_job(metadata_json={"stack_glossaries": False}, org_id="org-1"), mock_db) is False
+    assert stack_glossaries(_make_mock_job(metadata_json=None, org_id=None), mock_db) is False
+
+
+def test_reviewed_tier_never_defers_scoring():
+    mock_db = MagicMock()
+    mock_job = _make_mock_job(
+        tier="reviewed", metadata_json={"defer_scoring": True}, checkpoint_json=_scoring_checkpoint()
+    )
+    mock_db.get.return_value = mock_job
+
+    with patch("workers.tasks.get_db_session", return_value=mock_db), \
+         patch("workers.tasks.translate_segments", side_effect=_translate_all), \
+         patch("workers.tasks.score_translations_batch", side_effect=_score_all), \
+         patch("workers.prescorer.PRESCORE_MODE", "off"), \
+         patch("workers.tasks.assign_reviewer"), \
+         patch("workers.tasks.score_job") as mock_score_job, \
+         patch("workers.tasks.deliver_webhook"):
+        from workers.tasks import run_translation_pipeline
+        run_translation_pipeline("job-123")
+
+    mock_score_job.delay.assert_not_called()
+    assert mock_job.quality_scores_json[0]["index"] == 0
+
+
+def test_score_job_attaches_scores_and_sends_scores_ready():
+    mock_db = MagicMock()
+    checkpoint = _scoring_checkpoint()
+    checkpoint.update(stage="scoring", segments=[SEGMENT], translated=[0])
+    mock_job = _make_mock_job(
+        status="complete", metadata_json=None, callback_url="https://example.com/hook", checkpoint_json=checkpoint
+    )
+    mock_db.get.return_value = mock_job
+
+    with patch("workers.tasks.get_db_session", return_value=mock_db), \
+         patch("workers.tasks.score_translations_batch", side_effect=_score_all), \
+         patch("workers.prescorer.PRESCORE_MODE", "off"), \
+         patch("workers.tasks.deliver_webhook") as mock_webhook:
+        from workers.tasks import score_job
+        score_job("job-123")
+
+    assert mock_job.status == "complete"
+    assert mock_job.quality_scores_json[0]["overall"] == 4.0
+    assert mock_job.checkpoint_json["stage"] == "done"
+    payload = mock_webhook.delay.call_args[0][2]
+    assert payload["event"] == "scores_ready"
+    assert payload["quality_scores"] == mock_job.quality_scores_json
+
+
+def test_pipeline_does_not_rerun_a_job_awaiting_deferred_scores():
+    mock_db = MagicMock()
+    checkpoint = _scoring_checkpoint()
+    checkpoint.update(stage="scoring", segments=[SEGMENT], translated=[0])
+    mock_job = _make_mock_job(status="complete", checkpoint_json=checkpoint)
+    mock_db.get.return_value = mock_job
+
+    with patch("workers.tasks.get_db_session", return_value=mock_db), \
+         patch("workers.tasks.translate_segments") as mock_translate, \
+         patch("workers.tasks.score_translations_batch") as mock_score:
+        from workers.tasks import run_translation_pipeline
+        run_translation_pipeline("job-123")
+
+    mock_translate.assert_not_called()
+    mock_score.assert_not_called()
+    assert mock_job.status == "complete"
+
+
+def test_long_articles_score_a_sample():
+    segments = [{"index": 0, "tag": "h1", "text": "Headline", "inner_html": "<h1>Headline</h1>", "translated": "Titular"}]
+    segments += [
+        {"index": i, "tag": "p", "text": f"Paragraph {i}.", "inner_html": f"<p>Paragraph {i}.</p>", "translated": f"Párrafo {i}."}
+        for i in range(1, 121)
+    ]
+    mock_db = MagicMock()
+    mock_job = _make_mock_job(metadata_json=None, checkpoint_json={
+        "stage": "scoring",
+        "glossary_version": "",
+        "segments": segments,
+        "translated": list(range(121)),
+        "scores": [],
+        "scored": [],
+    })
+    mock_db.get.return_value = mock_job
+
+    with patch("workers.tasks.get_db_session", return_value=mock_db), \
+         patch("workers.tasks.score_translations_batch", side_effect=_score_all) as mock_score, \
+         patch("workers.prescorer.PRESCORE_MODE", "off"), \
+         patch("workers.tasks.deliver_webhook"):
+        from workers.tasks import run_translation_pipeline
+        run_translation_pipeline("job-123")
+
+    pairs = mock_score.call_args[0][0]
+    assert len(pairs) == 31
+    assert ("Headline", "Titular") in pairs
+    scores = mock_job.quality_scores_json
+    assert len(scores["segments"]) == 31
+    assert scores["estimate"]["overall"] == 4.0
+    assert scores["estimate"]["segments_total"] == 121
+
+
+def test_prescorer_does_not_settle_sampled_segments():
+    """Sampled segments are scored by claude, so the estimate rests on model scores only."""
+    segments = [
+        {"index": i, "tag": "p", "text": f"Paragraph {i}.", "inner_html": f"<p>Paragraph {i}.</p>", "translated": f"Párrafo {i}."}
+        for i in range(120)
+    ]
+    mock_db = MagicMock()
+    mock_job = _make_mock_job(metadata_json=None, checkpoint_json={
+        "stage": "scoring",
+        "glossary_version": "",
+        "segments": segments,
+        "translated": list(range(120)),
+        "scores": [],
+        "scored": [],
+    })
+    mock_db.get.return_value = mock_job
+
+    with patch("workers.tasks.get_db_session", return_value=mock_db), \
+         patch("workers.tasks.score_translations_batch", side_effect=_score_all) as mock_score, \
+         patch("workers.prescorer.PRESCORE_MODE", "on"), \
+         patch("workers.tasks.deliver_webhook"):
+        from workers.tasks import run_translation_pipeline
+        run_translation_pipeline("job-123")
+
+    assert len(mock_score.call_args[0][0]) == 30
+    scores = mock_job.quality_scores_json
+    assert len(scores["segments"]) == 120  # the rest settled by the pre-scorer
+    assert scores["estimate"]["segments_scored"] == 30
+
+
+def test_score_job_final_failure_leaves_job_complete_without_scores():
+    mock_db = MagicMock()
+    checkpoint = _scoring_checkpoint()
+    checkpoint.update(stage="scoring", segments=[SEGMENT], translated=[0])
+    mock_job = _make_mock_job(
+        status="complete", metadata_json=None, callback_url="https://example.com/hook",
+        checkpoint_json=checkpoint, quality_scores_json=None,
+    )
+    mock_db.get.return_value = mock_job
+
+    with patch("workers.tasks.get_db_session", return_value=mock_db), \
+         patch("workers.tasks.score_translations_batch", side_effect=RuntimeError("claude down")), \
+         patch("workers.prescorer.PRESCORE_MODE", "off"), \
+         patch("workers.tasks.deliver_webhook") as mock_webhook:
+        from workers.tasks import score_job
+        score_job.push_request(retries=3)  # retries == max_retries == 3
+        try:
+            score_job.run("job-123")
+        finally:
+            score_job.pop_request()
+
+    assert mock_job.status == "complete"
+    assert mock_job.quality_scores_json is None
+    assert mock_job.checkpoint_json == {"stage": "done", "total": 1, "translated": 1, "scored": 0}
+    mock_webhook.delay.assert_not_called()
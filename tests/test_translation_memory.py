@@ -0,0 +1,241 @@
+"""Tests for the exact-match translation memory.
+
+Most tests use a dict-backed cache; the InFlightRegistry and BoundedRedisCache
+tests at the bottom run against a real Redis and skip when REDIS_URL is unreachable.
+"""
+import json
+import os
+import uuid
+from unittest.mock import patch
+
+import pytest
+from redis import Redis
+
+from workers import metrics
+from workers.cache import BoundedRedisCache
+from workers.translation_memory import InFlightRegistry, TranslationMemory, entry_key, normalize_text
+from workers.translator import prompt_version, translate_segments
+
+
+class DictCache:
+    def __init__(self):
+        self.data = {}
+
+    def get_many(self, keys):
+        return {k: self.data[k] for k in keys if k in self.data}
+
+    def set_many(self, items):
+        self.data.update(items)
+
+
+class FakeInFlight:
+    """Registry where `taken` keys already belong to another job."""
+
+    def __init__(self, taken=()):
+        self.taken = set(taken)
+        self.claimed = set()
+        self.released = []
+
+    def claim(self, keys):
+        result = [k not in self.taken and k not in self.claimed for k in keys]
+        self.claimed.update(k for k, mine in zip(keys, result) if mine)
+        return result
+
+    def release(self, keys):
+        self.released.extend(keys)
+        self.claimed.difference_update(keys)
+
+    def active(self, keys):
+        return [k in self.taken for k in keys]
+
+
+def make_segment(text, index=0):
+    return {"index": index, "tag": "p", "text": text, "inner_html": f"<p>{text}</p>", "translated": None}
+
+
+@pytest.fixture
+def sink():
+    sink = metrics.InMemorySink()
+    metrics.set_sink(sink)
+    yield sink
+    metrics.set_sink(None)
+
+
+def test_normalize_text_collapses_whitespace_but_keeps_case():
+    assert normalize_text("  Sign up\n for our   newsletter ") == "Sign up for our newsletter"
+    assert normalize_text("Hello") != normalize_text("hello")
+
+
+def test_entry_key_depends_on_every_component():
+    base = entry_key("Hello.", "es", "g1", "p1")
+    assert entry_key("Hello.  ", "es", "g1", "p1") == base
+    assert entry_key("Hello.", "pt", "g1", "p1") != base
+    assert entry_key("Hello.", "es", "g2", "p1") != base
+    assert entry_key("Hello.", "es", "g1", "p2") != base
+
+
+def test_prompt_version_differs_between_spanish_and_generic_prompts():
+    assert prompt_version("es") != prompt_version("pt")
+    assert prompt_version("pt") == prompt_version("fr")
+
+
+def test_hits_skip_the_model_and_misses_are_stored(sink):
+    memory = TranslationMemory(DictCache())
+    memory.store([("Sign up for our newsletter.", "Suscríbase a nuestro boletín.")], "es", "", prompt_version("es"))
+    segments = [make_segment("Sign up for our newsletter.", 0), make_segment("New story.", 1)]
+
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["Nueva historia."])) as mock_run:
+        translate_segments(segments, target_language="es", memory=memory)
+
+    assert segments[0]["translated"] == "Suscríbase a nuestro boletín."
+    assert segments[1]["translated"] == "Nueva historia."
+    prompt = mock_run.call_args[0][0]
+    assert "New story." in prompt
+    assert "Sign up for our newsletter." not in prompt
+    assert memory.lookup(["New story."], "es", "", prompt_version("es")) == {0: "Nueva historia."}
+    assert sink.counter("translation_memory.hits", target_language="es") >= 1
+    assert sink.counter("translation_memory.misses", target_language="es") >= 1
+
+
+def test_all_hits_make_no_claude_call():
+    memory = TranslationMemory(DictCache())
+    memory.store([("Byline.", "Firma.")], "es", "", prompt_version("es"))
+    with patch("workers.translator.run_claude_p") as mock_run:
+        result = translate_segments([make_segment("Byline.")], target_language="es", memory=memory)
+    mock_run.assert_not_called()
+    assert result[0]["translated"] == "Firma."
+
+
+def test_fallback_translations_are_not_stored():
+    memory = TranslationMemory(DictCache())
+    with patch("workers.translator.run_claude_p", return_value=None):
+        translate_segments([make_segment("Hello.")], target_language="es", memory=memory)
+    assert memory.cache.data == {}
+
+
+def test_glossary_version_separates_entries():
+    memory = TranslationMemory(DictCache())
+    memory.store([("Hello.", "Hola.")], "es", "glossary-a", prompt_version("es"))
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["Buenas."])) as mock_run:
+        translate_segments([make_segment("Hello.")], target_language="es", memory=memory, glossary_version="glossary-b")
+    mock_run.assert_called_once()
+
+
+def test_claimed_segments_are_released_after_storing():
+    inflight = FakeInFlight()
+    memory = TranslationMemory(DictCache(), inflight=inflight)
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["Hola."])):
+        translate_segments([make_segment("Hello.")], target_language="es", memory=memory)
+    key = entry_key("Hello.", "es", "", prompt_version("es"))
+    assert inflight.released == [key]
+    assert memory.cache.data == {key: "Hola."}
+
+
+def test_segment_in_flight_elsewhere_is_waited_for(sink):
+    version = prompt_version("es")
+    key = entry_key("Shared.", "es", "", version)
+    cache = DictCache()
+    memory = TranslationMemory(cache, inflight=FakeInFlight(taken=[key]))
+
+    def other_job_finishes(_):
+        cache.data[key] = "Compartido."
+
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["Propio."])) as mock_run, \
+            patch("workers.translation_memory.time.sleep", side_effect=other_job_finishes):
+        result = translate_segments(
+            [make_segment("Shared.", 0), make_segment("Own.", 1)], target_language="es", memory=memory
+        )
+
+    mock_run.assert_called_once()
+    assert "Shared." not in mock_run.call_args[0][0]
+    assert [s["translated"] for s in result] == ["Compartido.", "Propio."]
+    assert sink.counter("translation_memory.inflight_shared", target_language="es") == 1
+
+
+def test_abandoned_claim_is_translated_locally():
+    key = entry_key("Shared.", "es", "", prompt_version("es"))
+    inflight = FakeInFlight(taken=[key])
+    memory = TranslationMemory(DictCache(), inflight=inflight)
+
+    def other_job_gives_up(_):
+        inflight.taken.clear()
+
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["Compartido."])) as mock_run, \
+            patch("workers.translation_memory.time.sleep", side_effect=other_job_gives_up):
+        result = translate_segments([make_segment("Shared.")], target_language="es", memory=memory)
+
+    mock_run.assert_called_once()
+    assert result[0]["translated"] == "Compartido."
+    assert memory.cache.data[key] == "Compartido."
+
+
+def test_wait_gives_up_after_max_wait():
+    key = entry_key("Shared.", "es", "", "p1")
+    memory = TranslationMemory(DictCache(), inflight=FakeInFlight(taken=[key]))
+    with patch("workers.translation_memory.time.sleep") as mock_sleep:
+        assert memory.wait_for(["Shared."], "es", "", "p1", max_wait=0) == {}
+    mock_sleep.assert_not_called()
+
+
+@pytest.fixture
+def redis_client():
+    client = Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    try:
+        client.ping()
+    except Exception:
+        pytest.skip("Redis not available")
+    return client
+
+
+def test_redis_inflight_claims_are_exclusive_until_released(redis_client):
+    prefix = f"test_inflight_{uuid.uuid4().hex[:8]}"
+    first = InFlightRegistry(redis_client, prefix=prefix, ttl_seconds=30)
+    second = InFlightRegistry(redis_client, prefix=prefix, ttl_seconds=30)
+    assert first.claim(["a", "b"]) == [True, True]
+    assert second.claim(["b", "c"]) == [False, True]
+    assert second.active(["a", "d"]) == [True, False]
+    first.release(["a", "b"])
+    second.release(["c"])
+    assert second.active(["a", "b", "c"]) == [False, False, False]
+
+
+def test_redis_inflight_release_leaves_a_claim_taken_over_after_expiry(redis_client):
+    prefix = f"test_inflight_{uuid.uuid4().hex[:8]}"
+    first = InFlightRegistry(redis_client, prefix=prefix, ttl_seconds=30)
+    second = InFlightRegistry(redis_client, prefix=prefix, ttl_seconds=30)
+    try:
+        assert first.claim(["a"]) == [True]
+        redis_client.delete(f"{prefix}:a")  # first's claim expires
+        assert second.claim(["a"]) == [True]
+        first.release(["a"])
+        assert first.active(["a"]) == [True]
+    finally:
+        second.release(["a"])
+
+
+@pytest.fixture
+def redis_cache(redis_client):
+    client = redis_client
+    namespace = f"test_cache_{uuid.uuid4().hex[:8]}"
+    cache = BoundedRedisCache(client, namespace=namespace, max_entries=3, ttl_seconds=60)
+    yield cache
+    client.delete(*client.keys(f"{namespace}:*") or [f"{namespace}:lru"])
+
+
+def test_redis_cache_round_trips_values(redis_cache):
+    redis_cache.set_many({"a": "uno", "b": {"score": 4}})
+    assert redis_cache.get_many(["a", "b", "c"]) == {"a": "uno", "b": {"score": 4}}
+
+
+def test_redis_cache_evicts_least_recently_used(redis_cache):
+    import time
+
+    for key in ["a", "b", "c"]:
+        redis_cache.set(key, key)
+        time.sleep(0.002)
+    redis_cache.get("a")  # "b" is now the least recently used
+    time.sleep(0.002)
+    redis_cache.set("d", "d")
+    assert redis_cache.size() == 3
+    assert redis_cache.get("b") is None
+    assert redis_cache.get("a") == "a"
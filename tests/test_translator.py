@@ -1,8 +1,9 @@
 import json
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+from workers.fuzzy_memory import FuzzyMatch
 from workers.translator import (
     SUPPORTED_TARGET_LANGUAGES,
     translate_segments,
@@ -84,12 +85,22 @@ def test_invalid_json_falls_back_to_untranslated():
 
 def test_wrong_count_falls_back_to_untranslated():
     segments = [make_segment("A."), make_segment("B.", 1)]
-    with patch("workers.translator.run_claude_p", return_value=json.dumps(["Only one translation"])):
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["x", "y", "z"])):
         result = translate_segments(segments, target_language="es")
     for seg in result:
         assert seg["needs_review"] is True
 
 
+def test_wrong_count_is_recovered_by_bisection():
+    segments = [make_segment("A."), make_segment("B.", 1)]
+    replies = [json.dumps(["Only one translation"]), json.dumps(["Uno."]), json.dumps(["Dos."])]
+    with patch("workers.translator.run_claude_p", side_effect=replies) as mock_run:
+        result = translate_segments(segments, target_language="es")
+    assert [s["translated"] for s in result] == ["Uno.", "Dos."]
+    assert not any(s.get("needs_review") for s in result)
+    assert mock_run.call_count == 3
+
+
 def test_timeout_retries_then_falls_back():
     segments = [make_segment()]
     with patch("workers.translator.run_claude_p", return_value=None) as mock_run:
@@ -108,9 +119,9 @@ def test_parse_error_does_not_retry():
 
 
 def test_spanish_prompt_includes_style_rules():
-    """Spanish translations inject Yuli's STNS style guide into the prompt."""
-    segments = [make_segment("The mayor spoke today.")]
-    with patch("workers.translator.run_claude_p", return_value=json.dumps(["El alcalde habló hoy."])) as mock_run:
+    """Spanish translations inject the parts of Yuli's STNS style guide the segments need."""
+    segments = [make_segment("The mayor said the U.S. would spend $1 billion on humanitarian parole.")]
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["El alcalde dijo..."])) as mock_run:
         translate_segments(segments, target_language="es")
     prompt_arg = mock_run.call_args[0][0]
     assert "EE. UU." in prompt_arg
@@ -119,6 +130,17 @@ def test_spanish_prompt_includes_style_rules():
     assert "expresó" in prompt_arg
 
 
+def test_spanish_prompt_leaves_out_unneeded_style_rules():
+    segments = [make_segment("Residents packed the hall to oppose the warehouse.")]
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["Los residentes..."])) as mock_run:
+        translate_segments(segments, target_language="es")
+    prompt_arg = mock_run.call_args[0][0]
+    assert "Follow these style rules" in prompt_arg
+    assert "mil millones" not in prompt_arg
+    assert "Nueva Jersey" not in prompt_arg
+    assert len(prompt_arg) < len(SPANISH_STYLE_RULES)
+
+
 def test_non_spanish_prompt_excludes_style_rules():
     """Non-Spanish languages use the generic prompt without Spanish-specific rules."""
     segments = [make_segment("The mayor spoke today.")]
@@ -140,3 +162,342 @@ def test_spanish_style_rules_constant_has_required_sections():
     assert "STATE NAMES" in SPANISH_STYLE_RULES
     assert "EE. UU." in SPANISH_STYLE_RULES
     assert "billón" in SPANISH_STYLE_RULES
+
+
+def test_streamed_segments_reach_callback_before_batch_completes():
+    segments = [make_segment("A.", 0), make_segment("B.", 1)]
+    seen = []
+
+    def fake_run(prompt, session_prefix, timeout, on_output=None, target_language=None):
+        on_output('["Uno.", ')
+        seen.append(("after first chunk", [s["translated"] for s in segments]))
+        on_output('"Dos."]')
+        return '["Uno.", "Dos."]'
+
+    delivered = []
+    with patch("workers.translator.run_claude_p", side_effect=fake_run):
+        translate_segments(segments, target_language="es", on_segment=lambda s: delivered.append(s["index"]))
+    assert seen == [("after first chunk", ["Uno.", None])]
+    assert delivered == [0, 1]
+    assert [s["translated"] for s in segments] == ["Uno.", "Dos."]
+
+
+def test_timeout_keeps_streamed_segments_and_retries_the_rest():
+    segments = [make_segment("A.", 0), make_segment("B.", 1), make_segment("C.", 2)]
+    prompts = []
+
+    def fake_run(prompt, session_prefix, timeout, on_output=None, target_language=None):
+        prompts.append(prompt)
+        if len(prompts) == 1:
+            on_output('["Uno.", "Do')  # cut off mid-element, then times out
+            return None
+        return '["Dos.", "Tres."]'
+
+    with patch("workers.translator.run_claude_p", side_effect=fake_run):
+        result = translate_segments(segments, target_language="fr")
+    assert [s["translated"] for s in result] == ["Uno.", "Dos.", "Tres."]
+    assert not any(s.get("needs_review") for s in result)
+    assert '"A."' not in prompts[1]  # retry only sends the unfinished segments
+
+
+def test_timeout_with_partial_output_counts_as_a_timeout():
+    """`timeout` exits 124 with whatever claude wrote: the planner must hear a timeout, and it isn't bisected."""
+    from workers import claude_runner
+    from workers.batching import BatchPlanner
+    from workers.claude_runner import CLIResult, ClaudeBackend, note_result
+
+    class PartialTimeoutBackend(ClaudeBackend):
+        def __init__(self):
+            self.prompts = []
+
+        def run(self, prompt, session_prefix, timeout, on_output=None):
+            self.prompts.append(prompt)
+            partial = '["Uno.", "Do'
+            on_output(partial)
+            note_result(CLIResult(output=partial, exit_code=124, timed_out=True))
+            return partial
+
+    backend = PartialTimeoutBackend()
+    planner = BatchPlanner()
+    segments = [make_segment(f"S{i}.", i) for i in range(4)]
+    claude_runner.set_backend(backend)
+    try:
+        with patch("workers.translator.get_planner", return_value=planner), \
+             patch.object(planner, "observe", wraps=planner.observe) as observe:
+            result = translate_segments(segments, target_language="fr")
+    finally:
+        claude_runner.set_backend(None)
+
+    assert observe.call_args.kwargs["timed_out"] is True
+    assert len(backend.prompts) == 3  # MAX_RETRIES + 1, no bisection
+    assert [s["translated"] for s in result[:3]] == ["Uno.", "Uno.", "Uno."]
+    assert result[3]["needs_review"] is True
+
+
+def test_garbage_element_goes_to_recovery_without_retrying():
+    segments = [make_segment("A.", 0), make_segment("B.", 1), make_segment("C.", 2)]
+    prompts = []
+    echo = _echo_batches()
+
+    def fake_run(prompt, session_prefix, timeout, on_output=None, target_language=None):
+        prompts.append(prompt)
+        if len(prompts) == 1:
+            return '["Uno.", Dos., "Tres."]'
+        return echo(prompt, session_prefix, timeout)
+
+    with patch("workers.translator.run_claude_p", side_effect=fake_run):
+        result = translate_segments(segments, target_language="fr")
+    assert [s["translated"] for s in result] == ["Uno.", "T:B.", "T:C."]
+    assert not any('"A."' in p for p in prompts[1:])  # the element before the garbage is kept
+    assert len(prompts) == 3  # B. and C. bisected, the whole batch never asked again
+
+
+def test_truncated_output_keeps_completed_segments():
+    segments = [make_segment("A.", 0), make_segment("B.", 1)]
+    with patch("workers.translator.run_claude_p", side_effect=['["Uno.", "Do', None, None]):
+        result = translate_segments(segments, target_language="fr")
+    assert result[0]["translated"] == "Uno."
+    assert not result[0].get("needs_review")
+    assert result[1]["translated"] == "B."
+    assert result[1]["needs_review"] is True
+
+
+def test_wrong_count_overrides_streamed_segments():
+    segments = [make_segment("A.", 0), make_segment("B.", 1)]
+    delivered = []
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["x", "y", "z"])):
+        translate_segments(segments, target_language="es", on_segment=lambda s: delivered.append(dict(s)))
+    assert all(s["needs_review"] for s in segments)
+    assert delivered[-1]["translated"] == "B."
+
+
+def _echo_batches(delay=0.0, fail_marker=None):
+    """fake run_claude_p: translates each text to "T:<text>" after `delay`; None for prompts containing fail_marker."""
+    import time
+
+    def fake_run(prompt, session_prefix, timeout, on_output=None, target_language=None):
+        time.sleep(delay)
+        if fail_marker and fail_marker in prompt:
+            return None
+        texts = json.loads(prompt[prompt.rindex("\n[") + 1:])
+        return json.dumps([f"T:{t}" for t in texts])
+
+    return fake_run
+
+
+def test_batches_run_concurrently_and_keep_order():
+    import time
+
+    segments = [make_segment(f"Segment {i}.", i) for i in range(8)]
+    with patch("workers.translator.BATCH_SIZE", 2), \
+         patch("workers.translator.run_claude_p", side_effect=_echo_batches(delay=0.2)):
+        start = time.monotonic()
+        result = translate_segments(segments, target_language="pt", parallelism=4)
+        elapsed = time.monotonic() - start
+    assert [s["translated"] for s in result] == [f"T:Segment {i}." for i in range(8)]
+    assert elapsed < 0.6  # four sequential batches would take >= 0.8s
+
+
+def test_parallel_batch_failure_falls_back_only_for_that_batch():
+    segments = [make_segment(f"Segment {i}.", i) for i in range(4)]
+    with patch("workers.translator.BATCH_SIZE", 2), \
+         patch("workers.translator.run_claude_p", side_effect=_echo_batches(fail_marker="Segment 3.")):
+        result = translate_segments(segments, target_language="pt", parallelism=2)
+    assert [s["translated"] for s in result[:2]] == ["T:Segment 0.", "T:Segment 1."]
+    assert [s["translated"] for s in result[2:]] == ["Segment 2.", "Segment 3."]
+    assert all(s.get("needs_review") for s in result[2:])
+    assert not any(s.get("needs_review") for s in result[:2])
+
+
+def test_on_batch_runs_on_the_calling_thread_with_parallel_batches():
+    import threading
+
+    batch_threads, callback_threads = set(), set()
+
+    def fake_run(prompt, session_prefix, timeout, on_output=None, target_language=None):
+        batch_threads.add(threading.get_ident())
+        return _echo_batches()(prompt, session_prefix, timeout)
+
+    segments = [make_segment(f"Segment {i}.", i) for i in range(6)]
+    with patch("workers.translator.BATCH_SIZE", 2), \
+         patch("workers.translator.run_claude_p", side_effect=fake_run):
+        translate_segments(
+            segments, target_language="pt", parallelism=3,
+            on_batch=lambda batch: callback_threads.add(threading.get_ident()),
+        )
+    assert threading.get_ident() not in batch_threads
+    assert callback_threads == {threading.get_ident()}
+
+
+def test_parallelism_one_runs_batches_sequentially():
+    import threading
+
+    threads = set()
+
+    def fake_run(prompt, session_prefix, timeout, on_output=None, target_language=None):
+        threads.add(threading.get_ident())
+        return _echo_batches()(prompt, session_prefix, timeout)
+
+    segments = [make_segment(f"Segment {i}.", i) for i in range(4)]
+    with patch("workers.translator.BATCH_SIZE", 2), \
+         patch("workers.translator.run_claude_p", side_effect=fake_run):
+        translate_segments(segments, target_language="pt", parallelism=1)
+    assert threads == {threading.get_ident()}
+
+
+def test_translator_uses_planned_timeout():
+    from workers.batching import MIN_TIMEOUT
+
+    timeouts = []
+
+    def fake_run(prompt, session_prefix, timeout, on_output=None, target_language=None):
+        timeouts.append(timeout)
+        return json.dumps(["Olá."])
+
+    with patch("workers.translator.run_claude_p", side_effect=fake_run):
+        translate_segments([make_segment("Hello.")], target_language="pt")
+    assert timeouts == [MIN_TIMEOUT]
+
+
+def _bisecting_fake(poison):
+    """fake run_claude_p whose reply is malformed whenever the prompt contains `poison`."""
+    calls = []
+
+    def fake_run(prompt, session_prefix, timeout, on_output=None, target_language=None):
+        texts = json.loads(prompt[prompt.rindex("\n[") + 1:])
+        calls.append(texts)
+        if poison in texts:
+            good = [f"T:{t}" for t in texts[: texts.index(poison)]]
+            return json.dumps(good)[:-1] + (", " if good else "") + "{broken"
+        return json.dumps([f"T:{t}" for t in texts])
+
+    return fake_run, calls
+
+
+def test_bisection_isolates_the_bad_segment():
+    segments = [make_segment(f"S{i}.", i) for i in range(8)]
+    fake_run, calls = _bisecting_fake("S5.")
+    with patch("workers.translator.run_claude_p", side_effect=fake_run):
+        result = translate_segments(segments, target_language="fr")
+    assert [s.get("needs_review", False) for s in result] == [False] * 5 + [True] + [False] * 2
+    assert result[5]["translated"] == "S5."
+    assert result[6]["translated"] == "T:S6."
+
+
+def test_bisection_does_not_retry_timeouts():
+    segments = [make_segment(f"S{i}.", i) for i in range(4)]
+    with patch("workers.translator.run_claude_p", return_value=None) as mock_run:
+        translate_segments(segments, target_language="fr")
+    assert mock_run.call_count == 3  # MAX_RETRIES + 1, no bisection
+
+
+def test_recovery_metrics_count_saved_segments():
+    from workers import metrics
+
+    sink = metrics.InMemorySink()
+    metrics.set_sink(sink)
+    segments = [make_segment(f"S{i}.", i) for i in range(4)]
+    fake_run, _ = _bisecting_fake("S2.")
+    try:
+        with patch("workers.translator.run_claude_p", side_effect=fake_run):
+            translate_segments(segments, target_language="fr")
+    finally:
+        metrics.set_sink(None)
+    assert sink.counter("translator.segments_fallback", target_language="fr") == 1
+    assert sink.counter("translator.segments_recovered", target_language="fr") >= 1
+
+
+def test_fenced_reply_with_bracketed_preamble_is_salvaged():
+    segments = [make_segment("A.", 0), make_segment("B.", 1)]
+    reply = 'Note [1]: translations below.\n```json\n["Uno.", "Dos."]\n```'
+    with patch("workers.translator.run_claude_p", return_value=reply) as mock_run:
+        result = translate_segments(segments, target_language="es")
+    assert [s["translated"] for s in result] == ["Uno.", "Dos."]
+    mock_run.assert_called_once()
+
+
+def test_object_elements_are_unwrapped():
+    segments = [make_segment("A.", 0), make_segment("B.", 1)]
+    reply = json.dumps([{"translation": "Uno."}, {"text": "Dos."}])
+    with patch("workers.translator.run_claude_p", return_value=reply):
+        result = translate_segments(segments, target_language="es")
+    assert [s["translated"] for s in result] == ["Uno.", "Dos."]
+
+
+def test_repeated_segments_are_translated_once():
+    segments = [make_segment("Byline.", 0), make_segment("Story.", 1), make_segment("  Byline. ", 2)]
+    seen = []
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["Firma.", "Historia."])) as mock_run:
+        result = translate_segments(segments, target_language="es", on_segment=lambda s: seen.append(s["index"]))
+    mock_run.assert_called_once()
+    assert mock_run.call_args[0][0].count("Byline.") == 1
+    assert [s["translated"] for s in result] == ["Firma.", "Historia.", "Firma."]
+    assert sorted(seen) == [0, 1, 2]
+
+
+def test_repeated_segments_share_the_fallback():
+    segments = [make_segment("Byline.", 0), make_segment("Byline.", 1)]
+    with patch("workers.translator.run_claude_p", return_value=None):
+        result = translate_segments(segments, target_language="es")
+    assert all(s["needs_review"] for s in result)
+    assert [s["translated"] for s in result] == ["Byline.", "Byline."]
+
+
+class _InlineBatcher:
+    """Micro-batcher stand-in that runs the shared call for one job."""
+
+    def __init__(self, max_segments):
+        self.max_segments = max_segments
+        self.groups = []
+
+    def eligible(self, segments):
+        return 0 < len(segments) <= self.max_segments
+
+    def translate(self, segments, group, translate, references=None):
+        self.groups.append(group)
+        combined = [{"index": i, "text": s["text"], "translated": None} for i, s in enumerate(segments)]
+        translate(combined, json.loads(json.dumps(references)))
+        for seg, done in zip(segments, combined):
+            seg["translated"] = done["translated"]
+
+
+def test_small_jobs_go_through_the_micro_batcher():
+    batcher = _InlineBatcher(max_segments=2)
+    seen = []
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["Hola."])):
+        result = translate_segments(
+            [make_segment("Hello.")], target_language="es", batcher=batcher, on_segment=seen.append
+        )
+    assert result[0]["translated"] == "Hola."
+    assert len(batcher.groups) == 1
+    assert seen == result
+
+
+def test_micro_batched_jobs_keep_their_references():
+    memory = MagicMock()
+    memory.lookup.return_value = {}
+    memory.near_matches.return_value = {0: [FuzzyMatch("The mayor spoke today.", "La alcaldesa habló hoy.", 0.9)]}
+    memory.claim.side_effect = lambda texts, *args: [True] * len(texts)
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["El alcalde habló."])) as mock_run:
+        translate_segments(
+            [make_segment("The mayor spoke.")], target_language="es", batcher=_InlineBatcher(max_segments=2),
+            memory=memory,
+        )
+    assert "La alcaldesa habló hoy." in mock_run.call_args[0][0]
+
+
+def test_large_jobs_skip_the_micro_batcher():
+    batcher = _InlineBatcher(max_segments=1)
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["Uno.", "Dos."])):
+        translate_segments([make_segment("One.", 0), make_segment("Two.", 1)], target_language="es", batcher=batcher)
+    assert batcher.groups == []
+
+
+def test_on_batch_reports_finished_batches_with_duplicates():
+    segments = [make_segment("A.", 0), make_segment("B.", 1), make_segment("A.", 2)]
+    finished = []
+    with patch("workers.translator.run_claude_p", return_value=json.dumps(["Uno.", "Dos."])):
+        translate_segments(segments, target_language="es", on_batch=lambda b: finished.append(b))
+    assert len(finished) == 1
+    assert sorted(s["index"] for s in finished[0]) == [0, 1, 2]
+    assert finished[0][-1]["translated"] == "Uno."
@@ -0,0 +1,139 @@
+"""
+Size-aware batch planning for the translator.
+
+A fixed segment count ignores length: fifty table cells and fifty 400-word
+paragraphs are very different claude calls. BatchPlanner.plan() packs segments in
+order until a character budget is reached (the prompt's fixed overhead — e.g.
+the Spanish style rules — counts against it), and gives each batch a timeout
+proportional to its whole prompt, never below the translator's fixed
+SUBPROCESS_TIMEOUT.
+
+The budget and the seconds-per-character rate are learned per target language
+from observed calls (observe()):
+  - a call that hits its timeout shrinks that language's budget by BACKOFF
+    and raises its rate by 1 / BACKOFF (at least to what the call implied),
+    so the next timeouts grow even when the cost is mostly fixed start-up
+  - a full batch that finishes within FAST_FRACTION of its timeout grows it
+    by GROWTH (batches cut short by the end of the article say nothing about
+    the budget)
+  - the rate is an exponential moving average of duration / characters
+Learned state is per worker process; it starts from the defaults on restart.
+"""
+import os
+import threading
+from dataclasses import dataclass
+
+CHAR_BUDGET = int(os.getenv("HAWK_TRANSLATE_CHAR_BUDGET", "16000"))  # starting prompt size, chars
+MIN_CHAR_BUDGET = 2_000
+MAX_CHAR_BUDGET = 60_000
+MIN_TIMEOUT = 60  # seconds; the translator's SUBPROCESS_TIMEOUT, which small prompts were always given
+MAX_TIMEOUT = 180
+BASE_SECONDS = 10.0  # CLI start-up and first token
+SECONDS_PER_CHAR = 0.004  # starting rate for output generation, ~4 s per 1k source chars
+TIMEOUT_HEADROOM = 2.0  # timeout = expected duration x headroom
+BACKOFF = 0.7
+GROWTH = 1.1
+FAST_FRACTION = 0.5
+RATE_SMOOTHING = 0.2  # weight of the newest observation in the rate average
+
+
+@dataclass
+class Batch:
+    segments: list[dict]
+    timeout: int
+    chars: int  # source characters in the batch, excluding prompt overhead
+    full: bool = False  # closed because the budget was reached
+
+
+@dataclass
+class _LanguageState:
+    budget: float = CHAR_BUDGET
+    seconds_per_char: float = SECONDS_PER_CHAR
+
+
+class BatchPlanner:
+    """Packs segments into batches and adapts its budgets per target language. Thread-safe."""
+
+    def __init__(self):
+        self._states: dict[str, _LanguageState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, target_language: str) -> _LanguageState:
+        state = self._states.get(target_language)
+        if state is None:
+            state = self._states[target_language] = _LanguageState()
+        return state
+
+    def budget(self, target_language: str) -> int:
+        with self._lock:
+            return int(self._state(target_language).budget)
+
+    def timeout_for(self, target_language: str, chars: int, overhead_chars: int = 0) -> int:
+        """Timeout for a prompt of chars segment characters plus overhead_chars of fixed prompt text."""
+        with self._lock:
+            rate = self._state(target_language).seconds_per_char
+        expected = BASE_SECONDS + rate * (chars + overhead_chars)
+        return int(min(max(expected * TIMEOUT_HEADROOM, MIN_TIMEOUT), MAX_TIMEOUT))
+
+    def plan(
+        self,
+        segments: list[dict],
+        target_language: str,
+        overhead_chars: int = 0,
+        max_segments: int = 50,
+    ) -> list[Batch]:
+        """
+        Split segments, in order, into batches of at most budget - overhead_chars
+        characters and max_segments segments. A segment longer than the whole
+        budget gets a batch of its own.
+        """
+        capacity = max(self.budget(target_language) - overhead_chars, MIN_CHAR_BUDGET // 2)
+        batches: list[Batch] = []
+        current: list[dict] = []
+        chars = 0
+        for seg in segments:
+            size = len(seg["text"])
+            over_budget = chars + size > capacity
+            if current and (over_budget or len(current) >= max_segments):
+                timeout = self.timeout_for(target_language, chars, overhead_chars)
+                batches.append(Batch(current, timeout, chars, full=over_budget))
+                current, chars = [], 0
+            current.append(seg)
+            chars += size
+        if current:
+            batches.append(Batch(current, self.timeout_for(target_language, chars, overhead_chars), chars))
+        return batches
+
+    def observe(
+        self,
+        target_language: str,
+        chars: int,
+        duration: float,
+        timeout: int,
+        timed_out: bool,
+        full: bool = True,
+        overhead_chars: int = 0,
+    ) -> None:
+        """Feed back one claude call: its size (segments + prompt overhead), duration, and whether it timed out."""
+        prompt_chars = chars + overhead_chars
+        with self._lock:
+            state = self._state(target_language)
+            if timed_out:
+                state.budget = max(state.budget * BACKOFF, MIN_CHAR_BUDGET)
+                # The call needed at least `timeout`; whatever the split between start-up and
+                # per-character cost, a higher rate is what lengthens the next timeouts
+                implied = max(timeout - BASE_SECONDS, 0.0) / prompt_chars if prompt_chars else 0.0
+                state.seconds_per_char = max(state.seconds_per_char / BACKOFF, implied)
+                return
+            if prompt_chars > 0:
+                rate = max(duration - BASE_SECONDS, 0.0) / prompt_chars
+                state.seconds_per_char += RATE_SMOOTHING * (rate - state.seconds_per_char)
+            if full and duration < timeout * FAST_FRACTION:
+                state.budget = min(state.budget * GROWTH, MAX_CHAR_BUDGET)
+
+
+_planner = BatchPlanner()
+
+
+def get_planner() -> BatchPlanner:
+    return _planner
@@ -0,0 +1,81 @@
+"""
+Size-bounded JSON cache in Redis, shared by every worker.
+
+  - {namespace}:v:{key}  STRING  JSON value, expires after ttl_seconds
+  - {namespace}:lru      ZSET    key -> last access (ms)
+
+Reads bump the access time; writes evict the least recently used keys once
+the namespace holds more than max_entries. Redis errors are logged and
+treated as misses, so a cache outage only costs extra claude calls.
+"""
+import json
+import logging
+import time
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedRedisCache:
+    """Redis key/value cache with a TTL per entry and an LRU cap on entry count."""
+
+    def __init__(self, redis_client: Redis, namespace: str, max_entries: int, ttl_seconds: int):
+        if max_entries < 1:
+            raise ValueError("BoundedRedisCache max_entries must be at least 1")
+        self.redis = redis_client
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lru = f"{namespace}:lru"
+
+    def _value_key(self, key: str) -> str:
+        return f"{self.namespace}:v:{key}"
+
+    def get_many(self, keys: list[str]) -> dict:
+        """Return {key: value} for the keys present. Missing keys are simply absent."""
+        if not keys:
+            return {}
+        try:
+            raw = self.redis.mget([self._value_key(k) for k in keys])
+            found = {k: json.loads(v) for k, v in zip(keys, raw) if v is not None}
+            if found:
+                now_ms = int(time.time() * 1000)
+                self.redis.zadd(self._lru, {k: now_ms for k in found})
+            return found
+        except (RedisError, ValueError) as e:
+            logger.warning("Cache %s read failed: %s", self.namespace, e)
+            return {}
+
+    def set_many(self, items: dict) -> None:
+        if not items:
+            return
+        now_ms = int(time.time() * 1000)
+        try:
+            pipe = self.redis.pipeline()
+            for key, value in items.items():
+                pipe.set(self._value_key(key), json.dumps(value, ensure_ascii=False), ex=self.ttl_seconds)
+            pipe.zadd(self._lru, {k: now_ms for k in items})
+            # Index entries whose values have expired on their own
+            pipe.zremrangebyscore(self._lru, "-inf", now_ms - self.ttl_seconds * 1000)
+            pipe.zcard(self._lru)
+            size = pipe.execute()[-1]
+            if size > self.max_entries:
+                self._evict(size - self.max_entries)
+        except RedisError as e:
+            logger.warning("Cache %s write failed: %s", self.namespace, e)
+
+    def _evict(self, count: int) -> None:
+        evicted = [k.decode() if isinstance(k, bytes) else k for k, _ in self.redis.zpopmin(self._lru, count)]
+        if evicted:
+            self.redis.delete(*(self._value_key(k) for k in evicted))
+
+    def get(self, key: str):
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, value) -> None:
+        self.set_many({key: value})
+
+    def size(self) -> int:
+        return self.redis.zcard(self._lru)
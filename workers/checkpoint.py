@@ -0,0 +1,138 @@
+"""
+Resumable pipeline state, so a Celery retry picks up where the last attempt stopped.
+
+run_translation_pipeline keeps one compact blob per job in
+translation_jobs.checkpoint_json:
+
+  {
+    "stage": "translating" | "scoring" | "done",
+    "glossary_version": "...",
+    "segments": [...],      # prepared segments, with translations filled in as batches finish
+    "translated": [0, 3],   # segment indexes whose batch has finished
+    "scores": [...],        # quality score dicts, in scoring order
+    "scored": [0, 1],       # segment indexes already scored (a None score counts)
+  }
+
+A retry skips segmentation and the glossary pass, translates only the
+segments not in "translated", and scores only those not in "scored". Once
+the job is done the segments are dropped and only the counts are kept, for
+progress reporting.
+
+The translator works on copies of the pending segments (pending_translation),
+filling them in from its batch threads; record_translated() applies each
+finished batch to the checkpoint on the calling thread, touching only that
+batch's entries. Nothing is deep-copied per save.
+"""
+import copy
+
+from sqlalchemy.orm import Session
+
+from db.models import TranslationJob
+
+
+class JobCheckpoint:
+    """Checkpoint for one job; every record_* call commits it."""
+
+    def __init__(self, job: TranslationJob, db: Session):
+        self.job = job
+        self.db = db
+        saved = job.checkpoint_json if isinstance(job.checkpoint_json, dict) else {}
+        # Work on a copy: the attribute only counts as changed if a new value is assigned
+        self.state = copy.deepcopy(saved)
+        self._by_index: dict[int, dict] | None = None
+        self._translated: set[int] | None = None
+
+    @property
+    def started(self) -> bool:
+        return "segments" in self.state
+
+    @property
+    def stage(self) -> str | None:
+        return self.state.get("stage")
+
+    @property
+    def segments(self) -> list[dict]:
+        return self.state["segments"]
+
+    @property
+    def glossary_version(self) -> str:
+        return self.state["glossary_version"]
+
+    def start(self, segments: list[dict], glossary_version: str) -> None:
+        self.state = {
+            "stage": "translating",
+            "glossary_version": glossary_version,
+            "segments": segments,
+            "translated": [],
+            "scores": [],
+            "scored": [],
+        }
+        self._by_index = self._translated = None
+        self.save()
+
+    def pending_translation(self) -> list[dict]:
+        """Copies of the untranslated segments, for the translator to fill in."""
+        done = set(self.state["translated"])
+        return [dict(s) for s in self.segments if s["index"] not in done]
+
+    def record_translated(self, segments: list[dict]) -> None:
+        """Persist finished segments (a completed batch, or the final result)."""
+        if self._by_index is None:
+            self._by_index = {s["index"]: s for s in self.segments}
+            self._translated = set(self.state["translated"])
+        for seg in segments:
+            stored = self._by_index[seg["index"]]
+            stored["translated"] = seg.get("translated")
+            if seg.get("needs_review"):
+                stored["needs_review"] = True
+            if seg["index"] not in self._translated:
+                self._translated.add(seg["index"])
+                self.state["translated"].append(seg["index"])
+        self.save()
+
+    def finish_translation(self) -> None:
+        self.state["stage"] = "scoring"
+        self.save()
+
+    def pending_scoring(self) -> list[dict]:
+        done = set(self.state["scored"])
+        return [s for s in self.segments if s["index"] not in done]
+
+    def record_scores(self, indexes: list[int], scores: list[dict]) -> None:
+        self.state["scored"] = sorted(set(self.state["scored"]) | set(indexes))
+        self.state["scores"].extend(scores)
+        self.save()
+
+    @property
+    def scores(self) -> list[dict]:
+        return sorted(self.state["scores"], key=lambda s: s["index"])
+
+    def finish(self) -> None:
+        """Drop the segments; keep the counts for progress reporting."""
+        total = len(self.segments)
+        self.state = {"stage": "done", "total": total, "translated": total, "scored": len(self.state["scored"])}
+        self._by_index = self._translated = None
+        self.save()
+
+    def save(self) -> None:
+        # New lists, so the assigned value differs from the last one the ORM saw
+        # (every record_* call extends one); the segment dicts themselves are shared
+        self.job.checkpoint_json = {k: list(v) if isinstance(v, list) else v for k, v in self.state.items()}
+        self.db.commit()
+
+
+def job_progress(job: TranslationJob) -> dict | None:
+    """{"segments_total", "segments_translated", "segments_scored", "summary"} or None before segmentation."""
+    state = job.checkpoint_json if isinstance(job.checkpoint_json, dict) else {}
+    if state.get("stage") == "done":
+        total, translated, scored = state["total"], state["translated"], state["scored"]
+    elif "segments" in state:
+        total, translated, scored = len(state["segments"]), len(state["translated"]), len(state["scored"])
+    else:
+        return None
+    return {
+        "segments_total": total,
+        "segments_translated": translated,
+        "segments_scored": scored,
+        "summary": f"{translated} of {total} segments translated",
+    }
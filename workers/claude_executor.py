@@ -0,0 +1,56 @@
+"""
+Long-lived executor process for ClaudeProcessPool (workers/claude_runner.py).
+
+Speaks a line-oriented JSON protocol over stdin/stdout:
+  request:  {"prompt": "...", "timeout": 60, "stream": false}
+  chunks:   {"chunk": "..."}  (only when "stream" is true, as stdout arrives)
+  response: {"output": "...", "exit_code": 0, "timed_out": false,
+             "spawn_latency": 0.004, "time_to_first_byte": 2.1}
+
+Each request goes through claude_runner.run_cli(), so claude -p runs directly
+(no tmux session, no script file) under `timeout --foreground`.
+exit_code is null when the hard deadline fired and the process group was killed.
+The timings are seconds measured here, next to the claude process, so the
+pool's metrics don't include pipe overhead; time_to_first_byte is null when
+claude printed nothing.
+Run with `python -m workers.claude_executor`; the pool owns its lifecycle.
+"""
+import json
+import logging
+import sys
+
+from workers.claude_runner import run_cli
+
+logger = logging.getLogger(__name__)
+
+
+def _send_chunk(text: str) -> None:
+    sys.stdout.write(json.dumps({"chunk": text}) + "\n")
+    sys.stdout.flush()
+
+
+def main() -> None:
+    logging.basicConfig(stream=sys.stderr, level=logging.INFO)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            on_output = _send_chunk if request.get("stream") else None
+            result = run_cli(request["prompt"], int(request["timeout"]), on_output)
+            response = {
+                "output": result.output,
+                "exit_code": result.exit_code,
+                "timed_out": result.timed_out,
+                "spawn_latency": result.spawn_latency,
+                "time_to_first_byte": result.time_to_first_byte,
+            }
+        except Exception as e:  # report and keep serving — the pool decides whether to recycle
+            logger.warning("Executor request failed: %s", e)
+            response = {"output": "", "exit_code": -1, "error": str(e)}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
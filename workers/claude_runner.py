@@ -1,91 +1,691 @@
 """
-Shared helper for running claude -p via tmux sessions.
+Shared helper for running claude -p.
 
-Follows the same pattern as houseofjawn-bot's scheduler:
-  - base64-encodes the prompt so it passes through bash safely
-  - writes a shell script, runs it in a named tmux session
-  - polls an output file for a completion marker
-  - cleans up session and temp files on exit
+run_cli() is the executor: it starts `timeout --foreground ... claude -p` in
+its own process group with stdout on a pipe, and waits on that pipe with a
+selector. Completion is the pipe reaching EOF plus the process exiting — no
+polling loop, no tmux session, no script or output files under /tmp.
 
-Session names use hawk-{prefix}-{uid8} to avoid colliding with scheduler
-sessions (claude-wake-*, scheduled-wake-*, etc.).
+`timeout --foreground` is kept (rather than Python's subprocess timeout) to
+avoid the process-group kill issue with Node.js; our own hard deadline only
+fires if `timeout` itself fails to reap claude, and then kills the whole
+process group.
+
+By default calls go through ClaudeProcessPool: a set of warm executor
+processes (workers/claude_executor.py) that each take prompts over a pipe and
+call run_cli(). Executors are recycled after POOL_MAX_CALLS calls or as soon
+as one dies, stops answering, or breaks protocol. HAWK_CLAUDE_POOL_SIZE=0
+calls run_cli() in-process instead.
+
+With HAWK_CLAUDE_CLUSTER_LIMIT set, a call also holds a fleet-wide slot
+(workers/governor.py) while claude runs. The pool takes it only after checking
+out an executor, so threads queued for a local executor never sit on slots
+other workers could use.
+
+All of the above is the "cli" backend. HAWK_CLAUDE_BACKEND=fake (or
+set_backend()) swaps in the offline stand-in from workers/fake_claude.py.
+
+Every run_claude_p / run_claude_p_async call produces one ClaudeCallRecord
+(workers/metrics.py): the layers below fill in spawn latency, time to first
+byte and exit code through a context variable, and run_claude_p adds duration,
+sizes and the failure reason before handing it to the metrics sink. Callers
+that need to know why a call failed (a timeout that still returned partial
+output, say) collect the records with capture_calls().
 """
-import base64
+import asyncio
+import atexit
+import codecs
+import contextvars
+import json
 import logging
 import os
+import select
+import selectors
+import signal
 import subprocess
+import sys
+import threading
 import time
-import uuid
+import weakref
+from collections.abc import Callable
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from workers import metrics
+from workers.governor import get_governor
 
 logger = logging.getLogger(__name__)
 
-COMPLETION_MARKER = "---HAWK_CLAUDE_DONE---"
+CLAUDE_BIN = os.getenv("HAWK_CLAUDE_BIN", "claude")
+KILL_AFTER = 10  # seconds between SIGTERM and SIGKILL from `timeout`
+HARD_DEADLINE_GRACE = 5  # seconds past timeout + KILL_AFTER before we kill the group ourselves
+TIMEOUT_FAILURES = ("timeout", "killed")  # ClaudeCallRecord.failure of a call stopped at its timeout
+
+ASYNC_CONCURRENCY = int(os.getenv("HAWK_CLAUDE_ASYNC_CONCURRENCY", "16"))  # in-flight async calls per event loop
+POOL_SIZE = int(os.getenv("HAWK_CLAUDE_POOL_SIZE", "2"))  # executors per worker process
+POOL_MAX_CALLS = int(os.getenv("HAWK_CLAUDE_POOL_MAX_CALLS", "50"))  # recycle after this many calls
+# Seconds beyond the claude timeout before an executor is declared hung — past run_cli's own deadline
+RESPONSE_GRACE = KILL_AFTER + HARD_DEADLINE_GRACE + 5
+
+
+@dataclass
+class CLIResult:
+    output: str
+    exit_code: int | None  # None when the hard deadline fired and we killed the group
+    timed_out: bool = False
+    spawn_latency: float | None = None  # seconds from Popen to a running process
+    time_to_first_byte: float | None = None  # seconds from Popen to the first output byte
 
+    @property
+    def text(self) -> str | None:
+        """Output in run_claude_p's contract: stripped, or None when empty."""
+        return self.output.strip() or None
 
-def run_claude_p(prompt: str, session_prefix: str, timeout: int = 60) -> str | None:
+
+def claude_env() -> dict[str, str]:
+    """Environment for claude -p: user-local bin on PATH, nested-session guard removed."""
+    env = dict(os.environ)
+    local_bin = os.path.expanduser("~/.local/bin")
+    env["PATH"] = f"{local_bin}:{env.get('PATH', '/usr/local/bin:/usr/bin:/bin')}"
+    # claude refuses to start inside another claude session; the tmux runner
+    # sidestepped this by starting from a clean shell, so drop the marker here.
+    env.pop("CLAUDECODE", None)
+    return env
+
+
+def _cli_command(prompt: str, timeout: int) -> list[str]:
+    return [
+        "timeout", "--foreground", f"--kill-after={KILL_AFTER}", str(timeout),
+        CLAUDE_BIN, "-p", prompt,
+    ]
+
+
+def run_cli(
+    prompt: str,
+    timeout: int = 60,
+    on_output: Callable[[str], None] | None = None,
+) -> CLIResult:
     """
-    Run `claude -p <prompt>` in a detached tmux session and return stdout.
+    Run claude -p once and wait for it event-driven.
 
-    Returns the output string on success, or None on timeout or failure.
-    Uses `timeout --foreground` inside the shell script (not Python's subprocess
-    timeout parameter) to avoid the process-group kill issue with Node.js.
+    stdout and stderr share one pipe (like the old `> out 2>&1`). The selector
+    wakes only when the pipe has data or closes; `timeout` exits 124 when it
+    had to stop claude. If given, on_output receives each decoded chunk as it
+    arrives.
     """
-    uid = uuid.uuid4().hex[:8]
-    session_name = f"hawk-{session_prefix}-{uid}"
-    output_file = f"/tmp/{session_name}.out"
-    script_file = f"/tmp/{session_name}.sh"
+    started = time.monotonic()
+    try:
+        proc = subprocess.Popen(
+            _cli_command(prompt, timeout),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=claude_env(),
+            start_new_session=True,
+        )
+    except OSError as e:
+        logger.warning("Failed to start claude -p: %s", e)
+        return CLIResult(output="", exit_code=None)
+    spawn_latency = time.monotonic() - started
 
-    prompt_b64 = base64.b64encode(prompt.encode()).decode()
+    deadline = time.monotonic() + timeout + KILL_AFTER + HARD_DEADLINE_GRACE
+    first_byte: float | None = None
+    chunks: list[bytes] = []
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    fd = proc.stdout.fileno()
+    killed = False
+    with selectors.DefaultSelector() as sel:
+        sel.register(fd, selectors.EVENT_READ)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not sel.select(remaining):
+                logger.warning("claude -p pid %d outlived its timeout — killing process group", proc.pid)
+                _kill_group(proc.pid)
+                killed = True
+                break
+            chunk = os.read(fd, 65536)
+            if not chunk:  # EOF: claude and `timeout` have closed the pipe
+                break
+            if first_byte is None:
+                first_byte = time.monotonic() - started
+            chunks.append(chunk)
+            if on_output is not None:
+                text = decoder.decode(chunk)
+                if text:
+                    on_output(text)
+    proc.stdout.close()
 
-    script_content = f"""#!/bin/bash
-export PATH="/home/jamditis/.local/bin:/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/snap/bin"
+    try:
+        exit_code = proc.wait(timeout=max(deadline - time.monotonic(), 1))
+    except subprocess.TimeoutExpired:
+        _kill_group(proc.pid)
+        proc.wait()
+        killed = True
 
-PROMPT=$(echo "{prompt_b64}" | base64 -d)
-timeout --foreground --kill-after=10 {timeout} claude -p "$PROMPT" > "{output_file}" 2>&1
-EXIT_CODE=${{PIPESTATUS[0]}}
+    output = b"".join(chunks).decode(errors="replace")
+    timings = {"spawn_latency": spawn_latency, "time_to_first_byte": first_byte}
+    if killed:
+        return CLIResult(output=output, exit_code=None, timed_out=True, **timings)
+    return CLIResult(output=output, exit_code=exit_code, timed_out=exit_code == 124, **timings)
 
-echo "" >> "{output_file}"
-echo "{COMPLETION_MARKER}:$EXIT_CODE" >> "{output_file}"
-"""
 
+def _kill_group(pid: int) -> None:
     try:
-        with open(script_file, "w") as f:
-            f.write(script_content)
-        os.chmod(script_file, 0o755)
-
-        result = subprocess.run(
-            ["tmux", "new-session", "-d", "-s", session_name, script_file],
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            logger.warning(
-                "Failed to create tmux session %s: %s", session_name, result.stderr.strip()
-            )
-            return None
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+# The ClaudeCallRecord of the run_claude_p call in progress, if any. Backends
+# report what only they can see (spawn latency, first byte, exit code) through
+# note_call() / note_result(); outside run_claude_p both are no-ops.
+_current_call: contextvars.ContextVar["metrics.ClaudeCallRecord | None"] = contextvars.ContextVar(
+    "claude_current_call", default=None
+)
 
-        # Poll for completion marker — the script appends it when claude exits
-        deadline = time.time() + timeout + 15  # buffer beyond the script's own timeout
-        while time.time() < deadline:
-            if os.path.exists(output_file):
-                try:
-                    content = open(output_file).read()
-                    if COMPLETION_MARKER in content:
-                        output = content[: content.index(COMPLETION_MARKER)].strip()
-                        return output or None
-                except OSError:
-                    pass
-            time.sleep(0.5)
-
-        logger.warning("claude -p timed out in tmux session %s", session_name)
-        return None
 
+# Lists collecting the records of finished calls, for capture_calls()
+_captures: contextvars.ContextVar[tuple[list, ...]] = contextvars.ContextVar("claude_captures", default=())
+
+
+@contextmanager
+def capture_calls():
+    """Collect the ClaudeCallRecord of every call this thread (or task) finishes inside the block."""
+    records: list[metrics.ClaudeCallRecord] = []
+    token = _captures.set(_captures.get() + (records,))
+    try:
+        yield records
     finally:
-        subprocess.run(
-            ["tmux", "kill-session", "-t", session_name], capture_output=True
+        _captures.reset(token)
+
+
+def note_call(**fields) -> None:
+    """Set fields on the current call's metrics record."""
+    record = _current_call.get()
+    if record is None:
+        return
+    for name, value in fields.items():
+        setattr(record, name, value)
+
+
+@contextmanager
+def fleet_slot(timeout: int):
+    """
+    Hold a fleet-wide slot around one claude call, if the governor is enabled.
+    Yields False (and marks the call "no_slot") when none freed up in time.
+    """
+    governor = get_governor()
+    if governor is None:
+        yield True
+        return
+    with governor.slot(timeout) as admitted:
+        if not admitted:
+            note_call(failure="no_slot")
+        yield admitted
+
+
+def note_result(result: CLIResult) -> None:
+    """Copy a CLIResult's timings, size, exit code and failure reason to the current record."""
+    if result.exit_code is None:
+        failure = "killed" if result.timed_out else "spawn_failed"
+    elif result.timed_out:
+        failure = "timeout"
+    elif result.exit_code != 0:
+        failure = f"exit_{result.exit_code}"
+    else:
+        failure = None
+    note_call(
+        spawn_latency=result.spawn_latency,
+        time_to_first_byte=result.time_to_first_byte,
+        output_bytes=len(result.output.encode()),
+        exit_code=result.exit_code,
+        failure=failure,
+    )
+
+
+class _Executor:
+    """One warm `python -m workers.claude_executor` process."""
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "workers.claude_executor"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            start_new_session=True,  # detached from the worker's process group
         )
-        for f in [script_file, output_file]:
+        self.calls = 0
+        self._buffer = b""
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def request(
+        self,
+        prompt: str,
+        timeout: int,
+        on_output: Callable[[str], None] | None = None,
+    ) -> dict | None:
+        """Send one prompt and wait for the response. None means the executor is unusable."""
+        self.calls += 1
+        request = {"prompt": prompt, "timeout": timeout, "stream": on_output is not None}
+        try:
+            self.proc.stdin.write(json.dumps(request).encode() + b"\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            return None
+        deadline = time.monotonic() + timeout + RESPONSE_GRACE
+        while True:
+            line = self._read_line(deadline)
+            if line is None:
+                return None
             try:
-                os.unlink(f)
-            except FileNotFoundError:
-                pass
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                return None
+            if "chunk" not in message:
+                return message
+            if on_output is not None:
+                on_output(message["chunk"])
+
+    def _read_line(self, deadline: float) -> bytes | None:
+        fd = self.proc.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                return None
+            chunk = os.read(fd, 65536)
+            if not chunk:  # EOF — executor exited
+                return None
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line
+
+    def close(self) -> None:
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        self.proc.stdout.close()
+
+
+class ClaudeProcessPool:
+    """
+    Keeps up to `size` executor processes warm and hands each prompt to an idle one.
+
+    Thread-safe. Executors are started lazily, recycled after `max_calls`
+    requests, and replaced whenever they die, hang past the claude timeout, or
+    return something that isn't a protocol response.
+    """
+
+    def __init__(self, size: int = POOL_SIZE, max_calls: int = POOL_MAX_CALLS):
+        if size < 1:
+            raise ValueError("ClaudeProcessPool size must be at least 1")
+        self.size = size
+        self.max_calls = max_calls
+        self._idle: list[_Executor] = []  # most recently used last
+        # Notified whenever an executor goes idle or a slot frees up (one was retired)
+        self._available = threading.Condition()
+        self._started = 0
+        self._closed = False
+
+    def _acquire(self) -> _Executor:
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("ClaudeProcessPool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._started < self.size:
+                    self._started += 1
+                    break
+                self._available.wait()
+        try:
+            return _Executor()
+        except Exception:
+            self._free_slot()
+            raise
+
+    def _free_slot(self) -> None:
+        with self._available:
+            self._started -= 1
+            self._available.notify()
+
+    def _release(self, executor: _Executor, healthy: bool) -> None:
+        with self._available:
+            if healthy and executor.alive and executor.calls < self.max_calls and not self._closed:
+                self._idle.append(executor)
+                self._available.notify()
+                return
+        executor.close()
+        self._free_slot()
+
+    def run(
+        self,
+        prompt: str,
+        session_prefix: str,
+        timeout: int = 60,
+        on_output: Callable[[str], None] | None = None,
+    ) -> str | None:
+        """Run one prompt on a warm executor, inside a fleet slot. Same contract as run_claude_p."""
+        executor = self._acquire()
+        healthy = False
+        try:
+            with fleet_slot(timeout) as admitted:
+                if not admitted:
+                    healthy = True
+                    return None
+                response = executor.request(prompt, timeout, on_output)
+            if response is None:
+                logger.warning(
+                    "claude executor pid %d unresponsive (%s) — recycling",
+                    executor.proc.pid, session_prefix,
+                )
+                executor.proc.kill()
+                note_call(failure="executor_unresponsive")
+                return None
+            healthy = "error" not in response
+            if not healthy:
+                logger.warning("claude executor error (%s): %s", session_prefix, response["error"])
+                note_call(failure="executor_error")
+            else:
+                note_result(CLIResult(
+                    output=response.get("output", ""),
+                    exit_code=response.get("exit_code"),
+                    timed_out=response.get("timed_out", False),
+                    spawn_latency=response.get("spawn_latency"),
+                    time_to_first_byte=response.get("time_to_first_byte"),
+                ))
+            if response.get("exit_code") is None:
+                return None
+            output = response.get("output", "").strip()
+            return output or None
+        finally:
+            self._release(executor, healthy)
+
+    def close(self) -> None:
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for executor in idle:
+            executor.close()
+
+
+_pool: ClaudeProcessPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ClaudeProcessPool:
+    """Return this process's pool, creating it on first use (and again after a fork)."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            # Celery prefork children inherit the parent's module state; the
+            # parent's executors belong to the parent, so start a fresh pool.
+            _pool = ClaudeProcessPool()
+            _pool_pid = os.getpid()
+        return _pool
+
+
+@atexit.register
+def _shutdown_pool() -> None:
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.close()
+
+
+# --- asyncio API ---
+# One worker process can keep many claude -p calls in flight by awaiting them
+# instead of blocking. Each event loop gets its own semaphore (asyncio
+# primitives can't be shared across loops), sized by ASYNC_CONCURRENCY.
+
+_async_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_limiter() -> asyncio.Semaphore:
+    """Return the running loop's shared limiter for claude -p calls."""
+    loop = asyncio.get_running_loop()
+    limiter = _async_limiters.get(loop)
+    if limiter is None:
+        limiter = _async_limiters[loop] = asyncio.Semaphore(ASYNC_CONCURRENCY)
+    return limiter
+
+
+async def run_cli_async(prompt: str, timeout: int = 60) -> CLIResult:
+    """Async counterpart of run_cli(): same command, process group and deadline."""
+    started = time.monotonic()
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *_cli_command(prompt, timeout),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            env=claude_env(),
+            start_new_session=True,
+        )
+    except OSError as e:
+        logger.warning("Failed to start claude -p: %s", e)
+        return CLIResult(output="", exit_code=None)
+    spawn_latency = time.monotonic() - started
+
+    try:
+        stdout, _ = await asyncio.wait_for(
+            proc.communicate(), timeout=timeout + KILL_AFTER + HARD_DEADLINE_GRACE
+        )
+    except asyncio.TimeoutError:
+        logger.warning("claude -p pid %d outlived its timeout — killing process group", proc.pid)
+        _kill_group(proc.pid)
+        await proc.wait()
+        return CLIResult(output="", exit_code=None, timed_out=True, spawn_latency=spawn_latency)
+
+    exit_code = proc.returncode
+    return CLIResult(
+        output=stdout.decode(errors="replace"), exit_code=exit_code, timed_out=exit_code == 124,
+        spawn_latency=spawn_latency,
+    )
+
+
+# --- Backends ---
+# run_claude_p and run_claude_p_async delegate to the active backend. The CLI
+# backend is production; workers/fake_claude.py provides an offline stand-in
+# that speaks the same prompt -> stdout contract for tests and load runs.
+
+class ClaudeBackend:
+    """Turns a prompt into claude's stdout. Implementations return None on timeout or failure."""
+
+    name = "base"
+    # run() takes its own fleet_slot() once it has local capacity; otherwise run_claude_p takes it first
+    holds_fleet_slot = False
+
+    def run(
+        self,
+        prompt: str,
+        session_prefix: str,
+        timeout: int,
+        on_output: Callable[[str], None] | None = None,
+    ) -> str | None:
+        """Run one prompt. on_output, if given, receives stdout chunks as they arrive."""
+        raise NotImplementedError
+
+    async def run_async(self, prompt: str, session_prefix: str, timeout: int) -> str | None:
+        return await asyncio.to_thread(self.run, prompt, session_prefix, timeout)
+
+
+class CLIBackend(ClaudeBackend):
+    """The real claude CLI: warm executor pool, or run_cli() in-process when POOL_SIZE is 0."""
+
+    name = "cli"
+    holds_fleet_slot = True
+
+    def run(
+        self,
+        prompt: str,
+        session_prefix: str,
+        timeout: int,
+        on_output: Callable[[str], None] | None = None,
+    ) -> str | None:
+        if POOL_SIZE > 0:
+            return get_pool().run(prompt, session_prefix, timeout, on_output)
+        with fleet_slot(timeout) as admitted:
+            if not admitted:
+                return None
+            result = run_cli(prompt, timeout, on_output)
+        note_result(result)
+        return result.text if result.exit_code is not None else None
+
+    async def run_async(self, prompt: str, session_prefix: str, timeout: int) -> str | None:
+        result = await run_cli_async(prompt, timeout)
+        note_result(result)
+        return result.text if result.exit_code is not None else None
+
+
+BACKEND = os.getenv("HAWK_CLAUDE_BACKEND", "cli")  # "cli" or "fake"
+
+_backend: ClaudeBackend | None = None
+
+
+def get_backend() -> ClaudeBackend:
+    """Return the active backend, building it from HAWK_CLAUDE_BACKEND on first use."""
+    global _backend
+    if _backend is None:
+        if BACKEND == "cli":
+            _backend = CLIBackend()
+        elif BACKEND == "fake":
+            from workers.fake_claude import FakeClaudeBackend
+            _backend = FakeClaudeBackend.from_env()
+        else:
+            raise ValueError(f"Unknown HAWK_CLAUDE_BACKEND: {BACKEND!r}")
+    return _backend
+
+
+def set_backend(backend: ClaudeBackend | None) -> None:
+    """Install a backend for this process. None resets to the HAWK_CLAUDE_BACKEND default."""
+    global _backend
+    _backend = backend
+
+
+@contextmanager
+def _instrumented(prompt: str, session_prefix: str, target_language: str | None):
+    """Collect one ClaudeCallRecord around a call and send it to the metrics sink."""
+    record = metrics.ClaudeCallRecord(
+        session_prefix=session_prefix,
+        target_language=target_language,
+        backend=get_backend().name,
+        prompt_bytes=len(prompt.encode()),
+    )
+    token = _current_call.set(record)
+    started = time.monotonic()
+    try:
+        yield record
+    finally:
+        _current_call.reset(token)
+        record.duration = time.monotonic() - started
+        metrics.record_call(record)
+        for records in _captures.get():
+            records.append(record)
+
+
+def _finish(record: "metrics.ClaudeCallRecord", output: str | None) -> str | None:
+    if output is None:
+        record.failure = record.failure or "no_output"
+    elif not record.output_bytes:
+        record.output_bytes = len(output.encode())
+    return output
+
+
+def run_claude_p(
+    prompt: str,
+    session_prefix: str,
+    timeout: int = 60,
+    on_output: Callable[[str], None] | None = None,
+    target_language: str | None = None,
+) -> str | None:
+    """
+    Run `claude -p <prompt>` and return stdout.
+
+    Returns the output string on success, or None on timeout or failure.
+    on_output, if given, is called with each chunk of stdout as it streams in
+    (including chunks from a call that later times out).
+    Uses the warm executor pool unless HAWK_CLAUDE_POOL_SIZE is 0. When
+    HAWK_CLAUDE_CLUSTER_LIMIT is set, also waits for a fleet-wide slot (after
+    a local executor is free) and returns None if none frees up within the
+    governor's max wait.
+    target_language only tags the call's metrics record.
+    """
+    with _instrumented(prompt, session_prefix, target_language) as record:
+        backend = get_backend()
+        if backend.holds_fleet_slot:
+            return _finish(record, backend.run(prompt, session_prefix, timeout, on_output))
+        with fleet_slot(timeout) as admitted:
+            if not admitted:
+                return None
+            return _finish(record, backend.run(prompt, session_prefix, timeout, on_output))
+
+
+async def run_claude_p_async(
+    prompt: str,
+    session_prefix: str,
+    timeout: int = 60,
+    limiter: asyncio.Semaphore | None = None,
+    target_language: str | None = None,
+) -> str | None:
+    """
+    Awaitable run_claude_p(): same str | None contract.
+
+    Waits on `limiter` (default: the loop's shared semaphore) before starting
+    claude, so callers can gather() any number of calls safely.
+    """
+    async with limiter or get_async_limiter():
+        with _instrumented(prompt, session_prefix, target_language) as record:
+            governor = get_governor()
+            if governor is None:
+                return _finish(record, await get_backend().run_async(prompt, session_prefix, timeout))
+            async with governor.slot_async(timeout) as admitted:
+                if not admitted:
+                    record.failure = "no_slot"
+                    return None
+                return _finish(record, await get_backend().run_async(prompt, session_prefix, timeout))
+
+
+def run_claude_p_many(
+    prompts: list[str],
+    session_prefix: str,
+    timeout: int = 60,
+    concurrency: int = ASYNC_CONCURRENCY,
+    target_language: str | None = None,
+) -> list[str | None]:
+    """
+    Run several prompts concurrently from synchronous code.
+
+    Results come back in input order. At most `concurrency` claude processes
+    run at once. Must not be called from inside a running event loop.
+    """
+    return asyncio.run(
+        _gather_claude_p(prompts, session_prefix, timeout, concurrency, target_language)
+    )
+
+
+async def _gather_claude_p(
+    prompts: list[str],
+    session_prefix: str,
+    timeout: int,
+    concurrency: int,
+    target_language: str | None = None,
+) -> list[str | None]:
+    limiter = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(
+        run_claude_p_async(p, session_prefix, timeout, limiter=limiter, target_language=target_language)
+        for p in prompts
+    ))
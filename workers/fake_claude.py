@@ -0,0 +1,236 @@
+"""
+Deterministic stand-in for the claude CLI, for offline tests and load runs.
+
+Speaks the same prompt -> stdout contract as `claude -p`:
+  - translation prompts (TRANSLATION_PROMPT_TEMPLATE and the Spanish variant)
+    get a JSON array with one "[Language] text" string per input segment
+  - scoring prompts (SCORING_PROMPT_TEMPLATE) get a ScoreResult-shaped JSON object
+  - anything else gets "OK"
+
+Two ways to use it:
+  - as an executable: point HAWK_CLAUDE_BIN at scripts/fake-claude, which runs
+    `python -m workers.fake_claude -p <prompt>`, and the real runner (pool,
+    run_cli, timeout --foreground) is exercised end to end
+  - in-process: HAWK_CLAUDE_BACKEND=fake, or set_backend(FakeClaudeBackend(...))
+
+Behaviour is configured with HAWK_FAKE_CLAUDE_* variables (see FakeClaudeConfig.from_env):
+  LATENCY         "fixed:S", "uniform:LO:HI", "normal:MEAN:SD" or "lognormal:MU:SIGMA" (seconds)
+  ERROR_RATE      share of calls that print an error and exit 1
+  TIMEOUT_RATE    share of calls that print the first half of their reply, then hang
+                  until the caller's timeout kills them
+  MALFORMED_RATE  share of calls whose JSON is truncated, fenced, prefixed, or one element short
+  SEED            makes every outcome a pure function of (seed, prompt)
+
+With a seed, the executable is fully reproducible, so a retry of an identical
+prompt repeats the same outcome. The in-process backend also counts attempts
+per prompt, so retries draw fresh outcomes while a whole run stays reproducible.
+"""
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from workers.claude_runner import ClaudeBackend, note_call
+
+HANG_SECONDS = 3600  # "timeout" outcome: sleep until `timeout --foreground` kills us
+STREAM_PIECES = 4  # chunks per reply when the in-process backend streams
+
+_LANGUAGE_RE = re.compile(r"journalism segments to ([^.\n]+?)(?: for |\.)")
+_MALFORMED_KINDS = ("truncated", "fenced", "prefixed", "short")
+
+
+@dataclass
+class FakeClaudeConfig:
+    latency: str = "fixed:0"
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    malformed_rate: float = 0.0
+    seed: str | None = None
+
+    @classmethod
+    def from_env(cls) -> "FakeClaudeConfig":
+        return cls(
+            latency=os.getenv("HAWK_FAKE_CLAUDE_LATENCY", "fixed:0"),
+            error_rate=float(os.getenv("HAWK_FAKE_CLAUDE_ERROR_RATE", "0")),
+            timeout_rate=float(os.getenv("HAWK_FAKE_CLAUDE_TIMEOUT_RATE", "0")),
+            malformed_rate=float(os.getenv("HAWK_FAKE_CLAUDE_MALFORMED_RATE", "0")),
+            seed=os.getenv("HAWK_FAKE_CLAUDE_SEED"),
+        )
+
+
+@dataclass
+class FakeOutcome:
+    kind: str  # "ok", "error", "timeout" or "malformed"
+    latency: float
+    output: str  # for "timeout", the partial reply written before hanging
+    exit_code: int
+
+
+def sample_latency(spec: str, rng: random.Random) -> float:
+    """Draw one latency in seconds from a "dist:arg[:arg]" spec."""
+    dist, _, args = spec.partition(":")
+    params = [float(a) for a in args.split(":")] if args else []
+    if dist == "fixed":
+        value = params[0] if params else 0.0
+    elif dist == "uniform":
+        value = rng.uniform(params[0], params[1])
+    elif dist == "normal":
+        value = rng.gauss(params[0], params[1])
+    elif dist == "lognormal":
+        value = rng.lognormvariate(params[0], params[1])
+    else:
+        raise ValueError(f"Unknown latency distribution: {spec!r}")
+    return max(value, 0.0)
+
+
+def _rng_for(prompt: str, seed: str | None, attempt: int = 0) -> random.Random:
+    if seed is None:
+        return random.Random()
+    digest = hashlib.sha256(f"{seed}:{attempt}:{prompt}".encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+def _trailing_json_array(prompt: str) -> list | None:
+    """The segments JSON is the last block of a translation prompt."""
+    start = prompt.rfind("\n[")
+    while start != -1:
+        try:
+            value = json.loads(prompt[start + 1:])
+            if isinstance(value, list):
+                return value
+        except json.JSONDecodeError:
+            pass
+        start = prompt.rfind("\n[", 0, start)
+    return None
+
+
+def _respond(prompt: str, rng: random.Random) -> str:
+    if "Return a JSON array of translated strings" in prompt:
+        segments = _trailing_json_array(prompt) or []
+        match = _LANGUAGE_RE.search(prompt)
+        language = match.group(1) if match else "Translated"
+        return json.dumps([f"[{language}] {text}" for text in segments], ensure_ascii=False)
+    if prompt.startswith("Score these translations"):
+        items = _trailing_json_array(prompt) or []
+        return json.dumps([{"id": item["id"], **_fake_score(rng)} for item in items])
+    if prompt.startswith("Score this translation"):
+        return json.dumps(_fake_score(rng))
+    return "OK"
+
+
+def _fake_score(rng: random.Random) -> dict:
+    fluency = round(rng.uniform(3.0, 5.0), 1)
+    accuracy = round(rng.uniform(3.0, 5.0), 1)
+    return {
+        "overall": round((fluency + accuracy) / 2, 1),
+        "fluency": fluency,
+        "accuracy": accuracy,
+        "flags": [],
+    }
+
+
+def _malform(output: str, rng: random.Random) -> str:
+    kind = rng.choice(_MALFORMED_KINDS)
+    if kind == "truncated":
+        return output[: max(len(output) // 2, 1)]
+    if kind == "fenced":
+        return f"```json\n{output}\n```"
+    if kind == "prefixed":
+        return f"Here is the result:\n{output}"
+    try:
+        value = json.loads(output)
+    except json.JSONDecodeError:
+        return output[:-1]
+    if isinstance(value, list) and value:
+        return json.dumps(value[:-1], ensure_ascii=False)
+    return output[:-1]
+
+
+def simulate(prompt: str, config: FakeClaudeConfig, attempt: int = 0) -> FakeOutcome:
+    """Decide what one fake claude call does. Pure given (prompt, config.seed, attempt)."""
+    rng = _rng_for(prompt, config.seed, attempt)
+    latency = sample_latency(config.latency, rng)
+    roll = rng.random()
+    output = _respond(prompt, rng)
+    if roll < config.timeout_rate:
+        return FakeOutcome("timeout", HANG_SECONDS, output[: len(output) // 2], 124)
+    roll -= config.timeout_rate
+    if roll < config.error_rate:
+        return FakeOutcome("error", latency, "Error: simulated claude failure", 1)
+    roll -= config.error_rate
+    if roll < config.malformed_rate:
+        return FakeOutcome("malformed", latency, _malform(output, rng), 0)
+    return FakeOutcome("ok", latency, output, 0)
+
+
+class FakeClaudeBackend(ClaudeBackend):
+    """In-process backend: sleeps the sampled latency, then returns the simulated output."""
+
+    name = "fake"
+
+    def __init__(self, config: FakeClaudeConfig | None = None):
+        self.config = config or FakeClaudeConfig()
+        self._attempts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "FakeClaudeBackend":
+        return cls(FakeClaudeConfig.from_env())
+
+    def run(
+        self,
+        prompt: str,
+        session_prefix: str,
+        timeout: int,
+        on_output: Callable[[str], None] | None = None,
+    ) -> str | None:
+        key = hashlib.sha256(prompt.encode()).hexdigest()
+        with self._lock:
+            attempt = self._attempts.get(key, 0)
+            self._attempts[key] = attempt + 1
+        outcome = simulate(prompt, self.config, attempt)
+        if outcome.latency >= timeout:
+            if on_output is not None and outcome.kind == "timeout" and outcome.output:
+                on_output(outcome.output)
+            time.sleep(timeout)
+            note_call(exit_code=124, failure="timeout")
+            return None
+        # Stream the reply in a few pieces spread over the latency, like the CLI would
+        pieces = _split(outcome.output, STREAM_PIECES) if on_output is not None else [outcome.output]
+        for piece in pieces:
+            time.sleep(outcome.latency / len(pieces))
+            if on_output is not None and piece:
+                on_output(piece)
+        return outcome.output.strip() or None
+
+
+def _split(text: str, n: int) -> list[str]:
+    size = max(len(text) // n, 1)
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if "-p" in argv and argv.index("-p") + 1 < len(argv):
+        prompt = argv[argv.index("-p") + 1]
+    else:
+        prompt = sys.stdin.read()
+    outcome = simulate(prompt, FakeClaudeConfig.from_env())
+    if outcome.kind == "timeout":
+        sys.stdout.write(outcome.output)
+        sys.stdout.flush()
+        time.sleep(outcome.latency)
+        return outcome.exit_code
+    time.sleep(outcome.latency)
+    print(outcome.output)
+    return outcome.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+Fuzzy translation-memory index: finds previously translated segments that are
+near duplicates of a new one (a different date, number or name).
+
+Each segment is reduced to character 5-gram shingles and a MinHash signature
+of NUM_PERM values. Signatures are split into BANDS bands of ROWS values
+(locality-sensitive hashing); two segments land in the same bucket for a band
+when that band matches exactly, which happens with high probability once
+their shingle similarity passes ~0.5. A query reads BANDS buckets, ranks the
+candidates by how many buckets they share, and scores at most MAX_CANDIDATES
+of them exactly — so the cost is independent of how many segments are
+stored.
+
+Numbers are masked ("4 p.m." and "11 p.m." shingle the same), so segments that
+differ only in their numbers collide in every band. When the stored
+translation carries those numbers verbatim, reuse_numeric() swaps the new
+numbers in and the segment needs no model call at all.
+
+Masking also makes every mostly-numeric segment (table cells, scores, "$4.2
+million") look alike, so text with fewer than MIN_LETTERS letters is neither
+indexed nor looked up, and each bucket keeps only its MAX_BUCKET_SIZE newest
+entries. query_many() looks up a whole job's segments in two round trips.
+
+Two stores: InMemoryFuzzyIndex (tests, benchmarks) and RedisFuzzyIndex
+(shared by every worker):
+  - {prefix}:e:{key}                 HASH  source, translation
+  - {prefix}:z:{context}:{band}:{h}  ZSET  entry keys in that bucket, scored by when they were added
+"""
+import hashlib
+import logging
+import re
+import struct
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from workers.translation_memory import normalize_text
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 5
+NUM_PERM = 48
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+MAX_CANDIDATES = 20  # exact similarity is computed for at most this many candidates per query
+MAX_BUCKET_SIZE = 64  # newest entries kept per bucket
+MIN_LETTERS = 10  # texts with fewer letters (numbers masked) are not indexed or queried
+DEFAULT_THRESHOLD = 0.6
+
+_MERSENNE = (1 << 61) - 1
+# Fixed coefficients so every process computes identical signatures
+_PERMUTATIONS = [
+    (
+        int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=4).digest(), "big") | 1,
+        int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=4).digest(), "big"),
+    )
+    for i in range(NUM_PERM)
+]
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def _mask_numbers(text: str) -> str:
+    return _NUMBER_RE.sub("#", text)
+
+
+def indexable(text: str) -> bool:
+    """Whether text has enough non-numeric content to tell it apart from other segments."""
+    return sum(c.isalpha() for c in text) >= MIN_LETTERS
+
+
+def shingles(text: str) -> set[str]:
+    text = normalize_text(text).lower()
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i : i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def signature(text: str) -> list[int]:
+    """MinHash signature of the number-masked text."""
+    # 32-bit shingle hashes and coefficients keep every product under 64 bits
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "big")
+        for s in shingles(_mask_numbers(text))
+    ]
+    return [min([(a * h + b) % _MERSENNE for h in hashes]) for a, b in _PERMUTATIONS]
+
+
+def band_keys(sig: list[int]) -> list[str]:
+    """One bucket id per band: "band:hash-of-its-rows"."""
+    return [
+        f"{band}:{hashlib.blake2b(struct.pack(f'>{ROWS}Q', *sig[band * ROWS:(band + 1) * ROWS]), digest_size=8).hexdigest()}"
+        for band in range(BANDS)
+    ]
+
+
+def similarity(a: str, b: str) -> float:
+    """Jaccard similarity of the two texts' number-masked shingle sets."""
+    sa, sb = shingles(_mask_numbers(a)), shingles(_mask_numbers(b))
+    return len(sa & sb) / len(sa | sb) if sa or sb else 1.0
+
+
+def reuse_numeric(match_source: str, match_translation: str, text: str) -> str | None:
+    """
+    Translation of `text` derived from a stored segment that differs only in its numbers.
+
+    Every number of the stored source must appear verbatim in its translation
+    (so "1.3 billion" -> "1,300 millones" is not touched) and map to a single
+    new number; otherwise returns None and the match is only a reference.
+    """
+    if _mask_numbers(normalize_text(match_source)) != _mask_numbers(normalize_text(text)):
+        return None
+    old_numbers = _NUMBER_RE.findall(match_source)
+    new_numbers = _NUMBER_RE.findall(text)
+    if len(old_numbers) != len(new_numbers):
+        return None
+    mapping: dict[str, str] = {}
+    for old, new in zip(old_numbers, new_numbers):
+        if mapping.setdefault(old, new) != new:
+            return None  # same number became two different ones — ambiguous
+    translated_numbers = _NUMBER_RE.findall(match_translation)
+    if Counter(translated_numbers) != Counter(old_numbers):
+        return None  # the translation reformatted or dropped a number
+    return _NUMBER_RE.sub(lambda m: mapping[m.group(0)], match_translation)
+
+
+@dataclass
+class FuzzyMatch:
+    source: str
+    translation: str
+    similarity: float
+
+
+class FuzzyIndex:
+    """LSH index over (source, translation) pairs, partitioned by context (language, glossary, prompt)."""
+
+    def add(self, key: str, source: str, translation: str, context: str) -> None:
+        self.add_many([(key, source, translation)], context)
+
+    def add_many(self, entries: list[tuple[str, str, str]], context: str) -> None:
+        """entries: (key, source, translation) triples. Sources that aren't indexable() are skipped."""
+        self._put_many([
+            (key, source, translation, [f"{context}:{b}" for b in band_keys(signature(source))])
+            for key, source, translation in entries
+            if indexable(source)
+        ])
+
+    def query(
+        self,
+        text: str,
+        context: str,
+        limit: int = 3,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> list[FuzzyMatch]:
+        """Up to `limit` stored segments with similarity >= threshold, best first."""
+        return self.query_many([text], context, limit, threshold)[0]
+
+    def query_many(
+        self,
+        texts: list[str],
+        context: str,
+        limit: int = 3,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> list[list[FuzzyMatch]]:
+        """query() for each text, reading every bucket in one batch and every candidate in another."""
+        positions = [i for i, text in enumerate(texts) if indexable(text)]
+        buckets = [f"{context}:{b}" for i in positions for b in band_keys(signature(texts[i]))]
+        members = self._buckets(buckets) if buckets else []
+        candidates: dict[int, list[str]] = {}
+        for n, i in enumerate(positions):
+            votes = Counter()
+            for bucket in members[n * BANDS:(n + 1) * BANDS]:
+                votes.update(bucket)
+            if votes:
+                candidates[i] = [key for key, _ in votes.most_common(MAX_CANDIDATES)]
+
+        entries = self._entries(list(dict.fromkeys(k for keys in candidates.values() for k in keys)))
+        results: list[list[FuzzyMatch]] = [[] for _ in texts]
+        for i, keys in candidates.items():
+            matches = []
+            for source, translation in (entries[k] for k in keys if k in entries):
+                score = similarity(texts[i], source)
+                if score >= threshold:
+                    matches.append(FuzzyMatch(source, translation, score))
+            matches.sort(key=lambda m: m.similarity, reverse=True)
+            results[i] = matches[:limit]
+        return results
+
+    # Storage hooks
+    def _put_many(self, entries: list[tuple[str, str, str, list[str]]]) -> None:
+        """entries: (key, source, translation, bucket ids) tuples. Each bucket keeps its MAX_BUCKET_SIZE newest."""
+        raise NotImplementedError
+
+    def _buckets(self, buckets: list[str]) -> list[set[str]]:
+        raise NotImplementedError
+
+    def _entries(self, keys: list[str]) -> dict[str, tuple[str, str]]:
+        """{key: (source, translation)} for the keys still stored."""
+        raise NotImplementedError
+
+
+class InMemoryFuzzyIndex(FuzzyIndex):
+    def __init__(self):
+        self._entries_by_key: dict[str, tuple[str, str]] = {}
+        self._bucket_members: dict[str, dict[str, None]] = defaultdict(dict)  # insertion-ordered, oldest first
+
+    def __len__(self) -> int:
+        return len(self._entries_by_key)
+
+    def _put_many(self, entries):
+        for key, source, translation, buckets in entries:
+            self._entries_by_key[key] = (source, translation)
+            for bucket in buckets:
+                members = self._bucket_members[bucket]
+                members.pop(key, None)
+                members[key] = None
+                while len(members) > MAX_BUCKET_SIZE:
+                    del members[next(iter(members))]
+
+    def _buckets(self, buckets):
+        return [set(self._bucket_members.get(b, ())) for b in buckets]
+
+    def _entries(self, keys):
+        return {k: self._entries_by_key[k] for k in keys if k in self._entries_by_key}
+
+
+class RedisFuzzyIndex(FuzzyIndex):
+    """Shared index in Redis. Entries and buckets expire after ttl_seconds without new writes."""
+
+    def __init__(self, redis_client: Redis, prefix: str = "tm:fz", ttl_seconds: int = 90 * 86400):
+        self.redis = redis_client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.prefix}:e:{key}"
+
+    def _bucket_key(self, bucket: str) -> str:
+        return f"{self.prefix}:z:{bucket}"
+
+    def _put_many(self, entries):
+        if not entries:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            now = time.time()
+            for key, source, translation, buckets in entries:
+                entry = self._entry_key(key)
+                pipe.hset(entry, mapping={"source": source, "translation": translation})
+                pipe.expire(entry, self.ttl_seconds)
+                for bucket in buckets:
+                    bucket_key = self._bucket_key(bucket)
+                    pipe.zadd(bucket_key, {key: now})
+                    pipe.zremrangebyrank(bucket_key, 0, -MAX_BUCKET_SIZE - 1)
+                    pipe.expire(bucket_key, self.ttl_seconds)
+            pipe.execute()
+        except RedisError as e:
+            logger.warning("Fuzzy index write failed: %s", e)
+
+    def _buckets(self, buckets):
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for bucket in buckets:
+                pipe.zrange(self._bucket_key(bucket), 0, -1)
+            return [{_decode(m) for m in members} for members in pipe.execute()]
+        except RedisError as e:
+            logger.warning("Fuzzy index read failed: %s", e)
+            return [set() for _ in buckets]
+
+    def _entries(self, keys):
+        if not keys:
+            return {}
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.hmget(self._entry_key(key), "source", "translation")
+            rows = pipe.execute()
+        except RedisError as e:
+            logger.warning("Fuzzy index read failed: %s", e)
+            return {}
+        # Expired entries leave their key behind in buckets; those rows come back empty
+        return {
+            key: (_decode(s), _decode(t)) for key, (s, t) in zip(keys, rows) if s is not None and t is not None
+        }
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
@@ -1,4 +1,160 @@
+"""
+Glossary substitutions applied to source text before translation.
+
+Terms are matched whole-word and case-insensitively, longest term first, and
+each term's replacement is applied to the text left by the longer terms
+before it (so "Board of Education" wins over "Board", and a replacement can
+itself contain a shorter term that is then replaced).
+
+compile_glossary() builds a GlossaryMatcher once per glossary: the terms go
+into a character trie, compiled to one regex that finds, in a single scan,
+every term that matches anywhere in a segment. Only those terms (usually a
+handful out of thousands) are then substituted, in the same longest-first
+order, and the text is rescanned after each change so terms exposed by a
+replacement are not missed. The output is identical to applying every term
+in turn; glossaries the trie cannot represent exactly fall back to exactly
+that.
+"""
+import hashlib
+import heapq
+import json
 import re
+from collections import OrderedDict
+
+MATCHER_CACHE_SIZE = 8  # compiled glossaries kept for apply_glossary()
+
+_WORD_RE = re.compile(r"\w")
+_TERMINAL = ""  # trie key holding the ranks of the terms ending at a node
+
+
+class _Unmappable(Exception):
+    """A scan match that the trie cannot map back to its terms."""
+
+
+def _fold(ch: str) -> str:
+    lowered = ch.lower()
+    return lowered if len(lowered) == 1 else ch
+
+
+def _term_pattern(source: str) -> re.Pattern:
+    return re.compile(r"(?<!\w)" + re.escape(source) + r"(?!\w)", re.IGNORECASE)
+
+
+def _trie_regex(node: dict) -> str:
+    """Regex for the terms below node; nested optional groups try longer terms first."""
+    branches = [re.escape(ch) + _trie_regex(child) for ch, child in sorted(node.items()) if ch != _TERMINAL]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return f"(?:{body})?" if _TERMINAL in node else body
+
+
+def _ambiguous(node: dict) -> bool:
+    """True if two branches of one node can match the same character, which the trie walk cannot follow."""
+    keys = [ch for ch in node if ch != _TERMINAL]
+    for i, ch in enumerate(keys):
+        if not ch.isascii():
+            pattern = re.compile(re.escape(ch), re.IGNORECASE)
+            if any(pattern.fullmatch(other) for other in keys[:i] + keys[i + 1:]):
+                return True
+    return any(_ambiguous(child) for ch, child in node.items() if ch != _TERMINAL)
+
+
+class GlossaryMatcher:
+    """A glossary compiled for repeated apply() calls."""
+
+    def __init__(self, terms: dict[str, str]):
+        # Sort by source term length descending: "Board of Education" before "Board"
+        self.order = sorted(terms.items(), key=lambda x: len(x[0]), reverse=True)
+        self._patterns: dict[int, re.Pattern] = {}
+        self._trie: dict = {}
+        self._scan: re.Pattern | None = None
+        if not self.order or any(not source for source, _ in self.order):
+            return  # an empty source term matches between words; leave it to the sequential path
+        for rank, (source, _) in enumerate(self.order):
+            node = self._trie
+            for ch in source:
+                node = node.setdefault(_fold(ch), {})
+            node.setdefault(_TERMINAL, []).append(rank)
+        try:
+            if not _ambiguous(self._trie):
+                self._scan = re.compile(r"(?<!\w)(?=(" + _trie_regex(self._trie) + r")(?!\w))", re.IGNORECASE)
+        except (RecursionError, re.error, OverflowError):
+            self._scan = None
+
+    @property
+    def compiled(self) -> bool:
+        return self._scan is not None
+
+    def _pattern(self, rank: int) -> re.Pattern:
+        pattern = self._patterns.get(rank)
+        if pattern is None:
+            pattern = self._patterns[rank] = _term_pattern(self.order[rank][0])
+        return pattern
+
+    def _substitute(self, rank: int, text: str) -> str:
+        target = self.order[rank][1]
+        return self._pattern(rank).sub(lambda m: target, text)
+
+    def _matching_ranks(self, text: str) -> list[int]:
+        """Ranks of every term with a whole-word match in text."""
+        ranks = []
+        for match in self._scan.finditer(text):
+            start = match.start()
+            node = self._trie
+            for offset, ch in enumerate(match.group(1)):
+                node = node.get(_fold(ch))
+                if node is None:
+                    raise _Unmappable(ch)
+                if _TERMINAL in node and not _WORD_RE.match(text, start + offset + 1):
+                    ranks.extend(node[_TERMINAL])
+        return ranks
+
+    def apply_sequential(self, text: str) -> str:
+        """Every term in turn: the reference behaviour apply() reproduces."""
+        for rank in range(len(self.order)):
+            text = self._substitute(rank, text)
+        return text
+
+    def apply(self, text: str) -> str:
+        if self._scan is None:
+            return self.apply_sequential(text)
+        original = text
+        try:
+            pending = list(set(self._matching_ranks(text)))
+            heapq.heapify(pending)
+            done = -1
+            while pending:
+                rank = heapq.heappop(pending)
+                if rank <= done:
+                    continue
+                done = rank
+                replaced = self._substitute(rank, text)
+                if replaced != text:
+                    text = replaced
+                    # Later terms see the new text, as they would applied in turn
+                    for later in self._matching_ranks(text):
+                        if later > rank:
+                            heapq.heappush(pending, later)
+            return text
+        except _Unmappable:
+            return self.apply_sequential(original)
+
+
+_matchers: "OrderedDict[tuple, GlossaryMatcher]" = OrderedDict()
+
+
+def compile_glossary(terms: dict[str, str]) -> GlossaryMatcher:
+    """A GlossaryMatcher for terms, reused while the same terms keep coming in."""
+    key = tuple(terms.items())
+    matcher = _matchers.get(key)
+    if matcher is None:
+        matcher = _matchers[key] = GlossaryMatcher(terms)
+        if len(_matchers) > MATCHER_CACHE_SIZE:
+            _matchers.popitem(last=False)
+    else:
+        _matchers.move_to_end(key)
+    return matcher
 
 
 def apply_glossary(text: str, terms: dict[str, str]) -> str:
@@ -11,14 +167,11 @@ def apply_glossary(text: str, terms: dict[str, str]) -> str:
     """
     if not terms:
         return text
+    return compile_glossary(terms).apply(text)
 
-    result = text
-    # Sort by source term length descending: "Board of Education" before "Board"
-    sorted_terms = sorted(terms.items(), key=lambda x: len(x[0]), reverse=True)
-
-    for source, target in sorted_terms:
-        escaped_source = re.escape(source)
-        pattern = re.compile(r"(?<!\w)" + escaped_source + r"(?!\w)", re.IGNORECASE)
-        result = pattern.sub(lambda m: target, result)
 
-    return result
+def glossary_version(terms: dict[str, str]) -> str:
+    """Fingerprint of a glossary's terms ("" for no glossary), for cache keys."""
+    if not terms:
+        return ""
+    return hashlib.sha256(json.dumps(terms, sort_keys=True, ensure_ascii=False).encode()).hexdigest()[:16]
@@ -0,0 +1,209 @@
+"""
+Per-process cache of compiled glossary stacks, so hot glossaries are neither
+reloaded nor recompiled between jobs.
+
+Each distinct stack (workers/glossary_stack.py: the global, language pair,
+org and request layers a job draws on) is merged and compiled into one
+GlossaryMatcher, kept in an LRU of HAWK_GLOSSARY_CACHE_SIZE entries keyed by
+the stack's glossaries and their versions. Glossary.version is bumped on
+every ORM update (db/models.py), and committing a new or edited glossary publishes its id
+on the glossary:invalidate Redis channel (the session hooks below, registered
+in any process that imports this module). Each worker process subscribes in a
+background thread; a message drops the stacks containing that glossary and
+makes every other stack recheck its membership on next use.
+
+While subscribed, a cached stack is used without touching the database for
+up to HAWK_GLOSSARY_CACHE_MAX_AGE seconds; after that, or whenever the
+subscription is down, get() re-resolves the stack (one query for glossary ids
+and versions) and recompiles only if that changed. Edits made outside the ORM
+(raw SQL) must bump version themselves to be picked up.
+
+HAWK_GLOSSARY_CACHE_SIZE=0 disables caching (every job loads and compiles).
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from redis import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from db.models import Glossary
+from workers import metrics
+from workers.glossary import GlossaryMatcher, glossary_version
+from workers.glossary_stack import Layer, StackSpec, load_stack, resolve_layers, stack_key
+
+logger = logging.getLogger(__name__)
+
+GLOSSARY_CACHE_SIZE = int(os.getenv("HAWK_GLOSSARY_CACHE_SIZE", "32"))  # compiled stacks per process; 0 disables
+GLOSSARY_CACHE_MAX_AGE = int(os.getenv("HAWK_GLOSSARY_CACHE_MAX_AGE", "300"))  # seconds between version checks
+INVALIDATION_CHANNEL = "glossary:invalidate"
+RECONNECT_DELAY = 5  # seconds before resubscribing after a Redis error
+
+_CHANGED_KEY = "hawk_glossaries_changed"
+
+
+@dataclass(frozen=True)
+class CompiledGlossary:
+    key: tuple  # glossary_stack.stack_key()
+    layers: tuple[Layer, ...]
+    terms: dict[str, str]  # merged across layers
+    matcher: GlossaryMatcher
+    glossary_version: str  # fingerprint of the merged terms, for translation memory keys
+
+
+class GlossaryCache:
+    """LRU of CompiledGlossary by stack key, invalidated over Redis pub/sub."""
+
+    def __init__(
+        self,
+        max_entries: int = GLOSSARY_CACHE_SIZE,
+        max_age: float = GLOSSARY_CACHE_MAX_AGE,
+        redis_client: Redis | None = None,
+        channel: str = INVALIDATION_CHANNEL,
+    ):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.redis = redis_client
+        self.channel = channel
+        self.listening = False
+        self._entries: "OrderedDict[tuple, CompiledGlossary]" = OrderedDict()
+        self._current: dict[StackSpec, tuple[tuple, float]] = {}  # spec -> (stack key, when last confirmed)
+        self._generation = 0  # bumped on invalidation; guards loads that raced one
+        self._lock = threading.Lock()
+        self._listener: threading.Thread | None = None
+
+    def get(self, spec: StackSpec, db: Session) -> CompiledGlossary:
+        """The compiled stack for spec, loading and compiling it only if this process has no current copy."""
+        with self._lock:
+            current = self._current.get(spec)
+            generation = self._generation
+            if current is not None and self.listening and time.monotonic() - current[1] < self.max_age:
+                entry = self._entries.get(current[0])
+                if entry is not None:
+                    self._entries.move_to_end(current[0])
+                    metrics.incr("glossary_cache.hits")
+                    return entry
+
+        layers = resolve_layers(spec, db)
+        key = stack_key(spec, layers)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._current[spec] = (key, time.monotonic())
+        if entry is not None:
+            metrics.incr("glossary_cache.hits")
+            return entry
+
+        metrics.incr("glossary_cache.misses")
+        terms = load_stack(spec, layers, db)
+        entry = CompiledGlossary(
+            key=key,
+            layers=layers,
+            terms=terms,
+            matcher=GlossaryMatcher(terms),
+            glossary_version=glossary_version(terms),
+        )
+        if self.max_entries > 0:
+            with self._lock:
+                if self._generation == generation:
+                    self._store(spec, entry)
+        return entry
+
+    def _store(self, spec: StackSpec, entry: CompiledGlossary) -> None:
+        self._entries[entry.key] = entry
+        self._entries.move_to_end(entry.key)
+        self._current[spec] = (entry.key, time.monotonic())
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            for stale in [s for s, (key, _) in self._current.items() if key == evicted]:
+                del self._current[stale]
+
+    def invalidate(self, glossary_id: str) -> None:
+        """Drop the stacks containing glossary_id; every other stack rechecks its layers (it may be new to them)."""
+        with self._lock:
+            self._generation += 1
+            self._current.clear()
+            for key, entry in list(self._entries.items()):
+                if any(layer.glossary_id == glossary_id for layer in entry.layers):
+                    del self._entries[key]
+
+    def start_listener(self) -> None:
+        """Subscribe to invalidations in a daemon thread (once per process)."""
+        if self.redis is None or self.max_entries <= 0 or self._listener is not None:
+            return
+        self._listener = threading.Thread(target=self._listen, name="glossary-invalidation", daemon=True)
+        self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                with self._lock:
+                    # Edits may have been missed while unsubscribed: re-resolve stacks on next use
+                    self._current.clear()
+                self.listening = True
+                for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        data = message["data"]
+                        self.invalidate(data.decode() if isinstance(data, bytes) else str(data))
+            except RedisError as e:
+                logger.warning("Glossary invalidation subscription lost: %s", e)
+            finally:
+                self.listening = False
+            time.sleep(RECONNECT_DELAY)
+
+
+def publish_invalidation(redis_client: Redis, glossary_ids: set[str]) -> None:
+    try:
+        for glossary_id in sorted(glossary_ids):
+            redis_client.publish(INVALIDATION_CHANNEL, glossary_id)
+    except RedisError as e:
+        # Workers still pick the edit up at their next version check
+        logger.warning("Failed to publish glossary invalidation: %s", e)
+
+
+_publisher: Redis | None = None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_glossary_changes(session, flush_context) -> None:
+    touched = list(session.new) + list(session.dirty) + list(session.deleted)
+    changed = {obj.id for obj in touched if isinstance(obj, Glossary)}
+    if changed:
+        session.info.setdefault(_CHANGED_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_glossary_changes(session) -> None:
+    # Published only once committed, so a worker that reloads on the message sees the edit
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if changed:
+        global _publisher
+        if _publisher is None:
+            _publisher = Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        publish_invalidation(_publisher, changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_glossary_changes(session) -> None:
+    session.info.pop(_CHANGED_KEY, None)
+
+
+_cache: GlossaryCache | None = None
+
+
+def get_glossary_cache() -> GlossaryCache:
+    """The process-wide cache, subscribed to invalidations on first use."""
+    global _cache
+    if _cache is None:
+        redis_client = Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        _cache = GlossaryCache(redis_client=redis_client)
+        _cache.start_listener()
+    return _cache
@@ -0,0 +1,147 @@
+"""
+Glossary stacks: every glossary that applies to a job, merged into one.
+
+A job's glossary is built from up to four layers, later layers overriding
+earlier ones for the same source term (compared case-insensitively, as terms
+are matched):
+
+  1. global     - bundled glossary files, e.g. resources/glossary-curated.json
+                  (HAWK_GLOBAL_GLOSSARY_FILES, comma-separated; empty by default)
+  2. language   - shared glossaries (no org) for the job's language pair
+  3. org        - the job's organization's glossaries for the language pair
+  4. request    - the glossary named by the request's glossary_id, if it is
+                  shared or belongs to the job's organization
+
+The language and org layers are opt-in (StackSpec.automatic): the
+organization's stack_glossaries setting, or {"stack_glossaries": bool} in the
+request metadata. Without it a job applies only the glossary it names.
+
+Within a layer, newer glossaries override older ones. The merged terms are
+compiled into a single GlossaryMatcher, so a job applies every layer in one
+pass; workers/glossary_cache.py caches the result per distinct stack.
+"""
+import json
+import logging
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from sqlalchemy import and_, or_
+
+from db.models import Glossary
+from workers.glossary import glossary_version
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# Opt-in: the bundled files hold everyday words ("ice", "bill", "county") that,
+# matched case-insensitively, would rewrite ordinary text in every article
+GLOBAL_GLOSSARY_FILES = os.getenv("HAWK_GLOBAL_GLOSSARY_FILES", "")
+
+LAYERS = ("global", "language", "org", "request")
+
+
+@dataclass(frozen=True)
+class StackSpec:
+    """What decides a job's glossary stack."""
+    language_pair: str  # e.g. "en-es"
+    org_id: str | None = None
+    glossary_id: str | None = None
+    automatic: bool = False  # include the language and org layers
+
+    @classmethod
+    def for_job(cls, job, automatic: bool = False) -> "StackSpec":
+        return cls(f"{job.source_language}-{job.target_language}", job.org_id, job.glossary_id, automatic)
+
+
+@dataclass(frozen=True)
+class Layer:
+    name: str  # one of LAYERS
+    glossary_id: str
+    version: int
+
+
+def _bundled_terms(path: Path, target_language: str) -> dict[str, str]:
+    terms = {}
+    for entry in json.loads(path.read_text()):
+        source, target = entry.get("term_en"), entry.get(f"term_{target_language}")
+        # "bill (legislation)", "sen. / senator": annotated entries, not text that appears in articles
+        if source and target and "(" not in source and "/" not in source:
+            terms[source] = target
+    return terms
+
+
+@lru_cache(maxsize=None)
+def global_glossary(language_pair: str) -> dict[str, str]:
+    """The bundled glossary terms for a language pair ({} if the files have none)."""
+    source_language, _, target_language = language_pair.partition("-")
+    if source_language != "en":
+        return {}
+    layers = []
+    for name in (n.strip() for n in GLOBAL_GLOSSARY_FILES.split(",")):
+        if not name:
+            continue
+        path = Path(name) if Path(name).is_absolute() else PROJECT_ROOT / name
+        try:
+            layers.append(_bundled_terms(path, target_language))
+        except (OSError, ValueError) as e:
+            logger.warning("Skipping global glossary %s: %s", path, e)
+    return merge_terms(layers)
+
+
+def resolve_layers(spec: StackSpec, db) -> tuple[Layer, ...]:
+    """The database glossaries in a stack, lowest precedence first (one query, no terms loaded)."""
+    shared = Glossary.org_id.is_(None)
+    owners = or_(shared, Glossary.org_id == spec.org_id) if spec.org_id else shared
+    conditions = []
+    if spec.automatic:
+        conditions.append(and_(Glossary.language_pair == spec.language_pair, owners))
+    if spec.glossary_id:
+        # Another organization's glossary id is ignored, not applied
+        conditions.append(and_(Glossary.id == spec.glossary_id, owners))
+    if not conditions:
+        return ()
+    rows = (
+        db.query(Glossary.id, Glossary.version, Glossary.org_id)
+        .filter(or_(*conditions))
+        .order_by(Glossary.created_at, Glossary.id)
+        .all()
+    )
+    layers = []
+    for glossary_id, version, org_id in rows:
+        if glossary_id == spec.glossary_id:
+            name = "request"
+        else:
+            name = "language" if org_id is None else "org"
+        layers.append(Layer(name, glossary_id, version))
+    return tuple(sorted(layers, key=lambda layer: LAYERS.index(layer.name)))
+
+
+def stack_key(spec: StackSpec, layers: tuple[Layer, ...]) -> tuple:
+    """Identifies a merged stack: any edit to one of its glossaries changes the key."""
+    return (
+        spec.language_pair,
+        glossary_version(global_glossary(spec.language_pair)),
+        tuple((layer.glossary_id, layer.version) for layer in layers),
+    )
+
+
+def merge_terms(layers: list[dict[str, str]]) -> dict[str, str]:
+    """Merge term dicts, later ones winning for the same (case-insensitive) source term."""
+    merged: dict[str, tuple[str, str]] = {}
+    for terms in layers:
+        for source, target in terms.items():
+            merged[source.lower()] = (source, target)
+    return dict(merged.values())
+
+
+def load_stack(spec: StackSpec, layers: tuple[Layer, ...], db) -> dict[str, str]:
+    """The merged terms of a stack."""
+    terms_by_id = {}
+    if layers:
+        ids = [layer.glossary_id for layer in layers]
+        terms_by_id = dict(db.query(Glossary.id, Glossary.terms_json).filter(Glossary.id.in_(ids)).all())
+    return merge_terms(
+        [global_glossary(spec.language_pair)] + [terms_by_id.get(layer.glossary_id) or {} for layer in layers]
+    )
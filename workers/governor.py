@@ -0,0 +1,251 @@
+"""
+Cluster-wide cap on concurrent claude -p calls, shared by every Celery worker.
+
+A fair counting semaphore in Redis (the same REDIS_URL the app already uses):
+  - {prefix}:holders     ZSET token -> lease expiry (ms); in-flight calls
+  - {prefix}:queue       ZSET token -> ticket number; FIFO wait line
+  - {prefix}:queue_seen  ZSET token -> last poll (ms); drops waiters that died
+  - {prefix}:ticket      ticket counter
+  - {prefix}:stats       HASH of acquire and wait-time counters
+
+A caller takes a ticket, then polls. It is admitted once fewer than `limit`
+leases are held and no more than (limit - held) callers are ahead of it, so
+slots go out in arrival order across the whole fleet. Leases expire on their
+own (call timeout plus a grace period), so a worker that crashes mid-call
+cannot leak a slot.
+
+If Redis is unreachable the governor fails open: the call runs ungoverned
+and a warning is logged, rather than stopping all translation.
+
+`python -m workers.governor` prints the fleet-wide stats() snapshot.
+"""
+import asyncio
+import logging
+import os
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+CLUSTER_LIMIT = int(os.getenv("HAWK_CLAUDE_CLUSTER_LIMIT", "0"))  # 0 disables the governor
+MAX_WAIT = float(os.getenv("HAWK_CLAUDE_GOVERNOR_MAX_WAIT", "300"))  # seconds before giving up
+POLL_INTERVAL = 0.2  # seconds between admission attempts
+LEASE_GRACE = 30  # seconds a lease outlives the call timeout
+STALE_WAITER_MS = 10_000  # waiters that stop polling for this long lose their place
+
+# Returns 1 if the token now holds a lease, 0 if it is still queued.
+_ACQUIRE_LUA = """
+local holders, queue, seen, ticket = KEYS[1], KEYS[2], KEYS[3], KEYS[4]
+local token = ARGV[1]
+local now = tonumber(ARGV[2])
+local lease_ms = tonumber(ARGV[3])
+local limit = tonumber(ARGV[4])
+local stale_ms = tonumber(ARGV[5])
+
+redis.call('ZREMRANGEBYSCORE', holders, '-inf', now)
+local stale = redis.call('ZRANGEBYSCORE', seen, '-inf', now - stale_ms)
+for _, waiter in ipairs(stale) do
+    redis.call('ZREM', queue, waiter)
+    redis.call('ZREM', seen, waiter)
+end
+
+if not redis.call('ZSCORE', queue, token) then
+    redis.call('ZADD', queue, redis.call('INCR', ticket), token)
+end
+redis.call('ZADD', seen, now, token)
+
+local held = redis.call('ZCARD', holders)
+local rank = redis.call('ZRANK', queue, token)
+if held + rank < limit then
+    redis.call('ZREM', queue, token)
+    redis.call('ZREM', seen, token)
+    redis.call('ZADD', holders, now + lease_ms, token)
+    return 1
+end
+return 0
+"""
+
+_RECORD_WAIT_LUA = """
+local stats = KEYS[1]
+local waited = tonumber(ARGV[1])
+redis.call('HINCRBY', stats, 'acquired', 1)
+redis.call('HINCRBYFLOAT', stats, 'wait_seconds_total', waited)
+if waited > 0 then
+    redis.call('HINCRBY', stats, 'waited', 1)
+end
+local max = tonumber(redis.call('HGET', stats, 'wait_seconds_max') or '0')
+if waited > max then
+    redis.call('HSET', stats, 'wait_seconds_max', waited)
+end
+return 0
+"""
+
+
+class ClaudeGovernor:
+    """Redis-backed fair semaphore capping claude -p calls across all workers."""
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        limit: int,
+        prefix: str = "claude_governor",
+        max_wait: float = MAX_WAIT,
+    ):
+        if limit < 1:
+            raise ValueError("ClaudeGovernor limit must be at least 1")
+        self.redis = redis_client
+        self.limit = limit
+        self.max_wait = max_wait
+        self._holders = f"{prefix}:holders"
+        self._queue = f"{prefix}:queue"
+        self._seen = f"{prefix}:queue_seen"
+        self._ticket = f"{prefix}:ticket"
+        self._stats = f"{prefix}:stats"
+
+    def try_acquire(self, token: str, lease_seconds: float) -> bool:
+        """One admission attempt. Joins the queue on first call; True once a slot is held."""
+        now_ms = int(time.time() * 1000)
+        admitted = self.redis.eval(
+            _ACQUIRE_LUA, 4, self._holders, self._queue, self._seen, self._ticket,
+            token, now_ms, int(lease_seconds * 1000), self.limit, STALE_WAITER_MS,
+        )
+        return bool(admitted)
+
+    def release(self, token: str) -> None:
+        self.redis.zrem(self._holders, token)
+
+    def cancel(self, token: str) -> None:
+        """Leave the wait line without taking a slot."""
+        pipe = self.redis.pipeline()
+        pipe.zrem(self._queue, token)
+        pipe.zrem(self._seen, token)
+        pipe.hincrby(self._stats, "timeouts", 1)
+        pipe.execute()
+
+    def _record_wait(self, waited: float) -> None:
+        self.redis.eval(_RECORD_WAIT_LUA, 1, self._stats, round(waited, 3))
+
+    def acquire(self, lease_seconds: float) -> str | None:
+        """Block until admitted. Returns the lease token, or None after max_wait."""
+        token = uuid.uuid4().hex
+        start = time.monotonic()
+        while not self.try_acquire(token, lease_seconds):
+            if time.monotonic() - start >= self.max_wait:
+                self.cancel(token)
+                return None
+            time.sleep(POLL_INTERVAL)
+        self._record_wait(time.monotonic() - start)
+        return token
+
+    async def acquire_async(self, lease_seconds: float) -> str | None:
+        """acquire() for event loops: waits with asyncio.sleep instead of blocking."""
+        token = uuid.uuid4().hex
+        start = time.monotonic()
+        while not self.try_acquire(token, lease_seconds):
+            if time.monotonic() - start >= self.max_wait:
+                self.cancel(token)
+                return None
+            await asyncio.sleep(POLL_INTERVAL)
+        self._record_wait(time.monotonic() - start)
+        return token
+
+    @contextmanager
+    def slot(self, timeout: int):
+        """
+        Hold one fleet-wide slot for a claude call with the given timeout.
+
+        Yields True when admitted (or when Redis is down — fail open) and False
+        when max_wait passed without a slot.
+        """
+        try:
+            token = self.acquire(timeout + LEASE_GRACE)
+        except RedisError as e:
+            logger.warning("claude governor unavailable, running ungoverned: %s", e)
+            yield True
+            return
+        if token is None:
+            logger.warning("No claude slot free after %.0fs (limit %d)", self.max_wait, self.limit)
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            self._safe_release(token)
+
+    @asynccontextmanager
+    async def slot_async(self, timeout: int):
+        """Async counterpart of slot()."""
+        try:
+            token = await self.acquire_async(timeout + LEASE_GRACE)
+        except RedisError as e:
+            logger.warning("claude governor unavailable, running ungoverned: %s", e)
+            yield True
+            return
+        if token is None:
+            logger.warning("No claude slot free after %.0fs (limit %d)", self.max_wait, self.limit)
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            self._safe_release(token)
+
+    def _safe_release(self, token: str) -> None:
+        try:
+            self.release(token)
+        except RedisError as e:
+            # The lease expires on its own; nothing leaks permanently
+            logger.warning("Failed to release claude slot %s: %s", token, e)
+
+    def stats(self) -> dict:
+        """Fleet-wide snapshot for sizing: in-flight and queued calls plus wait-time counters."""
+        now_ms = int(time.time() * 1000)
+        pipe = self.redis.pipeline()
+        pipe.zcount(self._holders, now_ms, "+inf")
+        pipe.zcard(self._queue)
+        pipe.hgetall(self._stats)
+        in_flight, waiting, raw = pipe.execute()
+        counters = {
+            (k.decode() if isinstance(k, bytes) else k): float(v) for k, v in (raw or {}).items()
+        }
+        acquired = int(counters.get("acquired", 0))
+        total = counters.get("wait_seconds_total", 0.0)
+        return {
+            "limit": self.limit,
+            "in_flight": in_flight,
+            "waiting": waiting,
+            "acquired": acquired,
+            "waited": int(counters.get("waited", 0)),
+            "timeouts": int(counters.get("timeouts", 0)),
+            "wait_seconds_total": total,
+            "wait_seconds_max": counters.get("wait_seconds_max", 0.0),
+            "wait_seconds_mean": total / acquired if acquired else 0.0,
+        }
+
+
+_governor: ClaudeGovernor | None = None
+
+
+def get_governor() -> ClaudeGovernor | None:
+    """The process-wide governor, or None when HAWK_CLAUDE_CLUSTER_LIMIT is 0."""
+    global _governor
+    if CLUSTER_LIMIT <= 0:
+        return None
+    if _governor is None:
+        redis_client = Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        _governor = ClaudeGovernor(redis_client, limit=CLUSTER_LIMIT)
+    return _governor
+
+
+if __name__ == "__main__":
+    # `python -m workers.governor` prints fleet-wide stats as JSON
+    import json
+
+    gov = get_governor()
+    if gov is None:
+        raise SystemExit("HAWK_CLAUDE_CLUSTER_LIMIT is 0 — governor disabled")
+    print(json.dumps(gov.stats(), indent=2))
@@ -0,0 +1,86 @@
+import json
+
+_SEPARATORS = ", \t\r\n"
+_DELIMITERS = _SEPARATORS + "]"  # what may legally follow a complete element
+
+
+class JSONArrayStream:
+    """
+    Incremental parser for a JSON array that arrives in chunks.
+
+    feed() returns each top-level element as soon as it is complete, so a
+    caller can act on the first elements of claude's reply while the rest is
+    still being generated — and keep them if the reply is cut off.
+
+    Text before the opening "[" (a markdown fence, "Here are the
+    translations:") is skipped. An element is only emitted once the delimiter
+    after it has arrived, so a number split across chunks is never cut short.
+
+    Mid-stream, an element that doesn't parse may just be incomplete. Once
+    the whole reply is in, finish() tells the two apart: a reply that merely
+    stops early is truncated, one with an element that can never parse
+    (`Dos.`, `{broken}`) is malformed.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self.started = False  # saw the opening "["
+        self.closed = False  # saw the matching "]"
+        self.malformed = False  # finish() found an element that can't parse, not just a cut-off one
+        self.count = 0  # elements emitted so far
+
+    def feed(self, chunk: str) -> list:
+        if self.closed:
+            return []
+        self._buffer += chunk
+        items = []
+        while True:
+            if not self.started:
+                start = self._buffer.find("[", self._pos)
+                if start == -1:
+                    self._pos = len(self._buffer)
+                    break
+                self._pos = start + 1
+                self.started = True
+            self._skip_separators()
+            if self._pos >= len(self._buffer):
+                break
+            if self._buffer[self._pos] == "]":
+                self._pos += 1
+                self.closed = True
+                break
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                break  # element still incomplete (or garbage — either way, wait for more)
+            if end >= len(self._buffer) or self._buffer[end] not in _DELIMITERS:
+                break  # "12" may still become "12.5" — wait until a delimiter follows
+            items.append(value)
+            self._pos = end
+        self.count += len(items)
+        # Drop consumed text so long replies don't make every feed() rescan from the start
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        return items
+
+    def finish(self) -> None:
+        """Mark the reply complete: sets malformed if parsing stopped at garbage rather than at the end."""
+        if self.closed or not self.started:
+            return
+        self._skip_separators()
+        rest = self._buffer[self._pos:].rstrip()
+        if not rest:
+            return
+        try:
+            _, end = self._decoder.raw_decode(rest)
+        except json.JSONDecodeError as e:
+            # Input that stops early fails at its very end, or inside an unterminated string
+            self.malformed = e.pos < len(rest) and not e.msg.startswith("Unterminated string")
+            return
+        self.malformed = end < len(rest) and rest[end] not in _DELIMITERS
+
+    def _skip_separators(self) -> None:
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in _SEPARATORS:
+            self._pos += 1
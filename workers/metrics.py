@@ -0,0 +1,201 @@
+"""
+Pluggable metrics for the claude runner and the translation pipeline.
+
+Two kinds of data go to the active sink:
+  - ClaudeCallRecord: one per run_claude_p / run_claude_p_async call, with
+    spawn latency, time to first output byte, total duration, prompt and
+    output sizes, exit code and failure reason, tagged by session_prefix and
+    target language
+  - counters: incr("name", amount, **labels) for everything else
+
+Sinks: LoggingSink (default), InMemorySink (tests), PrometheusSink (needs the
+optional prometheus_client package), NullSink. Pick one with HAWK_METRICS_SINK
+("log", "memory", "prometheus", "none") or install one with set_sink().
+"""
+import logging
+import os
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+SINK = os.getenv("HAWK_METRICS_SINK", "log")
+
+
+@dataclass
+class ClaudeCallRecord:
+    session_prefix: str
+    target_language: str | None
+    backend: str
+    prompt_bytes: int
+    output_bytes: int = 0
+    spawn_latency: float | None = None  # seconds until the claude process was running
+    time_to_first_byte: float | None = None  # seconds until the first byte of output
+    duration: float = 0.0
+    exit_code: int | None = None
+    failure: str | None = None  # None on success; "timeout", "killed", "no_slot", ...
+
+
+class MetricsSink:
+    """Base sink: ignores everything. Subclasses override what they support."""
+
+    def record_call(self, call: ClaudeCallRecord) -> None:
+        pass
+
+    def incr(self, name: str, amount: float = 1, **labels: str) -> None:
+        pass
+
+
+class NullSink(MetricsSink):
+    pass
+
+
+class LoggingSink(MetricsSink):
+    """One structured log line per claude call; counters at debug level."""
+
+    def record_call(self, call: ClaudeCallRecord) -> None:
+        logger.info(
+            "claude_call prefix=%s lang=%s backend=%s spawn=%s ttfb=%s duration=%.3f "
+            "prompt_bytes=%d output_bytes=%d exit=%s failure=%s",
+            call.session_prefix, call.target_language, call.backend,
+            _fmt(call.spawn_latency), _fmt(call.time_to_first_byte), call.duration,
+            call.prompt_bytes, call.output_bytes, call.exit_code, call.failure,
+        )
+
+    def incr(self, name: str, amount: float = 1, **labels: str) -> None:
+        logger.debug("metric %s +%s %s", name, amount, labels)
+
+
+class InMemorySink(MetricsSink):
+    """Keeps everything in memory. Thread-safe; meant for tests and load runs."""
+
+    def __init__(self):
+        self.calls: list[ClaudeCallRecord] = []
+        self.counters: dict[tuple, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def record_call(self, call: ClaudeCallRecord) -> None:
+        with self._lock:
+            self.calls.append(call)
+
+    def incr(self, name: str, amount: float = 1, **labels: str) -> None:
+        with self._lock:
+            self.counters[(name, tuple(sorted(labels.items())))] += amount
+
+    def counter(self, name: str, **labels: str) -> float:
+        """Total for `name`, summed over every label set that includes `labels`."""
+        with self._lock:
+            return sum(
+                value for (key, label_items), value in self.counters.items()
+                if key == name and set(labels.items()) <= set(label_items)
+            )
+
+
+class PrometheusSink(MetricsSink):
+    """Exports to a prometheus_client registry (the default registry unless one is given)."""
+
+    def __init__(self, registry=None):
+        try:
+            import prometheus_client
+        except ImportError as e:
+            raise RuntimeError("PrometheusSink requires the prometheus_client package") from e
+        self._prom = prometheus_client
+        self._registry = registry or prometheus_client.REGISTRY
+        labels = ["session_prefix", "target_language", "backend", "failure"]
+        self._calls = prometheus_client.Counter(
+            "hawk_claude_calls_total", "claude -p calls", labels, registry=self._registry,
+        )
+        self._duration = prometheus_client.Histogram(
+            "hawk_claude_call_duration_seconds", "claude -p total duration", labels,
+            registry=self._registry, buckets=(1, 2, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300),
+        )
+        self._spawn = prometheus_client.Histogram(
+            "hawk_claude_spawn_seconds", "time to start the claude process", labels[:3],
+            registry=self._registry, buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2),
+        )
+        self._ttfb = prometheus_client.Histogram(
+            "hawk_claude_first_byte_seconds", "time to first output byte", labels[:3],
+            registry=self._registry, buckets=(0.5, 1, 2, 5, 10, 20, 30, 60),
+        )
+        self._prompt_bytes = prometheus_client.Counter(
+            "hawk_claude_prompt_bytes_total", "prompt bytes sent", labels[:3], registry=self._registry,
+        )
+        self._output_bytes = prometheus_client.Counter(
+            "hawk_claude_output_bytes_total", "output bytes received", labels[:3], registry=self._registry,
+        )
+        self._counters: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def record_call(self, call: ClaudeCallRecord) -> None:
+        base = {
+            "session_prefix": call.session_prefix,
+            "target_language": call.target_language or "",
+            "backend": call.backend,
+        }
+        full = {**base, "failure": call.failure or ""}
+        self._calls.labels(**full).inc()
+        self._duration.labels(**full).observe(call.duration)
+        if call.spawn_latency is not None:
+            self._spawn.labels(**base).observe(call.spawn_latency)
+        if call.time_to_first_byte is not None:
+            self._ttfb.labels(**base).observe(call.time_to_first_byte)
+        self._prompt_bytes.labels(**base).inc(call.prompt_bytes)
+        self._output_bytes.labels(**base).inc(call.output_bytes)
+
+    def incr(self, name: str, amount: float = 1, **labels: str) -> None:
+        metric_name = "hawk_" + name.replace(".", "_").replace("-", "_") + "_total"
+        with self._lock:
+            counter = self._counters.get(metric_name)
+            if counter is None:
+                counter = self._prom.Counter(
+                    metric_name, name, sorted(labels), registry=self._registry,
+                )
+                self._counters[metric_name] = counter
+        if labels:
+            counter.labels(**labels).inc(amount)
+        else:
+            counter.inc(amount)
+
+
+def _fmt(value: float | None) -> str:
+    return "-" if value is None else f"{value:.3f}"
+
+
+_sink: MetricsSink | None = None
+
+
+def get_sink() -> MetricsSink:
+    global _sink
+    if _sink is None:
+        if SINK == "log":
+            _sink = LoggingSink()
+        elif SINK == "memory":
+            _sink = InMemorySink()
+        elif SINK == "prometheus":
+            _sink = PrometheusSink()
+        elif SINK == "none":
+            _sink = NullSink()
+        else:
+            raise ValueError(f"Unknown HAWK_METRICS_SINK: {SINK!r}")
+    return _sink
+
+
+def set_sink(sink: MetricsSink | None) -> None:
+    """Install a sink for this process. None resets to the HAWK_METRICS_SINK default."""
+    global _sink
+    _sink = sink
+
+
+def record_call(call: ClaudeCallRecord) -> None:
+    try:
+        get_sink().record_call(call)
+    except Exception as e:  # metrics must never break a translation
+        logger.warning("Failed to record claude call metrics: %s", e)
+
+
+def incr(name: str, amount: float = 1, **labels: str) -> None:
+    try:
+        get_sink().incr(name, amount, **labels)
+    except Exception as e:
+        logger.warning("Failed to record metric %s: %s", name, e)
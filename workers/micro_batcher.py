@@ -0,0 +1,203 @@
+"""
+Cross-job micro-batching: small jobs for the same target language and
+glossary share one claude call.
+
+Social posts and broadcast scripts produce 1-5 segments, and each would pay
+for a CLI start of its own. A job with at most MAX_SEGMENTS segments left to
+translate queues them in Redis and tries to become the leader for its group
+(target language + glossary version + prompt version):
+
+  - the leader waits up to WINDOW_MS (less once MAX_REQUESTS jobs are
+    queued), takes every queued request in one transaction, translates them
+    together, and pushes each job its own slice of the results
+  - everyone else waits for its reply; if its request is still queued once
+    the window has passed (the leader died before collecting), it takes the
+    request back and translates alone
+
+While the leader translates, it refreshes an alive key for every request it
+took, so a follower waits exactly as long as the shared call (retries and
+bisection included) takes, and gives up within HEARTBEAT seconds of the
+leader dying. A lone job is held for at most the window. Each request
+carries its segments' fuzzy-memory references, which the leader passes on
+to the shared call. Any Redis error translates the job's segments on its own.
+
+  - {prefix}:q:{group}     LIST    queued requests (JSON: id, texts, references)
+  - {prefix}:lead:{group}  STRING  held by the job collecting the current window
+  - {prefix}:alive:{id}    STRING  set while a leader is translating the request
+  - {prefix}:r:{id}        LIST    one reply: JSON list of {translated, needs_review}, or null
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from workers import metrics
+
+logger = logging.getLogger(__name__)
+
+WINDOW_MS = int(os.getenv("HAWK_MICRO_BATCH_WINDOW_MS", "250"))  # 0 disables micro-batching
+MAX_SEGMENTS = int(os.getenv("HAWK_MICRO_BATCH_MAX_SEGMENTS", "5"))  # larger jobs translate on their own
+HEARTBEAT = int(os.getenv("HAWK_MICRO_BATCH_HEARTBEAT", "15"))  # seconds a request stays alive without a leader refresh
+MAX_REQUESTS = 20  # jobs per shared call; the window closes early at this many
+POLL_INTERVAL = 0.02  # seconds between queue checks while the leader's window is open
+REPLY_GRACE = 1.0  # seconds past the window before a queued request is taken back
+
+
+class MicroBatcher:
+    """Coalesces small jobs' segments into shared translate calls through Redis."""
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        window_ms: int = WINDOW_MS,
+        max_segments: int = MAX_SEGMENTS,
+        heartbeat: float = HEARTBEAT,
+        prefix: str = "mb",
+    ):
+        self.redis = redis_client
+        self.window = window_ms / 1000
+        self.max_segments = max_segments
+        self.heartbeat = heartbeat
+        self.prefix = prefix
+
+    def eligible(self, segments: list[dict]) -> bool:
+        return 0 < len(segments) <= self.max_segments
+
+    def translate(
+        self,
+        segments: list[dict],
+        group: str,
+        translate: Callable[[list[dict], list[list]], None],
+        references: list[list] | None = None,
+    ) -> None:
+        """
+        Fill in segments' translations, sharing a call with other jobs queued for group.
+        translate(segments, references) translates segment dicts in place — the leader
+        calls it for everyone's segments at once, and a job falls back to it for its
+        own. references[i] is a JSON-serializable list for segments[i].
+        """
+        group = hashlib.sha256(group.encode()).hexdigest()[:16]
+        queue_key = f"{self.prefix}:q:{group}"
+        request_id = uuid.uuid4().hex
+        references = references or [[] for _ in segments]
+        request = json.dumps({"id": request_id, "texts": [s["text"] for s in segments], "references": references})
+        try:
+            pipe = self.redis.pipeline()
+            pipe.rpush(queue_key, request)
+            pipe.expire(queue_key, int(self.window + REPLY_GRACE) + 1)
+            pipe.execute()
+            leader = self.redis.set(
+                f"{self.prefix}:lead:{group}", request_id, nx=True, px=int((self.window + REPLY_GRACE) * 1000)
+            )
+            if leader:
+                self._lead(group, translate)
+            results = self._await_reply(request_id, queue_key, request)
+        except RedisError as e:
+            logger.warning("Micro-batcher unavailable, translating alone: %s", e)
+            results = None
+
+        if results is None or len(results) != len(segments):
+            metrics.incr("micro_batch.translated_alone")
+            translate(segments, references)
+            return
+        for seg, result in zip(segments, results):
+            seg["translated"] = result["translated"]
+            if result["needs_review"]:
+                seg["needs_review"] = True
+
+    def _lead(self, group: str, translate: Callable[[list[dict], list[list]], None]) -> None:
+        queue_key = f"{self.prefix}:q:{group}"
+        deadline = time.monotonic() + self.window
+        while time.monotonic() < deadline and self.redis.llen(queue_key) < MAX_REQUESTS:
+            time.sleep(POLL_INTERVAL)
+
+        # Take the queue and open the next window in one step: a job that queues
+        # after this becomes the next leader instead of waiting on this one
+        pipe = self.redis.pipeline()
+        pipe.lrange(queue_key, 0, -1)
+        pipe.delete(queue_key)
+        pipe.delete(f"{self.prefix}:lead:{group}")
+        requests = [json.loads(raw) for raw in pipe.execute()[0]]
+        if not requests:
+            return
+
+        combined = [
+            {"index": i, "text": text, "translated": None}
+            for i, text in enumerate(t for r in requests for t in r["texts"])
+        ]
+        references = [refs for r in requests for refs in r.get("references") or [[] for _ in r["texts"]]]
+        stop = threading.Event()
+        beat = threading.Thread(
+            target=self._keep_alive, args=([r["id"] for r in requests], stop), name="micro-batch-heartbeat", daemon=True
+        )
+        beat.start()
+        try:
+            translate(combined, references)
+            results = [{"translated": s["translated"], "needs_review": bool(s.get("needs_review"))} for s in combined]
+        except Exception:
+            logger.exception("Shared translate call failed for %d jobs", len(requests))
+            results = None
+        finally:
+            stop.set()
+            beat.join()
+
+        pipe = self.redis.pipeline()
+        start = 0
+        for request in requests:
+            reply_key = f"{self.prefix}:r:{request['id']}"
+            count = len(request["texts"])
+            pipe.rpush(reply_key, json.dumps(results[start:start + count] if results is not None else None))
+            pipe.expire(reply_key, max(int(self.heartbeat), 1))
+            start += count
+        pipe.execute()
+        metrics.incr("micro_batch.calls")
+        metrics.incr("micro_batch.jobs", len(requests))
+
+    def _keep_alive(self, request_ids: list[str], stop: threading.Event) -> None:
+        """Refresh the taken requests' alive keys every third of HEARTBEAT until stop is set."""
+        while True:
+            try:
+                pipe = self.redis.pipeline()
+                for request_id in request_ids:
+                    pipe.set(f"{self.prefix}:alive:{request_id}", 1, px=int(self.heartbeat * 1000))
+                pipe.execute()
+            except RedisError as e:
+                logger.warning("Micro-batch heartbeat failed: %s", e)
+                return
+            if stop.wait(self.heartbeat / 3):
+                return
+
+    def _await_reply(self, request_id: str, queue_key: str, request: str) -> list[dict] | None:
+        reply_key = f"{self.prefix}:r:{request_id}"
+        reply = self.redis.blpop([reply_key], timeout=self.window + REPLY_GRACE)
+        if reply is None:
+            if self.redis.lrem(queue_key, 1, request):
+                return None  # never collected: translate alone
+            # A leader took the request: wait for as long as it keeps the request alive.
+            # The first wait covers the moment between taking the queue and the first beat
+            reply = self.redis.blpop([reply_key], timeout=self.heartbeat)
+            while reply is None and self.redis.exists(f"{self.prefix}:alive:{request_id}"):
+                reply = self.redis.blpop([reply_key], timeout=self.heartbeat)
+            if reply is None:
+                return None  # the leader died mid-call
+        return json.loads(reply[1])
+
+
+_batcher: MicroBatcher | None = None
+
+
+def get_micro_batcher() -> MicroBatcher | None:
+    """The process-wide batcher, or None when HAWK_MICRO_BATCH_WINDOW_MS is 0."""
+    global _batcher
+    if WINDOW_MS <= 0:
+        return None
+    if _batcher is None:
+        _batcher = MicroBatcher(Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0")))
+    return _batcher
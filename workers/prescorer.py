@@ -0,0 +1,211 @@
+"""
+Local heuristic pre-scorer: triages segments before claude quality scoring.
+
+Many segments need no model to judge. Bylines, datelines and short captions
+are fine if nothing obvious is wrong with them; output identical to the
+English source, or a translation that dropped a dollar figure, is broken no
+matter what the model would say. prescore() runs these checks:
+
+  - length ratio against the source, around a per-language expectation
+  - share of the translation's words copied over untranslated from the source
+  - numbers (2+ significant digits), dollar signs and bill numbers preserved
+  - glossary target terms that were substituted into the source kept
+  - HTML-sensitive characters (<, >, &) intact
+
+and sorts each segment into one of three verdicts:
+
+  - "fail":      a hard check failed — provisional low score, needs review
+  - "pass":      no check fired and the source is short or only names/numbers
+                 (names and numbers only if the output differs or is trivially
+                 short); never for a segment the translator marked needs_review
+  - "ambiguous": everything else — sent to the claude scorer as before
+
+HAWK_PRESCORE=on uses the verdicts; "eval" still sends every segment to
+claude and reports how many calls the pre-scorer would have avoided and how
+often its verdicts agreed with claude's; "off" disables it.
+"""
+import logging
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+from workers import metrics
+from workers.scorer import ScoreResult
+
+logger = logging.getLogger(__name__)
+
+PRESCORE_MODE = os.getenv("HAWK_PRESCORE", "on")  # "on", "eval" (report only) or "off"
+PASS_MAX_WORDS = int(os.getenv("HAWK_PRESCORE_PASS_MAX_WORDS", "8"))  # longer clean segments still go to claude
+LENGTH_FACTOR = float(os.getenv("HAWK_PRESCORE_LENGTH_FACTOR", "2.5"))  # allowed spread around the expected ratio
+UNTRANSLATED_MAX = float(os.getenv("HAWK_PRESCORE_UNTRANSLATED_MAX", "0.5"))  # share of copied source words
+MIN_LENGTH_CHARS = 40  # shorter sources vary too much in length to judge
+MIN_WORDS_FOR_RATIO = 4  # translations with fewer Latin words are not checked for copied text
+TRIVIAL_MAX_WORDS = 2  # "TRENTON, N.J.", "Jane Doe": may legitimately come back unchanged
+PASS_SCORE = 4.0
+FAIL_SCORE = 1.0
+
+# Expected translation length / source length; languages not listed use DEFAULT_LENGTH_RATIO
+LENGTH_RATIOS = {"zh": 0.35, "ko": 0.6}
+DEFAULT_LENGTH_RATIO = 1.15
+
+_WORD_RE = re.compile(r"[^\W\d_]{3,}")
+# Thousands groups may be split by , . or a (narrow) space: "40,000", "40.000", "40 000"
+_NUMBER_RE = re.compile(r"\d+(?:[,.\u00a0\u202f ]\d{3})*(?:[.,]\d+)?")
+_BILL_RE = re.compile(r"\b[ASH]\.?-?\s?\d{2,5}\b")
+_HTML_CHARS = "<>&"
+_WHITESPACE_RE = re.compile(r"\s+")
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+
+
+@dataclass
+class PreScore:
+    verdict: str  # "pass", "fail" or "ambiguous"
+    flags: list[str] = field(default_factory=list)
+
+    @property
+    def decided(self) -> bool:
+        return self.verdict != "ambiguous"
+
+    @property
+    def provisional(self) -> ScoreResult | None:
+        """The score recorded in place of claude's for a decided segment."""
+        if self.verdict == "pass":
+            return ScoreResult(overall=PASS_SCORE, fluency=PASS_SCORE, accuracy=PASS_SCORE, flags=[])
+        if self.verdict == "fail":
+            return ScoreResult(overall=FAIL_SCORE, fluency=FAIL_SCORE, accuracy=FAIL_SCORE, flags=list(self.flags))
+        return None
+
+
+def _significant_numbers(text: str) -> Counter:
+    """
+    Numbers with separators and trailing zeros dropped, so "1,300", "1.3" and
+    "13" compare equal ("1.3 billion" is "1,300 millones"). Single significant
+    digits are skipped: style guides spell one through nine out.
+    """
+    found = Counter()
+    for match in _NUMBER_RE.findall(text):
+        digits = re.sub(r"\D", "", match).strip("0")
+        if len(digits) >= 2:
+            found[digits] += 1
+    return found
+
+
+def _source_words(text: str) -> set[str]:
+    """Lowercase words of the source — capitalized names are expected to carry over."""
+    return {w for w in _WORD_RE.findall(text) if w[0].islower()}
+
+
+def _normalized(text: str) -> str:
+    """Case, punctuation and spacing dropped: "NJ Transit Fare Hike Approved." matches its source."""
+    return _WHITESPACE_RE.sub(" ", _PUNCTUATION_RE.sub(" ", text)).strip().casefold()
+
+
+def prescore(
+    original: str,
+    translated: str,
+    target_lang: str,
+    glossary_targets: list[str] | None = None,
+    needs_review: bool = False,
+) -> PreScore:
+    """
+    Run the local checks on one segment. glossary_targets are the glossary's
+    target-language terms; needs_review is the translator's own flag (a
+    fallback to source text), which rules out a pass.
+    """
+    source = _WHITESPACE_RE.sub(" ", original).strip()
+    output = _WHITESPACE_RE.sub(" ", translated or "").strip()
+    source_words = _source_words(source)
+    trivial = len(source.split()) <= TRIVIAL_MAX_WORDS
+    unchanged = _normalized(output) == _normalized(source)
+    hard: list[str] = []
+    soft: list[str] = []
+
+    if not output:
+        return PreScore("fail", ["translation is empty"])
+    # Title-case and all-caps headlines have no lowercase words to compare, so any letters count
+    if unchanged and not trivial and any(c.isalpha() for c in source):
+        return PreScore("fail", ["translation is identical to the source"])
+
+    if len(source) >= MIN_LENGTH_CHARS:
+        expected = LENGTH_RATIOS.get(target_lang, DEFAULT_LENGTH_RATIO)
+        ratio = len(output) / len(source)
+        if not expected / LENGTH_FACTOR <= ratio <= expected * LENGTH_FACTOR:
+            hard.append(f"length ratio {ratio:.2f} is far from the expected {expected:.2f}")
+
+    output_words = [w for w in _WORD_RE.findall(output) if w[0].islower()]
+    if len(output_words) >= MIN_WORDS_FOR_RATIO:
+        copied = sum(w in source_words for w in output_words) / len(output_words)
+        if copied > UNTRANSLATED_MAX:
+            hard.append(f"{copied:.0%} of words left untranslated")
+
+    missing_numbers = _significant_numbers(source) - _significant_numbers(output)
+    if missing_numbers:
+        hard.append("numbers missing from translation: " + ", ".join(sorted(missing_numbers)))
+    missing_bills = [b for b in dict.fromkeys(_BILL_RE.findall(source)) if b not in output]
+    if missing_bills:
+        hard.append("bill numbers missing from translation: " + ", ".join(missing_bills))
+    if any(source.count(c) != output.count(c) for c in _HTML_CHARS):
+        hard.append("HTML-sensitive characters (<, >, &) changed")
+
+    if source.count("$") > output.count("$"):
+        soft.append("dollar sign missing from translation")
+    lowered = output.lower()
+    for term in glossary_targets or []:
+        if term and term.lower() in source.lower() and term.lower() not in lowered:
+            soft.append(f"glossary term missing: {term}")
+
+    if hard:
+        return PreScore("fail", hard + soft)
+    if soft:
+        return PreScore("ambiguous", soft)
+    if needs_review:
+        return PreScore("ambiguous", ["marked needs_review by the translator"])
+    if source_words and len(source.split()) <= PASS_MAX_WORDS:
+        return PreScore("pass")
+    # Names and numbers only: fine unchanged when short, otherwise the output must differ
+    if not source_words and (trivial or not unchanged):
+        return PreScore("pass")
+    return PreScore("ambiguous")
+
+
+def prescore_segments(
+    pairs: list[tuple[str, str]],
+    target_lang: str,
+    glossary_targets: list[str] | None = None,
+    needs_review: list[bool] | None = None,
+) -> list[PreScore] | None:
+    """
+    prescore() every (original, translated) pair, or None when HAWK_PRESCORE is
+    off. needs_review, if given, holds the translator's flag for each pair.
+    """
+    if PRESCORE_MODE not in ("on", "eval"):
+        return None
+    flagged = needs_review or [False] * len(pairs)
+    prescores = [
+        prescore(original, translated, target_lang, glossary_targets, review)
+        for (original, translated), review in zip(pairs, flagged)
+    ]
+    for verdict, count in Counter(p.verdict for p in prescores).items():
+        metrics.incr(f"prescorer.{verdict}", count, target_language=target_lang)
+    return prescores
+
+
+def evaluate(prescores: list[PreScore], scores: list[ScoreResult | None], target_lang: str) -> dict:
+    """
+    Compare verdicts with claude's scores for the same segments (eval mode).
+    A pass agrees when claude did not flag the segment for review, a fail when it did.
+    """
+    decided = [(p, s) for p, s in zip(prescores, scores) if p.decided]
+    compared = [(p, s) for p, s in decided if s is not None]
+    agreed = sum((p.verdict == "fail") == s.needs_review for p, s in compared)
+    summary = {
+        "segments": len(prescores),
+        "avoidable": len(decided),
+        "compared": len(compared),
+        "agreed": agreed,
+    }
+    metrics.incr("prescorer.eval_avoidable", len(decided), target_language=target_lang)
+    metrics.incr("prescorer.eval_agreed", agreed, target_language=target_lang)
+    metrics.incr("prescorer.eval_disagreed", len(compared) - agreed, target_language=target_lang)
+    return summary
@@ -0,0 +1,149 @@
+"""
+Sampled quality scoring for long articles.
+
+A 100-paragraph article does not need a claude score on every paragraph to
+tell reviewers how good the draft is. For jobs with at least
+SAMPLE_MIN_SEGMENTS segments, plan() picks:
+
+  - every segment whose tag is in the tier's "always score" list (headlines)
+  - a stratified random sample of the rest, strata being tag type x length
+    bucket, sized per tier and allocated in proportion to stratum size
+
+The sample is seeded with the job id, so a retried job scores the same
+segments. estimate() turns the scores into an article-level score: the
+always-scored segments count as they are, each stratum contributes its
+sample mean weighted by its size, and the 95% confidence interval comes from
+the stratified variance (with finite population correction).
+
+Per-tier settings: HAWK_SCORE_SAMPLE_SIZE_<TIER> (0 scores every segment)
+and HAWK_SCORE_SAMPLE_ALWAYS_<TIER> (comma-separated tags).
+HAWK_SCORE_SAMPLE_MIN_SEGMENTS=0 disables sampling.
+"""
+import math
+import os
+import random
+import statistics
+from dataclasses import dataclass, field
+
+SAMPLE_MIN_SEGMENTS = int(os.getenv("HAWK_SCORE_SAMPLE_MIN_SEGMENTS", "100"))  # 0 disables sampling
+CONFIDENCE_Z = 1.96  # 95% interval
+LENGTH_BUCKETS = (80, 250)  # characters: short / medium / long
+HEADLINE_TAGS = "h1,h2,h3,h4,h5,h6"
+
+
+@dataclass(frozen=True)
+class SamplingPolicy:
+    sample_size: int  # segments sampled beyond the always-scored ones; 0 scores every segment
+    always_tags: frozenset[str]
+
+
+def _policy(tier: str, sample_size: str, always_tags: str) -> SamplingPolicy:
+    tags = os.getenv(f"HAWK_SCORE_SAMPLE_ALWAYS_{tier.upper()}", always_tags)
+    return SamplingPolicy(
+        sample_size=int(os.getenv(f"HAWK_SCORE_SAMPLE_SIZE_{tier.upper()}", sample_size)),
+        always_tags=frozenset(t.strip() for t in tags.split(",") if t.strip()),
+    )
+
+
+# Certified jobs get a score on every segment; reviewers of reviewed jobs get
+# a larger sample than instant jobs, which nobody reviews
+POLICIES = {
+    "instant": _policy("instant", "30", HEADLINE_TAGS),
+    "reviewed": _policy("reviewed", "50", HEADLINE_TAGS),
+    "certified": _policy("certified", "0", HEADLINE_TAGS),
+}
+
+
+@dataclass
+class SamplePlan:
+    total: int
+    always: list[int]  # segment indexes scored regardless of the sample
+    strata: dict[str, list[int]]  # stratum -> every segment index in it
+    sampled: set[int] = field(default_factory=set)
+
+    @property
+    def selected(self) -> set[int]:
+        return set(self.always) | self.sampled
+
+
+def _stratum(segment: dict) -> str:
+    tag = segment.get("tag") or "p"
+    if tag in ("td", "th"):
+        tag = "table"
+    length = len(segment.get("text") or "")
+    bucket = sum(length >= limit for limit in LENGTH_BUCKETS)
+    return f"{tag}:{('short', 'medium', 'long')[bucket]}"
+
+
+def _allocate(sizes: dict[str, int], sample_size: int) -> dict[str, int]:
+    """Proportional allocation by largest remainder, at least one per stratum when there is room."""
+    total = sum(sizes.values())
+    floor = 1 if sample_size >= len(sizes) else 0
+    shares = {name: sample_size * size / total for name, size in sizes.items()}
+    counts = {name: min(size, max(floor, int(shares[name]))) for name, size in sizes.items()}
+    for name in sorted(sizes, key=lambda n: shares[n] - int(shares[n]), reverse=True):
+        if sum(counts.values()) >= sample_size:
+            break
+        if counts[name] < sizes[name]:
+            counts[name] += 1
+    return counts
+
+
+def plan(segments: list[dict], tier: str, seed: str) -> SamplePlan | None:
+    """The segments to score for a job, or None when every segment should be scored."""
+    policy = POLICIES.get(tier)
+    if policy is None or policy.sample_size <= 0 or SAMPLE_MIN_SEGMENTS <= 0 or len(segments) < SAMPLE_MIN_SEGMENTS:
+        return None
+    always = [s["index"] for s in segments if s.get("tag") in policy.always_tags]
+    strata: dict[str, list[int]] = {}
+    for seg in segments:
+        if seg.get("tag") not in policy.always_tags:
+            strata.setdefault(_stratum(seg), []).append(seg["index"])
+    if sum(len(indexes) for indexes in strata.values()) <= policy.sample_size:
+        return None
+
+    rng = random.Random(seed)
+    result = SamplePlan(total=len(segments), always=always, strata=strata)
+    counts = _allocate({name: len(indexes) for name, indexes in strata.items()}, policy.sample_size)
+    for name in sorted(strata):
+        result.sampled.update(rng.sample(strata[name], counts[name]))
+    return result
+
+
+def estimate(sample_plan: SamplePlan, scores: dict[int, float]) -> dict | None:
+    """
+    Article-level overall score from {segment index: overall score}.
+    Segments without a score (scoring failed) are left out; a stratum with no
+    scored sample drops out of the estimate. None when nothing was scored.
+    """
+    census = [scores[i] for i in sample_plan.always if i in scores]
+    samples = {
+        name: [scores[i] for i in sorted(sample_plan.sampled.intersection(indexes)) if i in scores]
+        for name, indexes in sample_plan.strata.items()
+    }
+    samples = {name: values for name, values in samples.items() if values}
+    population = len(census) + sum(len(sample_plan.strata[name]) for name in samples)
+    if population == 0:
+        return None
+
+    pooled = [v for values in samples.values() for v in values]
+    pooled_variance = statistics.variance(pooled) if len(pooled) > 1 else 0.0
+    total = sum(census)
+    variance = 0.0
+    for name, values in samples.items():
+        size, n = len(sample_plan.strata[name]), len(values)
+        total += size * statistics.mean(values)
+        stratum_variance = statistics.variance(values) if n > 1 else pooled_variance
+        variance += size * size * (1 - n / size) * stratum_variance / n
+
+    mean = total / population
+    margin = CONFIDENCE_Z * math.sqrt(variance) / population
+    return {
+        "method": "stratified_sample",
+        "overall": round(mean, 2),
+        "ci_low": round(max(1.0, mean - margin), 2),
+        "ci_high": round(min(5.0, mean + margin), 2),
+        "confidence": 0.95,
+        "segments_total": sample_plan.total,
+        "segments_scored": len(census) + len(pooled),
+    }
@@ -0,0 +1,87 @@
+"""
+Content-addressed cache of quality scores: a pair scored before is not sent to claude again.
+
+Re-running a job, re-delivering the same article or retrying a pipeline
+scores identical (original, translated, target language) triples. An
+entry's key hashes those three with scoring_prompt_version(), so a change to
+either scoring prompt starts from a clean slate. Entries live in a
+BoundedRedisCache (TTL plus LRU size bound); timeouts and unparseable
+replies (None scores) are never stored.
+
+HAWK_SCORE_CACHE_MAX_ENTRIES=0 disables the cache.
+"""
+import hashlib
+import os
+
+from redis import Redis
+
+from workers import metrics
+from workers.cache import BoundedRedisCache
+from workers.scorer import ScoreResult, scoring_prompt_version
+from workers.translation_memory import normalize_text
+
+SCORE_CACHE_MAX_ENTRIES = int(os.getenv("HAWK_SCORE_CACHE_MAX_ENTRIES", "100000"))  # 0 disables the cache
+SCORE_CACHE_TTL_DAYS = int(os.getenv("HAWK_SCORE_CACHE_TTL_DAYS", "30"))
+
+
+def score_key(original: str, translated: str, target_language: str) -> str:
+    material = "\x1f".join([
+        normalize_text(original), normalize_text(translated), target_language, scoring_prompt_version(),
+    ])
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class ScoreCache:
+    """Scores in a BoundedRedisCache (or anything with get_many/set_many), keyed by score_key()."""
+
+    def __init__(self, cache: BoundedRedisCache):
+        self.cache = cache
+
+    def lookup(self, pairs: list[tuple[str, str]], target_language: str) -> dict[int, ScoreResult]:
+        """Return {position in pairs: score} for every pair scored before."""
+        keys = [score_key(original, translated, target_language) for original, translated in pairs]
+        found = self.cache.get_many(list(dict.fromkeys(keys)))
+        hits = {}
+        for position, key in enumerate(keys):
+            if key in found:
+                try:
+                    hits[position] = ScoreResult(**found[key])
+                except TypeError:
+                    continue  # written by an incompatible version; rescore
+        metrics.incr("score_cache.hits", len(hits), target_language=target_language)
+        metrics.incr("score_cache.misses", len(pairs) - len(hits), target_language=target_language)
+        return hits
+
+    def store(self, pairs: list[tuple[str, str]], scores: list[ScoreResult | None], target_language: str) -> None:
+        items = {
+            score_key(original, translated, target_language): {
+                "overall": score.overall,
+                "fluency": score.fluency,
+                "accuracy": score.accuracy,
+                "flags": score.flags,
+            }
+            for (original, translated), score in zip(pairs, scores)
+            if score is not None
+        }
+        self.cache.set_many(items)
+
+
+_score_cache: ScoreCache | None = None
+
+
+def get_score_cache() -> ScoreCache | None:
+    """The process-wide score cache, or None when HAWK_SCORE_CACHE_MAX_ENTRIES is 0."""
+    global _score_cache
+    if SCORE_CACHE_MAX_ENTRIES <= 0:
+        return None
+    if _score_cache is None:
+        redis_client = Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        _score_cache = ScoreCache(
+            BoundedRedisCache(
+                redis_client,
+                namespace="scores",
+                max_entries=SCORE_CACHE_MAX_ENTRIES,
+                ttl_seconds=SCORE_CACHE_TTL_DAYS * 86400,
+            )
+        )
+    return _score_cache
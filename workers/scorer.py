@@ -1,14 +1,31 @@
+import asyncio
+import hashlib
 import json
 import logging
+import os
+from collections.abc import Callable
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
-from workers.claude_runner import run_claude_p
+from workers import metrics
+from workers.claude_runner import ASYNC_CONCURRENCY, run_claude_p, run_claude_p_async
+from workers.json_stream import JSONArrayStream
+
+if TYPE_CHECKING:
+    from workers.score_cache import ScoreCache
 
 logger = logging.getLogger(__name__)
 
 SCORE_THRESHOLD = 3.0   # segments below this get flagged for human translator review
 SUBPROCESS_TIMEOUT = 30  # seconds — non-blocking: timeout returns None, not a job failure
 MAX_RETRIES = 2          # retry up to 2 times on transient failures (3 attempts total)
+MAX_TEXT_CHARS = 2000    # each original/translation is truncated to this in scoring prompts
+# Batched scoring (score_translations_batch): pairs are packed up to this many
+# characters and SCORE_BATCH_SIZE pairs per call; the timeout grows per pair
+SCORE_CHAR_BUDGET = int(os.getenv("HAWK_SCORE_CHAR_BUDGET", "12000"))
+SCORE_BATCH_SIZE = 25
+SECONDS_PER_PAIR = 3
+MAX_BATCH_TIMEOUT = 180
 
 
 @dataclass
@@ -42,7 +59,91 @@ Respond with ONLY valid JSON, no other text:
 {{"overall": <number>, "fluency": <number>, "accuracy": <number>, "flags": [<strings>]}}"""
 
 
-def score_translation(original: str, translated: str, target_lang: str) -> "ScoreResult | None":
+BATCH_SCORING_PROMPT_TEMPLATE = """Score these translations from English to {target_lang}.
+
+Each item below has an "id", the "original" English and its "translation".
+For each item, evaluate:
+- Fluency: Does it read naturally in {target_lang}? (1-5)
+- Accuracy: Is the meaning preserved? (1-5)
+- Overall: Combined quality score (1-5)
+
+Flag any issues (awkward phrasing, mistranslated terms, changed meaning, etc.)
+
+Respond with ONLY a valid JSON array, one object per item in the same order, no other text:
+[{{"id": <id>, "overall": <number>, "fluency": <number>, "accuracy": <number>, "flags": [<strings>]}}]
+
+{items_json}"""
+
+
+def scoring_prompt_version() -> str:
+    """Fingerprint of both scoring prompts, for score cache keys."""
+    material = SCORING_PROMPT_TEMPLATE + BATCH_SCORING_PROMPT_TEMPLATE
+    return hashlib.sha256(material.encode()).hexdigest()[:16]
+
+
+def _scoring_prompt(original: str, translated: str, target_lang: str) -> str:
+    return SCORING_PROMPT_TEMPLATE.format(
+        target_lang=target_lang,
+        original=original[:MAX_TEXT_CHARS].replace("{", "{{").replace("}", "}}"),
+        translated=translated[:MAX_TEXT_CHARS].replace("{", "{{").replace("}", "}}"),
+    )
+
+
+def _batch_scoring_prompt(pairs: list[tuple[str, str]], target_lang: str) -> str:
+    items = [
+        {"id": i, "original": original[:MAX_TEXT_CHARS], "translation": translated[:MAX_TEXT_CHARS]}
+        for i, (original, translated) in enumerate(pairs)
+    ]
+    return BATCH_SCORING_PROMPT_TEMPLATE.format(
+        target_lang=target_lang, items_json=json.dumps(items, ensure_ascii=False)
+    )
+
+
+def _score_from(data) -> ScoreResult:
+    """ScoreResult from one decoded JSON object; raises KeyError/ValueError/TypeError if malformed."""
+    return ScoreResult(
+        overall=float(data["overall"]),
+        fluency=float(data["fluency"]),
+        accuracy=float(data["accuracy"]),
+        flags=data.get("flags") or [],
+    )
+
+
+def _parse_score(output: str) -> "ScoreResult | None":
+    """Parse claude's JSON reply. Parse errors are unlikely to succeed on retry, so no retry signal."""
+    try:
+        return _score_from(json.loads(output.strip()))
+    except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
+        logger.warning("Quality scoring returned invalid output: %s", e)
+        return None
+
+
+def _parse_score_batch(output: str, count: int) -> dict[int, ScoreResult]:
+    """
+    Usable scores from a batched reply, keyed by item position. Elements are
+    matched by "id" (falling back to their order); malformed elements and
+    anything after a cut-off are simply missing.
+    """
+    scores: dict[int, ScoreResult] = {}
+    for order, data in enumerate(JSONArrayStream().feed(output)):
+        if not isinstance(data, dict):
+            continue
+        position = data.get("id", order)
+        if not isinstance(position, int) or not 0 <= position < count or position in scores:
+            continue
+        try:
+            scores[position] = _score_from(data)
+        except (KeyError, ValueError, TypeError):
+            continue
+    return scores
+
+
+def score_translation(
+    original: str,
+    translated: str,
+    target_lang: str,
+    cache: "ScoreCache | None" = None,
+) -> "ScoreResult | None":
     """
     Score a translation using claude -p subprocess.
 
@@ -54,16 +155,23 @@ def score_translation(original: str, translated: str, target_lang: str) -> "Scor
     Returns None on timeout or invalid output — scoring is advisory.
     A None result means the job still completes; scores are just absent.
     Retries up to MAX_RETRIES times on timeouts or transient failures.
+    A cache (workers/score_cache.py) is consulted first and stores the result.
     """
-    prompt = SCORING_PROMPT_TEMPLATE.format(
-        target_lang=target_lang,
-        original=original[:2000].replace("{", "{{").replace("}", "}}"),
-        translated=translated[:2000].replace("{", "{{").replace("}", "}}"),
-    )
+    if cache is not None:
+        cached = cache.lookup([(original, translated)], target_lang)
+        if cached:
+            return cached[0]
+        score = score_translation(original, translated, target_lang)
+        cache.store([(original, translated)], [score], target_lang)
+        return score
+
+    prompt = _scoring_prompt(original, translated, target_lang)
 
     last_error = None
     for attempt in range(MAX_RETRIES + 1):
-        output = run_claude_p(prompt, session_prefix="scorer", timeout=SUBPROCESS_TIMEOUT)
+        output = run_claude_p(
+            prompt, session_prefix="scorer", timeout=SUBPROCESS_TIMEOUT, target_language=target_lang
+        )
         if output is None:
             last_error = "timeout"
             logger.warning(
@@ -71,21 +179,146 @@ def score_translation(original: str, translated: str, target_lang: str) -> "Scor
                 target_lang, attempt + 1, MAX_RETRIES + 1,
             )
             continue
-        try:
-            data = json.loads(output.strip())
-            return ScoreResult(
-                overall=float(data["overall"]),
-                fluency=float(data["fluency"]),
-                accuracy=float(data["accuracy"]),
-                flags=data.get("flags") or [],
-            )
-        except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
-            # Parse errors are unlikely to succeed on retry — bail immediately
-            logger.warning("Quality scoring returned invalid output: %s", e)
-            return None
+        return _parse_score(output)
 
     logger.warning(
         "Quality scoring exhausted %d attempts for %s (last: %s)",
         MAX_RETRIES + 1, target_lang, last_error,
     )
     return None
+
+
+async def score_translation_async(
+    original: str,
+    translated: str,
+    target_lang: str,
+    limiter: asyncio.Semaphore | None = None,
+) -> "ScoreResult | None":
+    """Awaitable score_translation(): same retries, same None-on-failure contract."""
+    prompt = _scoring_prompt(original, translated, target_lang)
+
+    for attempt in range(MAX_RETRIES + 1):
+        output = await run_claude_p_async(
+            prompt, session_prefix="scorer", timeout=SUBPROCESS_TIMEOUT, limiter=limiter,
+            target_language=target_lang,
+        )
+        if output is None:
+            logger.warning(
+                "Quality scoring timed out for %s (attempt %d/%d)",
+                target_lang, attempt + 1, MAX_RETRIES + 1,
+            )
+            continue
+        return _parse_score(output)
+
+    logger.warning("Quality scoring exhausted %d attempts for %s", MAX_RETRIES + 1, target_lang)
+    return None
+
+
+def score_translations(
+    pairs: list[tuple[str, str]],
+    target_lang: str,
+    concurrency: int = ASYNC_CONCURRENCY,
+) -> list["ScoreResult | None"]:
+    """
+    Score many (original, translated) pairs concurrently from synchronous code.
+
+    Opt-in alternative to calling score_translation() in a loop: up to
+    `concurrency` claude calls run at once. Results are in input order.
+    """
+    async def _score_all():
+        limiter = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(
+            score_translation_async(original, translated, target_lang, limiter=limiter)
+            for original, translated in pairs
+        ))
+
+    return asyncio.run(_score_all())
+
+
+def _pack_pairs(pairs: list[tuple[str, str]]) -> list[list[int]]:
+    """Positions of pairs, in order, split into batches of at most SCORE_CHAR_BUDGET chars and SCORE_BATCH_SIZE pairs."""
+    batches: list[list[int]] = []
+    current: list[int] = []
+    chars = 0
+    for position, (original, translated) in enumerate(pairs):
+        size = min(len(original), MAX_TEXT_CHARS) + min(len(translated), MAX_TEXT_CHARS)
+        if current and (chars + size > SCORE_CHAR_BUDGET or len(current) >= SCORE_BATCH_SIZE):
+            batches.append(current)
+            current, chars = [], 0
+        current.append(position)
+        chars += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _score_batch(pairs: list[tuple[str, str]], target_lang: str) -> dict[int, ScoreResult] | None:
+    """One batched scoring call with retries on timeouts. None when every attempt timed out."""
+    prompt = _batch_scoring_prompt(pairs, target_lang)
+    timeout = min(SUBPROCESS_TIMEOUT + SECONDS_PER_PAIR * len(pairs), MAX_BATCH_TIMEOUT)
+    for attempt in range(MAX_RETRIES + 1):
+        output = run_claude_p(prompt, session_prefix="scorer", timeout=timeout, target_language=target_lang)
+        if output is None:
+            logger.warning(
+                "Batched scoring of %d pairs timed out for %s (attempt %d/%d)",
+                len(pairs), target_lang, attempt + 1, MAX_RETRIES + 1,
+            )
+            continue
+        return _parse_score_batch(output, len(pairs))
+    return None
+
+
+def score_translations_batch(
+    pairs: list[tuple[str, str]],
+    target_lang: str,
+    on_batch: Callable[[list[int], list["ScoreResult | None"]], None] | None = None,
+    cache: "ScoreCache | None" = None,
+) -> list["ScoreResult | None"]:
+    """
+    Score many (original, translated) pairs with one claude call per packed batch.
+
+    Batches are packed by size (_pack_pairs) and answered with a JSON array of
+    ScoreResult-shaped objects. Items missing from a reply or malformed in it
+    are re-scored one at a time with score_translation(); a batch that times
+    out on every attempt scores None throughout, as scoring is advisory.
+    Results are in input order. on_batch(positions, results), if given, is
+    called after each batch so the caller can checkpoint.
+
+    With a cache (workers/score_cache.py), pairs scored before are answered
+    from it up front (reported as one batch) and new scores are stored as
+    each batch finishes.
+    """
+    results: list[ScoreResult | None] = [None] * len(pairs)
+    remaining = list(range(len(pairs)))
+    if cache is not None and pairs:
+        cached = cache.lookup(pairs, target_lang)
+        if cached:
+            hits = sorted(cached)
+            for position in hits:
+                results[position] = cached[position]
+            if on_batch is not None:
+                on_batch(hits, [results[p] for p in hits])
+            remaining = [p for p in remaining if p not in cached]
+
+    for packed in _pack_pairs([pairs[p] for p in remaining]):
+        positions = [remaining[i] for i in packed]
+        batch = [pairs[p] for p in positions]
+        if len(batch) == 1:
+            scored = {0: score_translation(*batch[0], target_lang=target_lang)}
+        else:
+            scored = _score_batch(batch, target_lang)
+            if scored is not None:
+                missing = [i for i in range(len(batch)) if i not in scored]
+                if missing:
+                    metrics.incr("scorer.batch_fallbacks", len(missing), target_language=target_lang)
+                for i in missing:
+                    scored[i] = score_translation(*batch[i], target_lang=target_lang)
+            else:
+                scored = {}
+        for i, position in enumerate(positions):
+            results[position] = scored.get(i)
+        if cache is not None:
+            cache.store(batch, [results[p] for p in positions], target_lang)
+        if on_batch is not None:
+            on_batch(positions, [results[p] for p in positions])
+    return results
@@ -0,0 +1,241 @@
+"""
+Spanish style rules for the translation prompt, split into tagged blocks.
+
+SPANISH_STYLE_RULES is several kilobytes and most batches only need part of
+it: a paragraph with no numbers, acronyms or state names gains nothing from
+those sections. spanish_style_rules() runs a cheap regex classifier over a
+batch's segments and keeps only the blocks whose trigger matches. The full
+rules are sent whenever the classifier is unsure:
+  - there is no text to classify (e.g. when measuring prompt overhead)
+  - a segment is mostly upper case (headlines, all-caps boilerplate), where
+    the acronym and proper-name triggers can't tell words from siglas
+  - it would keep FULL_RULES_FRACTION of the rules or more anyway
+
+HAWK_ES_STYLE_FILTER=0 always sends the full rules.
+"""
+import hashlib
+import os
+import re
+
+STYLE_FILTER = os.getenv("HAWK_ES_STYLE_FILTER", "1") != "0"
+FULL_RULES_FRACTION = 0.75  # share of rule characters above which the full rules are sent
+UPPERCASE_FRACTION = 0.6  # letters in upper case above which a segment counts as all caps
+
+# Style rules for Spanish (es) — distilled from Yuli Delgado's STNS translation guide
+# and validated/expanded via corpus analysis of 506 professionally translated articles.
+# Source guide: resources/SPANISH-TRANSLATION-STYLE-GUIDE.md
+# Corpus analysis: resources/corpus-analysis.md
+STYLE_RULES_HEADER = "Follow these style rules from the STNS translation guide:"
+
+SPANISH_RULE_BLOCKS = {
+    "quotes": """
+QUOTES
+- Introduce with colon, capitalize first word: El informe señala: "Los resultados fueron claros".
+- Add period after quotes ending in ! or ?: "¡Es urgente!".
+- Use straight quotation marks (" "), not Spanish angle quotes (« »).
+""",
+    "oxford_comma": """
+OXFORD COMMA
+- Never use the Oxford comma before "y" or "o" in lists.
+""",
+    "acronyms": """
+ACRONYMS (siglas)
+- First use: Spanish expansion first, then (ACRONYM, por sus siglas en inglés) in parentheses.
+  Example: Servicio de Inmigración y Control de Aduanas (ICE, por sus siglas en inglés)
+- Order always: [Spanish name] ([ACRONYM], por sus siglas en inglés). Never reversed.
+- In headings: full name only; expand in body text.
+- Proper-noun acronyms with 4+ letters: capitalize first letter only (Unesco, not UNESCO).
+- Subsequent uses: acronym alone. No plural "s" or apostrophe on acronyms.
+- Well-known acronyms (FBI, SNAP, AIDS, COVID-19, LGBTQ+) do not need "por sus siglas en inglés".
+""",
+    "dates_times": """
+DATES & TIMES
+- Comma between weekday and date: el martes, 25 de diciembre de 2019
+- Times: lowercase a.m./p.m. with periods: las 3:00 p.m., las 11:59 p.m.
+- Dates: el 15 de marzo de 2025 (day + de + spelled-out month + de + year)
+- Time zone: (hora del este)
+""",
+    "numbers": """
+NUMBERS
+- Numerals for 10 and above; spell out 1-9.
+- Always use numerals for: ages, dimensions, fractions, miles, money, percentages, times.
+- Number ranges: use "a" or "y", not en-dash: paginas 94 a 98
+- Avoid starting a sentence with a numeral.
+""",
+    "money": """
+LARGE NUMBERS & MONEY
+- "1 billion" = "mil millones" (NOT "1 billón" — billón in Spanish != English billion).
+- "1.3 billion" = "1,300 millones" (NOT "1.3 mil millones").
+- "10+ billion" = "10 mil millones".
+- Money uses US-style punctuation: $1,276.50 (NOT $1.276,50).
+- Large dollar amounts: $X millones or $X mil millones. Do NOT add "dólares" after the $ sign.
+  Correct: $20 millones. Incorrect: $20 millones de dólares or $20 dólares.
+- Sub-dollar amounts: use the word "centavos", not the ¢ symbol.
+""",
+    "united_states": """
+UNITED STATES
+- In body text: spell out "Estados Unidos". Never EEUU, EUA, or EE.UU. in body text.
+- In headlines where space is tight: "EE. UU." (space after each period) is acceptable.
+""",
+    "prefixes": """
+PREFIXES
+- No hyphen: expresidente, sociocultural.
+- Hyphen before proper nouns, acronyms, or numbers: anti-Brexit, pro-LGTBQ.
+- Separate before multi-word units: ex vice presidente.
+""",
+    "y_o": """
+"Y/O"
+- Never use "y/o". Use only "o".
+""",
+    "measurements": """
+MEASUREMENTS
+- Keep original US measurements (feet, miles, pounds). Do NOT convert to metric.
+""",
+    "state_names": """
+STATE NAMES (use Spanish where different from English)
+- Nueva Jersey, Nueva York, Nuevo México, Nuevo Hampshire, Pensilvania,
+  Carolina del Norte, Carolina del Sur, Dakota del Norte, Dakota del Sur,
+  Luisiana, Míchigan, Misisipi, Misuri, Oregón, Hawái, Virginia Occidental.
+- California, Florida, Alaska, Texas, Montana, Kansas, Massachusetts: same in Spanish.
+- In body text: always write "Nueva Jersey", never the abbreviation "NJ".
+""",
+    "attribution": """
+ATTRIBUTIVE VERBS (match verb to register, do not rotate mechanically)
+- dijo: neutral baseline
+- afirmó: emphatic personal statements
+- declaró: formal or official statements (press releases, legal proceedings)
+- señaló / señala: pointing to data, a document, or a written source
+- explicó / explicaron: elaborations or context-giving remarks
+- comentó: informal or conversational quotes
+- informó: officials relaying factual information
+- sostuvo / argumentaron: formal positions, legal arguments
+- advirtió: warnings
+- Also: expresó, mencionó, manifestó, añadió
+- Do not repeat the same verb in adjacent paragraphs.
+""",
+    "proper_names": """
+PROPER NAMES
+- Never translate official names of publications, programs, brands, or organizations.
+  Keep in English: NJ FamilyCare, Medicaid, Real ID, NJ.com, The New York Times.
+- If clarification is needed: el programa NJ FamilyCare (seguro médico estatal).
+""",
+    "anglicisms": """
+ANGLICISMS
+- English nouns used in US-context Spanish journalism: add required accent and gloss on first use.
+  Example: escuela chárter (autónoma). Do not italicize. Do not apply to proper names.
+""",
+    "bill_numbers": """
+BILL NUMBERS
+- Keep legislative identifiers in English alphanumeric format: A1475, S-3947.
+""",
+    "geography": """
+GEOGRAPHY
+- "county" = "condado": condado de Somerset, condado de Bergen.
+- "Garden State" as a proper epithet = "el Estado Jardín" (capitalized).
+""",
+    "titles": """
+TITLE CAPITALIZATION
+- Capitalize when used as a proper institutional reference: el Gobernador anunció.
+- Lowercase when descriptive before a name: el gobernador Phil Murphy.
+""",
+    "key_terms": """
+KEY TERMS
+- "Humanitarian parole" = "permiso humanitario" (not "libertad condicional humanitaria")
+- ICE = Servicio de Inmigración y Control de Aduanas (ICE, por sus siglas en inglés)
+- ACA = Ley de Atención Médica Asequible (ACA, por sus siglas en inglés)
+- ACLU = Unión Estadounidense por las Libertades Civiles
+- affordable housing = vivienda asequible
+- charter school = escuela chárter (autónoma)
+- school district = distrito escolar / school board = junta escolar
+- budget = presupuesto / bill (legislation) = proyecto de ley
+- immigrants = inmigrantes / migrants = migrantes / deportations = deportaciones
+- GOP = Partido Republicano (or "republicano" adjectivally)
+- primary (election) = primarias / mayor = alcalde / county = condado
+""",
+}
+
+SPANISH_STYLE_RULES = "\n" + "\n\n".join([STYLE_RULES_HEADER, *(b.strip("\n") for b in SPANISH_RULE_BLOCKS.values())]) + "\n"
+
+_STATES = (
+    r"New Jersey|New York|New Mexico|New Hampshire|Pennsylvania|North Carolina|South Carolina|"
+    r"North Dakota|South Dakota|Louisiana|Michigan|Mississippi|Missouri|Oregon|Hawaii|West Virginia|"
+    r"California|Florida|Alaska|Texas|Montana|Kansas|Massachusetts|Virginia|Connecticut|Delaware|"
+    r"Maryland|Ohio|Illinois|Georgia|Arizona|Nevada|Colorado|Washington|Garden State|\bNJ\b|\bNY\b|statewide"
+)
+
+# Trigger per block: the block is sent when any segment in the batch matches
+RULE_TRIGGERS = {
+    "quotes": re.compile(r'["\u201c\u201d]'),
+    "oxford_comma": re.compile(r",\s+(?:and|or)\b"),
+    "acronyms": re.compile(r"\b[A-Z]{2,}s?\b"),
+    "dates_times": re.compile(
+        r"\b(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday|January|February|March|April|May|"
+        r"June|July|August|September|October|November|December|Jan|Feb|Aug|Sept?|Oct|Nov|Dec|today|"
+        r"tonight|yesterday|tomorrow|noon|midnight)\b|\b(?:a\.m\.|p\.m\.)|\d{1,2}:\d{2}|\b(?:19|20)\d{2}\b",
+    ),
+    "numbers": re.compile(
+        r"\d|\b(?:one|two|three|four|five|six|seven|eight|nine|ten|dozen|hundred|percent|half|first|second)\b",
+        re.IGNORECASE,
+    ),
+    "money": re.compile(r"[$\u00a2]|\b(?:dollars?|cents?|million|billion|trillion|budget|funding|tax(?:es)?)\b", re.IGNORECASE),
+    "united_states": re.compile(r"\bU\.?S\.?(?:A\.?)?(?!\w)|\b(?:United States|America|nation(?:al|wide)?|federal)\b"),
+    "prefixes": re.compile(r"\b(?:former|ex|anti|pro|non|co|post|pre|vice|socio|self)-|\b(?:former|vice)\b", re.IGNORECASE),
+    "y_o": re.compile(r"\band/or\b", re.IGNORECASE),
+    "measurements": re.compile(
+        r"\b(?:feet|foot|ft|miles?|pounds?|lbs?|inch(?:es)?|yards?|acres?|gallons?|ounces?|square|degrees)\b",
+        re.IGNORECASE,
+    ),
+    "state_names": re.compile(_STATES),
+    "attribution": re.compile(
+        r"\b(?:said|says|say|told|stated|added|explained|noted|argued|warned|announced|according to|"
+        r"commented|wrote|asked|testified|claimed)\b",
+        re.IGNORECASE,
+    ),
+    "proper_names": re.compile(r"\b[A-Z][a-z]+(?:\s+[A-Z][\w.]*)+|\b(?:Medicaid|Medicare|FamilyCare|Real ID)\b"),
+    "anglicisms": re.compile(r"\b(?:charter|startup|podcast|marketing|software|e-?mail|online|streaming|influencer)\b", re.IGNORECASE),
+    "bill_numbers": re.compile(r"\b[ASH]\.?-?\s?\d{2,5}\b|\b(?:bill|legislation|Assembly|Senate|law(?:makers)?)\b"),
+    "geography": re.compile(r"\b(?:count(?:y|ies)|Garden State|township|borough)\b", re.IGNORECASE),
+    "titles": re.compile(
+        r"\b(?:Gov|Governor|Mayor|President|Senator|Sen|Rep|Commissioner|Superintendent|Secretary|Chief|"
+        r"Director|Chair(?:man|woman)?|Judge|Attorney General)\b\.?",
+        re.IGNORECASE,
+    ),
+    "key_terms": re.compile(
+        r"\b(?:parole|ICE|ACA|ACLU|affordable|charter|school (?:district|board)|budget|bill|immigra\w*|"
+        r"migrants?|deport\w*|GOP|Republican\w*|primary|primaries|mayor|county)\b",
+        re.IGNORECASE,
+    ),
+}
+
+_FULL_CHARS = sum(len(b) for b in SPANISH_RULE_BLOCKS.values())
+_LETTER_RE = re.compile(r"[^\W\d_]")
+
+
+def rules_version() -> str:
+    """Fingerprint of the rules and of how they are selected; part of the translation memory key."""
+    material = SPANISH_STYLE_RULES + "".join(f"{tag}={p.pattern}" for tag, p in RULE_TRIGGERS.items())
+    return hashlib.sha256(material.encode()).hexdigest()[:16]
+
+
+def select_blocks(texts: list[str]) -> list[str] | None:
+    """Tags of the blocks these texts need, in rule order; None when the classifier is unsure."""
+    if not texts or any(_mostly_upper(t) for t in texts):
+        return None
+    joined = "\n".join(texts)
+    tags = [tag for tag, pattern in RULE_TRIGGERS.items() if pattern.search(joined)]
+    if sum(len(SPANISH_RULE_BLOCKS[t]) for t in tags) >= _FULL_CHARS * FULL_RULES_FRACTION:
+        return None
+    return tags
+
+
+def spanish_style_rules(texts: list[str]) -> str:
+    """The style rules section for a batch of source texts."""
+    tags = select_blocks(texts) if STYLE_FILTER else None
+    if tags is None:
+        return SPANISH_STYLE_RULES
+    return "\n" + "\n\n".join([STYLE_RULES_HEADER, *(SPANISH_RULE_BLOCKS[t].strip("\n") for t in tags)]) + "\n"
+
+
+def _mostly_upper(text: str) -> bool:
+    letters = _LETTER_RE.findall(text)
+    return len(letters) >= 12 and sum(c.isupper() for c in letters) / len(letters) > UPPERCASE_FRACTION
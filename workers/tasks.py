@@ -4,13 +4,19 @@ from datetime import datetime, UTC
 import httpx
 
 from db.database import SessionLocal
-from db.models import Glossary, TranslationJob
+from db.models import Organization, TranslationJob
 from review.queue import assign_reviewer
 from workers.celery_app import celery_app
-from workers.glossary import apply_glossary
-from workers.scorer import score_translation
+from workers.checkpoint import JobCheckpoint
+from workers.glossary_cache import CompiledGlossary, get_glossary_cache
+from workers.glossary_stack import StackSpec
+from workers.micro_batcher import get_micro_batcher
+from workers import prescorer, sampling
+from workers.score_cache import get_score_cache
+from workers.scorer import score_translations_batch
 from workers.segmenter import reassemble_html, segment_html
-from workers.translator import translate_segments
+from workers.translation_memory import get_translation_memory
+from workers.translator import BATCH_PARALLELISM, MAX_BATCH_PARALLELISM, translate_segments
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +28,138 @@ def get_db_session():
     return SessionLocal()
 
 
+def _glossary(job: TranslationJob, db) -> CompiledGlossary:
+    """The job's glossary stack (global, language pair, org and request layers), merged and compiled."""
+    return get_glossary_cache().get(StackSpec.for_job(job, stack_glossaries(job, db)), db)
+
+
+def apply_glossary_stack(job: TranslationJob, segments: list[dict], db) -> tuple[list[dict], str]:
+    """Stage 2: apply every glossary layer in one pass. Returns the segments and the glossary version."""
+    glossary = _glossary(job, db)
+    if not glossary.terms:
+        return segments, ""
+    for seg in segments:
+        seg["text"] = glossary.matcher.apply(seg["text"])
+    return segments, glossary.glossary_version
+
+
+def prepare_segments(job: TranslationJob, db) -> tuple[list[dict], str]:
+    """Stages 1-2: segment the job's HTML and apply its glossary. Returns the segments and the glossary version."""
+    return apply_glossary_stack(job, segment_html(job.content), db)
+
+
+def job_parallelism(job: TranslationJob) -> int:
+    """Concurrent translation batches for a job: metadata {"parallelism": n}, else the default."""
+    metadata = job.metadata_json if isinstance(job.metadata_json, dict) else {}
+    try:
+        requested = int(metadata.get("parallelism", BATCH_PARALLELISM))
+    except (TypeError, ValueError):
+        return BATCH_PARALLELISM
+    return min(max(requested, 1), MAX_BATCH_PARALLELISM)
+
+
+def stack_glossaries(job: TranslationJob, db) -> bool:
+    """Add the language and org glossary layers: metadata {"stack_glossaries": bool} if given, else the org's setting."""
+    metadata = job.metadata_json if isinstance(job.metadata_json, dict) else {}
+    if isinstance(metadata.get("stack_glossaries"), bool):
+        return metadata["stack_glossaries"]
+    if job.org_id:
+        org = db.get(Organization, job.org_id)
+        if org is not None:
+            return bool(org.stack_glossaries)
+    return False
+
+
+def defer_scoring(job: TranslationJob, db) -> bool:
+    """Score out of band: metadata {"defer_scoring": bool} if given, else the organization's setting."""
+    metadata = job.metadata_json if isinstance(job.metadata_json, dict) else {}
+    if isinstance(metadata.get("defer_scoring"), bool):
+        return metadata["defer_scoring"]
+    if job.org_id:
+        org = db.get(Organization, job.org_id)
+        if org is not None:
+            return bool(org.defer_scoring)
+    return False
+
+
+def score_segments(job: TranslationJob, checkpoint: JobCheckpoint, db) -> None:
+    """
+    Stage 5: score the checkpoint's unscored segments and set quality_scores_json.
+
+    The local pre-scorer settles clear passes and failures without claude;
+    pairs scored before come from the score cache; the rest are scored in
+    batches (one claude call each). Every finished batch is checkpointed so
+    a retry only scores what is left.
+
+    Long articles are sampled (workers/sampling.py): claude scores only the
+    always-scored and sampled segments, and quality_scores_json becomes
+    {"segments": [...], "estimate": {...}} with an article-level estimate.
+    The pre-scorer never settles a segment in the sample: its fixed
+    provisional scores would bias the estimate and understate its variance.
+    """
+    sample_plan = sampling.plan(checkpoint.segments, job.tier, seed=job.id)
+    pending = checkpoint.pending_scoring()
+    pairs = [(seg["text"], seg.get("translated") or "") for seg in pending]
+
+    def record_batch(positions, results):
+        scores = [
+            {
+                "index": pending[p]["index"],
+                "overall": score.overall,
+                "fluency": score.fluency,
+                "accuracy": score.accuracy,
+                "flags": score.flags,
+                "needs_review": score.needs_review,
+            }
+            for p, score in zip(positions, results)
+            if score
+        ]
+        checkpoint.record_scores([pending[p]["index"] for p in positions], scores)
+
+    prescores = prescorer.prescore_segments(
+        pairs,
+        job.target_language,
+        list(_glossary(job, db).terms.values()) if pending else None,
+        [bool(seg.get("needs_review")) for seg in pending],
+    )
+    to_score = list(range(len(pending)))
+    selected = sample_plan.selected if sample_plan is not None else None
+    if prescores is not None and prescorer.PRESCORE_MODE == "on":
+        decided = [
+            p for p in to_score
+            if prescores[p].decided and (selected is None or pending[p]["index"] not in selected)
+        ]
+        if decided:
+            record_batch(decided, [prescores[p].provisional for p in decided])
+            settled = set(decided)
+            to_score = [p for p in to_score if p not in settled]
+    if selected is not None:
+        to_score = [p for p in to_score if pending[p]["index"] in selected]
+
+    if to_score:
+        results = score_translations_batch(
+            [pairs[p] for p in to_score],
+            target_lang=job.target_language,
+            on_batch=lambda positions, batch: record_batch([to_score[p] for p in positions], batch),
+            cache=get_score_cache(),
+        )
+        if prescores is not None and prescorer.PRESCORE_MODE == "eval":
+            summary = prescorer.evaluate([prescores[p] for p in to_score], results, job.target_language)
+            logger.info(
+                "Pre-scorer eval for job %s: %d of %d claude scoring calls avoidable, %d of %d verdicts agreed",
+                job.id, summary["avoidable"], summary["segments"], summary["agreed"], summary["compared"],
+            )
+
+    all_scores = checkpoint.scores
+    if sample_plan is not None and all_scores:
+        job.quality_scores_json = {
+            "segments": all_scores,
+            "estimate": sampling.estimate(sample_plan, {s["index"]: s["overall"] for s in all_scores}),
+        }
+    else:
+        job.quality_scores_json = all_scores if all_scores else None
+
+
 @celery_app.task(bind=True, max_retries=5)
 def deliver_webhook(self, callback_url: str, job_id: str, payload: dict) -> None:
     if not callback_url.startswith(("http://", "https://")):
@@ -40,7 +178,16 @@ def deliver_webhook(self, callback_url: str, job_id: str, payload: dict) -> None
 
 
 @celery_app.task(bind=True, max_retries=3)
-def run_translation_pipeline(self, job_id: str) -> None:
+def run_translation_pipeline(self, job_id: str, prepared: dict | None = None) -> None:
+    """
+    Translate one job. prepared ({"segments"}) is passed for the child jobs of
+    a multi-language request, whose parent already ran stage 1; each child
+    applies the glossary stack for its own language.
+
+    Progress is checkpointed on the job (workers/checkpoint.py) after
+    segmentation, after every finished translation batch and after every
+    scoring batch, so a retry resumes from the first unfinished unit.
+    """
     db = None
     job = None
     try:
@@ -55,22 +202,37 @@ def run_translation_pipeline(self, job_id: str) -> None:
         # translator attention. This draft is either delivered directly
         # (instant tier) or handed off to human translators for review.
 
-        # Stage 1: segment HTML content into translatable units
+        # Stages 1-2: segment HTML content into translatable units and apply
+        # glossary substitutions (proper nouns, gov titles, place names)
+        checkpoint = JobCheckpoint(job, db)
+        if checkpoint.stage == "done" or (checkpoint.stage == "scoring" and job.status == "complete"):
+            # Finished, or completed with scoring deferred to score_job
+            logger.info("Job %s already finished; nothing to resume", job_id)
+            return
         job.status = "translating"
         db.commit()
-        segments = segment_html(job.content)
+        if not checkpoint.started:
+            if prepared is not None:
+                checkpoint.start(*apply_glossary_stack(job, prepared["segments"], db))
+            else:
+                checkpoint.start(*prepare_segments(job, db))
 
-        # Stage 2: apply glossary substitutions (proper nouns, gov titles, place names)
-        glossary_terms = {}
-        if job.glossary_id:
-            glossary = db.get(Glossary, job.glossary_id)
-            if glossary:
-                glossary_terms = glossary.terms_json
-        for seg in segments:
-            seg["text"] = apply_glossary(seg["text"], glossary_terms)
-
-        # Stage 3: generate machine draft via Claude CLI subprocess
-        segments = translate_segments(segments, target_language=job.target_language)
+        # Stage 3: generate machine draft via Claude CLI subprocess; segments
+        # already in the translation memory skip the model, and small jobs
+        # share claude calls with each other. Finished batches are checkpointed.
+        if checkpoint.stage == "translating":
+            translated = translate_segments(
+                checkpoint.pending_translation(),
+                target_language=job.target_language,
+                memory=get_translation_memory(),
+                glossary_version=checkpoint.glossary_version,
+                parallelism=job_parallelism(job),
+                batcher=get_micro_batcher(),
+                on_batch=checkpoint.record_translated,
+            )
+            checkpoint.record_translated(translated)
+            checkpoint.finish_translation()
+        segments = checkpoint.segments
 
         # Stage 4: reassemble translated HTML
         job.translated_content = reassemble_html(segments)
@@ -82,27 +244,12 @@ def run_translation_pipeline(self, job_id: str) -> None:
         # Stage 5: AI quality scoring — flags segments for human translator attention
         # Segments scoring below 3.0 are marked needs_review so human translators
         # can prioritize their effort. Non-blocking: None result is fine.
-        job.status = "scoring"
-        db.commit()
-
-        all_scores = []
-        for seg in segments:
-            score = score_translation(
-                original=seg["text"],
-                translated=seg.get("translated", ""),
-                target_lang=job.target_language,
-            )
-            if score:
-                all_scores.append({
-                    "index": seg["index"],
-                    "overall": score.overall,
-                    "fluency": score.fluency,
-                    "accuracy": score.accuracy,
-                    "flags": score.flags,
-                    "needs_review": score.needs_review,
-                })
-
-        job.quality_scores_json = all_scores if all_scores else None
+        # Deferred instant jobs skip ahead and are scored by score_job.
+        deferred = job.tier == "instant" and defer_scoring(job, db)
+        if not deferred:
+            job.status = "scoring"
+            db.commit()
+            score_segments(job, checkpoint, db)
 
         # Stage 6: instant tier completes here; reviewed/certified tiers hand off
         # to human translators for review, editing, and certification
@@ -118,14 +265,32 @@ def run_translation_pipeline(self, job_id: str) -> None:
 
         db.commit()
 
+        if deferred:
+            # Queued before the webhook promises scores; if the broker won't take
+            # the task, score here so the job isn't left waiting for nothing
+            try:
+                score_job.delay(job_id)
+            except Exception as e:
+                logger.warning("Failed to enqueue deferred scoring for job %s, scoring inline: %s", job_id, e)
+                score_segments(job, checkpoint, db)
+                db.commit()
+                deferred = False
+
         # Stage 7: fire webhook if job is complete
         if job.callback_url and job.status == "complete":
-            deliver_webhook.delay(job.callback_url, job_id, {
+            payload = {
                 "job_id": job_id,
                 "status": job.status,
                 "translated_content": job.translated_content,
                 "quality_scores": job.quality_scores_json,
-            })
+            }
+            if deferred:
+                payload["scores_pending"] = True
+            deliver_webhook.delay(job.callback_url, job_id, payload)
+
+        if deferred:
+            return  # the checkpoint keeps the segments until score_job has scored them
+        checkpoint.finish()
 
     except Exception as exc:
         logger.exception("Pipeline failed for job %s", job_id)
@@ -149,3 +314,108 @@ def run_translation_pipeline(self, job_id: str) -> None:
     finally:
         if db is not None:
             db.close()
+
+
+@celery_app.task(bind=True, max_retries=3)
+def score_job(self, job_id: str) -> None:
+    """
+    Out-of-band stage 5 for an instant job that completed without scores
+    (defer_scoring): score it, attach quality_scores_json and send a
+    "scores_ready" webhook. Scoring is advisory, so a final failure leaves
+    the job complete without scores.
+    """
+    db = None
+    checkpoint = None
+    try:
+        db = get_db_session()
+        job = db.get(TranslationJob, job_id)
+        if not job:
+            logger.error("Job %s not found", job_id)
+            return
+        checkpoint = JobCheckpoint(job, db)
+        if checkpoint.stage != "scoring":
+            logger.info("Job %s has nothing left to score", job_id)
+            return
+
+        score_segments(job, checkpoint, db)
+        db.commit()
+        checkpoint.finish()
+
+        if job.callback_url:
+            deliver_webhook.delay(job.callback_url, job_id, {
+                "job_id": job_id,
+                "event": "scores_ready",
+                "status": job.status,
+                "quality_scores": job.quality_scores_json,
+            })
+    except Exception as exc:
+        logger.exception("Deferred scoring failed for job %s", job_id)
+        if self.request.retries >= self.max_retries:
+            if checkpoint is not None:
+                try:
+                    db.rollback()
+                    checkpoint.finish()  # out of "scoring", so progress stops reporting it
+                except Exception as db_exc:
+                    logger.warning("Failed to close out scoring for job %s: %s", job_id, db_exc)
+            return
+        raise self.retry(exc=exc, countdown=RETRY_COUNTDOWNS[min(self.request.retries, len(RETRY_COUNTDOWNS) - 1)])
+    finally:
+        if db is not None:
+            db.close()
+
+
+@celery_app.task(bind=True, max_retries=3)
+def run_fanout_pipeline(self, parent_id: str) -> None:
+    """
+    Multi-language request: segment the parent's content once, then start one
+    run_translation_pipeline per child (target language), which applies that
+    language's glossary stack.
+    Each child keeps its own status, scores and webhook.
+    """
+    db = None
+    parent = None
+    children = []
+    try:
+        db = get_db_session()
+        parent = db.get(TranslationJob, parent_id)
+        if not parent:
+            logger.error("Job %s not found", parent_id)
+            return
+        children = db.query(TranslationJob).filter(TranslationJob.parent_job_id == parent_id).all()
+
+        parent.status = "translating"
+        db.commit()
+        segments = segment_html(parent.content)
+        # No word_count on the parent: each child records its own, and usage is counted per language
+        parent.status = "dispatched"
+        db.commit()
+    except Exception as exc:
+        logger.exception("Fan-out preparation failed for job %s", parent_id)
+        is_final_failure = self.request.retries >= self.max_retries
+        try:
+            if parent is not None:
+                for job in [parent, *children] if is_final_failure else [parent]:
+                    job.status = "failed"
+                    job.error_message = str(exc)
+                db.commit()
+        except Exception as db_exc:
+            logger.warning("Failed to persist failure status for job %s: %s", parent_id, db_exc)
+        if db is not None:
+            db.close()
+        if is_final_failure:
+            raise exc
+        raise self.retry(exc=exc, countdown=RETRY_COUNTDOWNS[min(self.request.retries, len(RETRY_COUNTDOWNS) - 1)])
+
+    # Dispatched outside the retry path so a broker error can't start a language twice
+    prepared = {"segments": segments}
+    try:
+        for child in children:
+            try:
+                run_translation_pipeline.delay(child.id, prepared)
+            except Exception as e:
+                logger.error("Failed to enqueue pipeline for job %s: %s", child.id, e)
+                child.status = "failed"
+                child.error_message = "Failed to enqueue translation job"
+        db.commit()
+    finally:
+        db.close()
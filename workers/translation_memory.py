@@ -0,0 +1,274 @@
+"""
+Exact-match translation memory: segments translated before are not sent to claude again.
+
+Newsletter sign-up blurbs, bylines and boilerplate disclaimers repeat across
+articles. translate_segments() looks every segment up here before batching
+and stores the model's translations afterwards (never the untranslated
+needs_review fallbacks).
+
+An entry's key hashes the normalized source text, target language, glossary
+version and prompt version, so a glossary edit or a change to the prompt
+template or style rules starts from a clean slate instead of serving stale
+output. Entries live in a BoundedRedisCache (TTL plus LRU size bound).
+
+Stored segments are also added to a fuzzy index (workers/fuzzy_memory.py),
+which near_matches() queries for segments that differ by a date, number or
+name.
+
+An in-flight registry lets concurrent jobs share work: a worker claims the
+entry keys it is about to translate ({namespace}:inflight:{key}, SET NX with
+a TTL), and another job that needs the same segment waits (up to
+HAWK_TM_INFLIGHT_WAIT seconds) for the result to land in the memory instead
+of translating it again.
+
+HAWK_TM_MAX_ENTRIES=0 disables the memory; HAWK_TM_FUZZY_MATCHES=0 disables
+only the fuzzy index; HAWK_TM_INFLIGHT_TTL=0 disables only the registry.
+"""
+import hashlib
+import logging
+import os
+import re
+import time
+import unicodedata
+import uuid
+from typing import TYPE_CHECKING
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from workers import metrics
+from workers.cache import BoundedRedisCache
+
+if TYPE_CHECKING:
+    from workers.fuzzy_memory import FuzzyIndex, FuzzyMatch
+
+TM_MAX_ENTRIES = int(os.getenv("HAWK_TM_MAX_ENTRIES", "200000"))  # 0 disables the memory
+TM_TTL_DAYS = int(os.getenv("HAWK_TM_TTL_DAYS", "90"))
+TM_FUZZY_MATCHES = int(os.getenv("HAWK_TM_FUZZY_MATCHES", "3"))  # near matches per segment; 0 disables
+TM_FUZZY_THRESHOLD = float(os.getenv("HAWK_TM_FUZZY_THRESHOLD", "0.6"))  # minimum shingle similarity
+INFLIGHT_TTL = int(os.getenv("HAWK_TM_INFLIGHT_TTL", "300"))  # seconds a claim lives; 0 disables sharing
+INFLIGHT_MAX_WAIT = int(os.getenv("HAWK_TM_INFLIGHT_WAIT", "120"))  # seconds a job waits on another's claims
+INFLIGHT_POLL_INTERVAL = 0.5  # seconds between memory checks while waiting on another job
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Delete only the claims still holding this registry's token: a claim that
+# expired and was taken over by another worker is left to that worker
+_RELEASE_LUA = """
+local released = 0
+for _, key in ipairs(KEYS) do
+    if redis.call('GET', key) == ARGV[1] then
+        released = released + redis.call('DEL', key)
+    end
+end
+return released
+"""
+
+
+def normalize_text(text: str) -> str:
+    """NFC, collapsed whitespace, trimmed. Case and punctuation are kept — they change the translation."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def entry_key(text: str, target_language: str, glossary_version: str, prompt_version: str) -> str:
+    material = "\x1f".join([normalize_text(text), target_language, glossary_version, prompt_version])
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def _fuzzy_context(target_language: str, glossary_version: str, prompt_version: str) -> str:
+    material = "\x1f".join([target_language, glossary_version, prompt_version])
+    return hashlib.sha256(material.encode()).hexdigest()[:16]
+
+
+class InFlightRegistry:
+    """Short-lived Redis claims on entry keys being translated right now."""
+
+    def __init__(self, redis_client: Redis, prefix: str = "tm:inflight", ttl_seconds: int = INFLIGHT_TTL):
+        self.redis = redis_client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.token = uuid.uuid4().hex
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def claim(self, keys: list[str]) -> list[bool]:
+        """Claim each key; True where this caller now owns it. Fails open (claims everything) if Redis is down."""
+        if not keys:
+            return []
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.set(self._key(key), self.token, nx=True, ex=self.ttl_seconds)
+            return [bool(claimed) for claimed in pipe.execute()]
+        except RedisError as e:
+            logger.warning("In-flight registry unavailable: %s", e)
+            return [True] * len(keys)
+
+    def release(self, keys: list[str]) -> None:
+        if not keys:
+            return
+        try:
+            self.redis.eval(_RELEASE_LUA, len(keys), *[self._key(key) for key in keys], self.token)
+        except RedisError as e:
+            # Claims expire on their own; waiters stop waiting after the TTL at worst
+            logger.warning("Failed to release in-flight claims: %s", e)
+
+    def active(self, keys: list[str]) -> list[bool]:
+        if not keys:
+            return []
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.exists(self._key(key))
+            return [bool(n) for n in pipe.execute()]
+        except RedisError as e:
+            logger.warning("In-flight registry unavailable: %s", e)
+            return [False] * len(keys)
+
+
+class TranslationMemory:
+    """Segment-level memory: exact matches in a BoundedRedisCache (or anything with get_many/set_many), near matches in an optional FuzzyIndex."""
+
+    def __init__(
+        self,
+        cache: BoundedRedisCache,
+        fuzzy: "FuzzyIndex | None" = None,
+        fuzzy_matches: int = TM_FUZZY_MATCHES,
+        fuzzy_threshold: float = TM_FUZZY_THRESHOLD,
+        inflight: InFlightRegistry | None = None,
+    ):
+        self.cache = cache
+        self.fuzzy = fuzzy
+        self.inflight = inflight
+        self.fuzzy_matches = fuzzy_matches
+        self.fuzzy_threshold = fuzzy_threshold
+
+    def lookup(
+        self,
+        texts: list[str],
+        target_language: str,
+        glossary_version: str,
+        prompt_version: str,
+    ) -> dict[int, str]:
+        """Return {position in texts: translation} for every text the memory already holds."""
+        keys = [entry_key(t, target_language, glossary_version, prompt_version) for t in texts]
+        found = self.cache.get_many(list(dict.fromkeys(keys)))
+        hits = {i: found[k] for i, k in enumerate(keys) if k in found}
+        metrics.incr("translation_memory.hits", len(hits), target_language=target_language)
+        metrics.incr("translation_memory.misses", len(texts) - len(hits), target_language=target_language)
+        return hits
+
+    def near_matches(
+        self,
+        texts: list[str],
+        target_language: str,
+        glossary_version: str,
+        prompt_version: str,
+    ) -> "dict[int, list[FuzzyMatch]]":
+        """Return {position in texts: near matches, best first} from the fuzzy index."""
+        if self.fuzzy is None or self.fuzzy_matches <= 0:
+            return {}
+        context = _fuzzy_context(target_language, glossary_version, prompt_version)
+        results = self.fuzzy.query_many(texts, context, limit=self.fuzzy_matches, threshold=self.fuzzy_threshold)
+        found = {position: matches for position, matches in enumerate(results) if matches}
+        metrics.incr("translation_memory.near_matches", len(found), target_language=target_language)
+        return found
+
+    def record_numeric_reuse(self, count: int, target_language: str) -> None:
+        metrics.incr("translation_memory.numeric_reuse", count, target_language=target_language)
+
+    def claim(
+        self,
+        texts: list[str],
+        target_language: str,
+        glossary_version: str,
+        prompt_version: str,
+    ) -> list[bool]:
+        """Claim texts about to be translated. False where another job is already translating it."""
+        if self.inflight is None:
+            return [True] * len(texts)
+        keys = [entry_key(t, target_language, glossary_version, prompt_version) for t in texts]
+        return self.inflight.claim(keys)
+
+    def release(
+        self,
+        texts: list[str],
+        target_language: str,
+        glossary_version: str,
+        prompt_version: str,
+    ) -> None:
+        if self.inflight is not None:
+            self.inflight.release([entry_key(t, target_language, glossary_version, prompt_version) for t in texts])
+
+    def wait_for(
+        self,
+        texts: list[str],
+        target_language: str,
+        glossary_version: str,
+        prompt_version: str,
+        max_wait: float = INFLIGHT_MAX_WAIT,
+    ) -> dict[int, str]:
+        """
+        Wait for other jobs to finish translating texts. Returns {position: translation}
+        for those that landed in the memory; stops early once nothing is in flight.
+        """
+        keys = [entry_key(t, target_language, glossary_version, prompt_version) for t in texts]
+        found: dict[int, str] = {}
+        deadline = time.monotonic() + max_wait
+        while True:
+            waiting = [i for i in range(len(keys)) if i not in found]
+            results = self.cache.get_many([keys[i] for i in waiting])
+            found.update({i: results[keys[i]] for i in waiting if keys[i] in results})
+            waiting = [i for i in waiting if i not in found]
+            if not waiting or time.monotonic() >= deadline:
+                break
+            if self.inflight is None or not any(self.inflight.active([keys[i] for i in waiting])):
+                break  # the other job finished (or gave up) without storing these
+            time.sleep(INFLIGHT_POLL_INTERVAL)
+        metrics.incr("translation_memory.inflight_shared", len(found), target_language=target_language)
+        return found
+
+    def store(
+        self,
+        pairs: list[tuple[str, str]],
+        target_language: str,
+        glossary_version: str,
+        prompt_version: str,
+    ) -> None:
+        """Remember (source text, translation) pairs, in the exact store and the fuzzy index."""
+        if not pairs:
+            return
+        entries = [
+            (entry_key(text, target_language, glossary_version, prompt_version), text, translated)
+            for text, translated in pairs
+        ]
+        self.cache.set_many({key: translated for key, _, translated in entries})
+        if self.fuzzy is not None:
+            self.fuzzy.add_many(entries, _fuzzy_context(target_language, glossary_version, prompt_version))
+        metrics.incr("translation_memory.stores", len(pairs), target_language=target_language)
+
+
+_memory: TranslationMemory | None = None
+
+
+def get_translation_memory() -> TranslationMemory | None:
+    """The process-wide memory, or None when HAWK_TM_MAX_ENTRIES is 0."""
+    global _memory
+    if TM_MAX_ENTRIES <= 0:
+        return None
+    if _memory is None:
+        from workers.fuzzy_memory import RedisFuzzyIndex
+
+        redis_client = Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        ttl_seconds = TM_TTL_DAYS * 86400
+        fuzzy = RedisFuzzyIndex(redis_client, ttl_seconds=ttl_seconds) if TM_FUZZY_MATCHES > 0 else None
+        inflight = InFlightRegistry(redis_client) if INFLIGHT_TTL > 0 else None
+        _memory = TranslationMemory(
+            BoundedRedisCache(redis_client, namespace="tm", max_entries=TM_MAX_ENTRIES, ttl_seconds=ttl_seconds),
+            fuzzy=fuzzy,
+            inflight=inflight,
+        )
+    return _memory
@@ -1,13 +1,34 @@
+import hashlib
 import json
 import logging
-
-from workers.claude_runner import run_claude_p
+import os
+import re
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import astuple
+
+from workers import metrics
+from workers.batching import Batch, get_planner
+from workers.claude_runner import TIMEOUT_FAILURES, capture_calls, run_claude_p
+from workers.fuzzy_memory import FuzzyMatch, reuse_numeric
+from workers.json_stream import JSONArrayStream
+from workers.micro_batcher import MicroBatcher
+from workers.style_rules import SPANISH_STYLE_RULES, rules_version, spanish_style_rules  # noqa: F401 (re-export)
+from workers.translation_memory import TranslationMemory, normalize_text
 
 logger = logging.getLogger(__name__)
 
 SUBPROCESS_TIMEOUT = 60  # longer than scoring — translating full articles
 MAX_RETRIES = 2
-BATCH_SIZE = 50  # segments per claude -p call
+BATCH_SIZE = 50  # max segments per claude -p call; size and timeout come from workers/batching.py
+MAX_REFERENCES = 10  # fuzzy-memory reference translations per prompt
+MAX_RECOVERY_CALLS = 12  # extra calls per batch for bisecting a bad reply
+# Batches of one job translated at once (per-job override: metadata {"parallelism": n}).
+# Real concurrency is also capped by HAWK_CLAUDE_POOL_SIZE and the cluster governor.
+BATCH_PARALLELISM = int(os.getenv("HAWK_TRANSLATE_PARALLELISM", "2"))
+MAX_BATCH_PARALLELISM = 8
 
 SUPPORTED_TARGET_LANGUAGES = {"es", "pt", "ht", "zh", "ko", "ar", "fr", "pl", "hi", "ur"}
 
@@ -25,125 +46,14 @@ LANGUAGE_NAMES = {
 }
 
 TRANSLATION_PROMPT_TEMPLATE = """Translate these English journalism segments to {language_name}.
-
+{references}
 Return a JSON array of translated strings in the same order. No other text.
 
 {segments_json}"""
 
-# Style rules for Spanish (es) — distilled from Yuli Delgado's STNS translation guide
-# and validated/expanded via corpus analysis of 506 professionally translated articles.
-# Source guide: resources/SPANISH-TRANSLATION-STYLE-GUIDE.md
-# Corpus analysis: resources/corpus-analysis.md
-SPANISH_STYLE_RULES = """
-Follow these style rules from the STNS translation guide:
-
-QUOTES
-- Introduce with colon, capitalize first word: El informe señala: "Los resultados fueron claros".
-- Add period after quotes ending in ! or ?: "¡Es urgente!".
-- Use straight quotation marks (" "), not Spanish angle quotes (« »).
-
-OXFORD COMMA
-- Never use the Oxford comma before "y" or "o" in lists.
-
-ACRONYMS (siglas)
-- First use: Spanish expansion first, then (ACRONYM, por sus siglas en inglés) in parentheses.
-  Example: Servicio de Inmigración y Control de Aduanas (ICE, por sus siglas en inglés)
-- Order always: [Spanish name] ([ACRONYM], por sus siglas en inglés). Never reversed.
-- In headings: full name only; expand in body text.
-- Proper-noun acronyms with 4+ letters: capitalize first letter only (Unesco, not UNESCO).
-- Subsequent uses: acronym alone. No plural "s" or apostrophe on acronyms.
-- Well-known acronyms (FBI, SNAP, AIDS, COVID-19, LGBTQ+) do not need "por sus siglas en inglés".
-
-DATES & TIMES
-- Comma between weekday and date: el martes, 25 de diciembre de 2019
-- Times: lowercase a.m./p.m. with periods: las 3:00 p.m., las 11:59 p.m.
-- Dates: el 15 de marzo de 2025 (day + de + spelled-out month + de + year)
-- Time zone: (hora del este)
-
-NUMBERS
-- Numerals for 10 and above; spell out 1-9.
-- Always use numerals for: ages, dimensions, fractions, miles, money, percentages, times.
-- Number ranges: use "a" or "y", not en-dash: paginas 94 a 98
-- Avoid starting a sentence with a numeral.
-- "1 billion" = "mil millones" (NOT "1 billón" — billón in Spanish != English billion).
-- "1.3 billion" = "1,300 millones" (NOT "1.3 mil millones").
-- "10+ billion" = "10 mil millones".
-- Money uses US-style punctuation: $1,276.50 (NOT $1.276,50).
-- Large dollar amounts: $X millones or $X mil millones. Do NOT add "dólares" after the $ sign.
-  Correct: $20 millones. Incorrect: $20 millones de dólares or $20 dólares.
-- Sub-dollar amounts: use the word "centavos", not the ¢ symbol.
-
-UNITED STATES
-- In body text: spell out "Estados Unidos". Never EEUU, EUA, or EE.UU. in body text.
-- In headlines where space is tight: "EE. UU." (space after each period) is acceptable.
-
-PREFIXES
-- No hyphen: expresidente, sociocultural.
-- Hyphen before proper nouns, acronyms, or numbers: anti-Brexit, pro-LGTBQ.
-- Separate before multi-word units: ex vice presidente.
-
-"Y/O"
-- Never use "y/o". Use only "o".
-
-MEASUREMENTS
-- Keep original US measurements (feet, miles, pounds). Do NOT convert to metric.
-
-STATE NAMES (use Spanish where different from English)
-- Nueva Jersey, Nueva York, Nuevo México, Nuevo Hampshire, Pensilvania,
-  Carolina del Norte, Carolina del Sur, Dakota del Norte, Dakota del Sur,
-  Luisiana, Míchigan, Misisipi, Misuri, Oregón, Hawái, Virginia Occidental.
-- California, Florida, Alaska, Texas, Montana, Kansas, Massachusetts: same in Spanish.
-- In body text: always write "Nueva Jersey", never the abbreviation "NJ".
-
-ATTRIBUTIVE VERBS (match verb to register, do not rotate mechanically)
-- dijo: neutral baseline
-- afirmó: emphatic personal statements
-- declaró: formal or official statements (press releases, legal proceedings)
-- señaló / señala: pointing to data, a document, or a written source
-- explicó / explicaron: elaborations or context-giving remarks
-- comentó: informal or conversational quotes
-- informó: officials relaying factual information
-- sostuvo / argumentaron: formal positions, legal arguments
-- advirtió: warnings
-- Also: expresó, mencionó, manifestó, añadió
-- Do not repeat the same verb in adjacent paragraphs.
-
-PROPER NAMES
-- Never translate official names of publications, programs, brands, or organizations.
-  Keep in English: NJ FamilyCare, Medicaid, Real ID, NJ.com, The New York Times.
-- If clarification is needed: el programa NJ FamilyCare (seguro médico estatal).
-
-ANGLICISMS
-- English nouns used in US-context Spanish journalism: add required accent and gloss on first use.
-  Example: escuela chárter (autónoma). Do not italicize. Do not apply to proper names.
-
-BILL NUMBERS
-- Keep legislative identifiers in English alphanumeric format: A1475, S-3947.
-
-GEOGRAPHY
-- "county" = "condado": condado de Somerset, condado de Bergen.
-- "Garden State" as a proper epithet = "el Estado Jardín" (capitalized).
-
-TITLE CAPITALIZATION
-- Capitalize when used as a proper institutional reference: el Gobernador anunció.
-- Lowercase when descriptive before a name: el gobernador Phil Murphy.
-
-KEY TERMS
-- "Humanitarian parole" = "permiso humanitario" (not "libertad condicional humanitaria")
-- ICE = Servicio de Inmigración y Control de Aduanas (ICE, por sus siglas en inglés)
-- ACA = Ley de Atención Médica Asequible (ACA, por sus siglas en inglés)
-- ACLU = Unión Estadounidense por las Libertades Civiles
-- affordable housing = vivienda asequible
-- charter school = escuela chárter (autónoma)
-- school district = distrito escolar / school board = junta escolar
-- budget = presupuesto / bill (legislation) = proyecto de ley
-- immigrants = inmigrantes / migrants = migrantes / deportations = deportaciones
-- GOP = Partido Republicano (or "republicano" adjectivally)
-- primary (election) = primarias / mayor = alcalde / county = condado
-"""
-
+# {style_rules}: the STNS style-guide blocks the batch needs (workers/style_rules.py)
 SPANISH_TRANSLATION_PROMPT_TEMPLATE = """Translate these English journalism segments to Spanish for a US Hispanic audience.
-{style_rules}
+{style_rules}{references}
 Return a JSON array of translated strings in the same order. No other text.
 
 {segments_json}"""
@@ -152,6 +62,12 @@ Return a JSON array of translated strings in the same order. No other text.
 def translate_segments(
     segments: list[dict],
     target_language: str,
+    on_segment: Callable[[dict], None] | None = None,
+    memory: TranslationMemory | None = None,
+    glossary_version: str = "",
+    parallelism: int = BATCH_PARALLELISM,
+    batcher: MicroBatcher | None = None,
+    on_batch: Callable[[list[dict]], None] | None = None,
 ) -> list[dict]:
     """
     Translate all segments to target_language using claude -p subprocess.
@@ -160,6 +76,44 @@ def translate_segments(
     with no external API keys. If a batch fails (timeout or bad JSON), returns
     untranslated text flagged with needs_review=True so jobs still complete and
     human translators can address them in review.
+
+    Claude's reply is parsed incrementally. on_segment, if given, is called
+    with each segment as soon as its translation is parsed, and again if a
+    later failure replaces it with the untranslated fallback. The last call
+    for a segment is authoritative. claude -p runs in its default text mode,
+    which writes the reply when it is done, so with the CLI backend that is
+    when the call returns; only backends that stream stdout (the fake one)
+    deliver segments before the rest of the batch.
+
+    Batches are packed to a per-language character budget with a timeout
+    proportional to their size (workers/batching.py), and every call's
+    latency feeds back into that language's budget.
+
+    Up to `parallelism` batches are in flight at once. Each batch writes its
+    own segments in place, so the result keeps segment order, and each falls
+    back independently. on_segment calls are serialized across batches.
+
+    With a translation memory, segments it already holds are filled in
+    directly and only the misses go to Claude; their translations are stored
+    afterwards. glossary_version identifies the glossary applied to the text.
+    Near matches from the memory's fuzzy index are reused outright when only
+    their numbers differ, and otherwise sent along as reference translations.
+
+    Segments with the same normalized text are translated once and the result
+    copied to every copy. With a memory, each job also claims the segments it
+    sends to Claude in the memory's in-flight registry; a segment another job
+    has already claimed is waited for rather than translated twice.
+
+    With a micro-batcher, a job left with only a few segments to translate
+    shares a claude call with other small jobs for the same language and
+    glossary (workers/micro_batcher.py); on_segment then fires once the
+    shared call returns.
+
+    on_batch, if given, is called with each group of segments whose
+    translations are final — segments filled from the memory, or a finished
+    batch together with any duplicates of its segments — so the caller can
+    checkpoint progress. Calls are made one at a time on the calling thread,
+    never from the batch threads.
     """
     if not segments:
         return segments
@@ -170,59 +124,575 @@ def translate_segments(
             f"Supported: {sorted(SUPPORTED_TARGET_LANGUAGES)}"
         )
 
-    language_name = LANGUAGE_NAMES[target_language]
+    misses = segments
+    references: dict[int, list[FuzzyMatch]] = {}
+    if memory is not None:
+        version = prompt_version(target_language)
+        misses, references = _consult_memory(
+            segments, target_language, memory, glossary_version, version, on_segment
+        )
+        pending = {id(s) for s in misses}
+        if on_batch is not None and len(misses) < len(segments):
+            on_batch([s for s in segments if id(s) not in pending])
+
+    # Repeated text (bylines, boilerplate, table cells) is translated once per job
+    unique, duplicates = _deduplicate(misses)
+    if duplicates:
+        metrics.incr(
+            "translator.segments_deduplicated",
+            sum(len(d) for d in duplicates.values()),
+            target_language=target_language,
+        )
+    callback = _fan_out(on_segment, duplicates)
+    batch_done = _fan_out_batch(on_batch, duplicates)
+    translate = _with_batcher(
+        batcher, target_language, glossary_version, callback, batch_done, references, parallelism
+    )
 
-    for i in range(0, len(segments), BATCH_SIZE):
-        _translate_batch(segments[i : i + BATCH_SIZE], target_language)
+    if memory is None:
+        translate(unique)
+    else:
+        _translate_shared(
+            unique, target_language, callback, batch_done, translate, memory, glossary_version, version
+        )
 
+    for rep in unique:
+        _copy_result(rep, duplicates.get(id(rep), ()))
     return segments
 
 
-def _translate_batch(batch: list[dict], target_language: str) -> None:
-    """Translate a batch of segments in-place. Falls back to untranslated on failure."""
-    language_name = LANGUAGE_NAMES[target_language]
-    texts = [s["text"] for s in batch]
+def _translate_misses(
+    misses: list[dict],
+    target_language: str,
+    on_segment: Callable[[dict], None] | None,
+    references: dict[int, list[FuzzyMatch]],
+    parallelism: int,
+    on_batch: Callable[[list[dict]], None] | None = None,
+) -> None:
+    batches = get_planner().plan(
+        misses, target_language, overhead_chars=_prompt_overhead(target_language), max_segments=BATCH_SIZE
+    )
+    workers = min(max(parallelism, 1), MAX_BATCH_PARALLELISM, len(batches))
+    callback = _serialized(on_segment) if workers > 1 else on_segment
+
+    if workers <= 1:
+        for batch in batches:
+            _translate_batch(batch, target_language, callback, references)
+            if on_batch is not None:
+                on_batch(batch.segments)
+        return
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translate-batch") as pool:
+        futures = {
+            pool.submit(_translate_batch, batch, target_language, callback, references): batch for batch in batches
+        }
+        # on_batch runs here, on the calling thread: callers checkpoint through
+        # their database session, which must not be used from the batch threads
+        for future in as_completed(futures):
+            future.result()  # re-raise anything _translate_batch didn't handle itself
+            if on_batch is not None:
+                on_batch(futures[future].segments)
+
+
+def _with_batcher(
+    batcher: MicroBatcher | None,
+    target_language: str,
+    glossary_version: str,
+    on_segment: Callable[[dict], None] | None,
+    on_batch: Callable[[list[dict]], None] | None,
+    references: dict[int, list[FuzzyMatch]],
+    parallelism: int,
+) -> Callable[[list[dict]], None]:
+    """A function that translates segments in place: small sets through the micro-batcher, the rest directly."""
+    group = f"{target_language}\x1f{glossary_version}\x1f{prompt_version(target_language)}"
+
+    def translate_combined(combined: list[dict], combined_references: list[list]) -> None:
+        # References arrive from other jobs as JSON: [source, translation, similarity] per match
+        by_segment = {
+            id(seg): [FuzzyMatch(*match) for match in matches]
+            for seg, matches in zip(combined, combined_references)
+            if matches
+        }
+        _translate_misses(combined, target_language, None, by_segment, parallelism)
+
+    def translate(misses: list[dict]) -> None:
+        if batcher is None or not batcher.eligible(misses):
+            _translate_misses(misses, target_language, on_segment, references, parallelism, on_batch)
+            return
+        batcher.translate(
+            misses, group, translate_combined, [[astuple(m) for m in references.get(id(seg), [])] for seg in misses]
+        )
+        if on_segment is not None:
+            for seg in misses:
+                on_segment(seg)
+        if on_batch is not None:
+            on_batch(misses)
+
+    return translate
+
+
+def _translate_shared(
+    misses: list[dict],
+    target_language: str,
+    on_segment: Callable[[dict], None] | None,
+    on_batch: Callable[[list[dict]], None] | None,
+    translate: Callable[[list[dict]], None],
+    memory: TranslationMemory,
+    glossary_version: str,
+    version: str,
+) -> None:
+    """
+    Translate misses that no other job is working on, then wait for the ones
+    another job had claimed and translate whatever that job didn't deliver.
+    """
+    claimed = memory.claim([s["text"] for s in misses], target_language, glossary_version, version)
+    owned = [s for s, mine in zip(misses, claimed) if mine]
+    others = [s for s, mine in zip(misses, claimed) if not mine]
+    try:
+        translate(owned)
+        _store(owned, target_language, memory, glossary_version, version)
+    finally:
+        memory.release([s["text"] for s in owned], target_language, glossary_version, version)
+
+    if not others:
+        return
+    found = memory.wait_for([s["text"] for s in others], target_language, glossary_version, version)
+    for position, translated in found.items():
+        others[position]["translated"] = translated
+        if on_segment is not None:
+            on_segment(others[position])
+    if on_batch is not None and found:
+        on_batch([others[position] for position in found])
+    leftover = [s for position, s in enumerate(others) if position not in found]
+    translate(leftover)
+    _store(leftover, target_language, memory, glossary_version, version)
+
+
+def _store(
+    segments: list[dict],
+    target_language: str,
+    memory: TranslationMemory,
+    glossary_version: str,
+    version: str,
+) -> None:
+    translated = [(s["text"], s["translated"]) for s in segments if not s.get("needs_review")]
+    memory.store(translated, target_language, glossary_version, version)
+
+
+def _deduplicate(segments: list[dict]) -> tuple[list[dict], dict[int, list[dict]]]:
+    """
+    Collapse segments with the same normalized text. Returns the first of each
+    group, and the rest of each group keyed by id() of that first segment.
+    """
+    first: dict[str, dict] = {}
+    duplicates: dict[int, list[dict]] = {}
+    for seg in segments:
+        rep = first.setdefault(normalize_text(seg["text"]), seg)
+        if rep is not seg:
+            duplicates.setdefault(id(rep), []).append(seg)
+    return list(first.values()), duplicates
+
+
+def _copy_result(rep: dict, duplicates) -> None:
+    for dup in duplicates:
+        dup["translated"] = rep.get("translated", dup["text"])
+        if rep.get("needs_review"):
+            dup["needs_review"] = True
+        else:
+            dup.pop("needs_review", None)
+
+
+def _fan_out(
+    callback: Callable[[dict], None] | None, duplicates: dict[int, list[dict]]
+) -> Callable[[dict], None] | None:
+    """Wrap on_segment so each update to a translated segment also reaches its duplicates."""
+    if callback is None or not duplicates:
+        return callback
+
+    def wrapper(segment: dict) -> None:
+        callback(segment)
+        for dup in duplicates.get(id(segment), ()):
+            _copy_result(segment, (dup,))
+            callback(dup)
+
+    return wrapper
+
+
+def _fan_out_batch(
+    callback: Callable[[list[dict]], None] | None, duplicates: dict[int, list[dict]]
+) -> Callable[[list[dict]], None] | None:
+    """Wrap on_batch so a finished batch also carries (and fills in) its segments' duplicates."""
+    if callback is None or not duplicates:
+        return callback
+
+    def wrapper(segments: list[dict]) -> None:
+        finished = list(segments)
+        for rep in segments:
+            dups = duplicates.get(id(rep), ())
+            _copy_result(rep, dups)
+            finished.extend(dups)
+        callback(finished)
+
+    return wrapper
+
+
+def _serialized(callback: Callable | None) -> Callable | None:
+    if callback is None:
+        return None
+    lock = threading.Lock()
 
+    def wrapper(arg) -> None:
+        with lock:
+            callback(arg)
+
+    return wrapper
+
+
+def _consult_memory(
+    segments: list[dict],
+    target_language: str,
+    memory: TranslationMemory,
+    glossary_version: str,
+    version: str,
+    on_segment: Callable[[dict], None] | None,
+) -> tuple[list[dict], dict[int, list[FuzzyMatch]]]:
+    """
+    Fill segments from the memory. Returns the segments still needing the
+    model, and near matches to show it keyed by id() of the segment.
+    """
+    hits = memory.lookup([s["text"] for s in segments], target_language, glossary_version, version)
+    for position, translated in hits.items():
+        segments[position]["translated"] = translated
+        if on_segment is not None:
+            on_segment(segments[position])
+    misses = [s for position, s in enumerate(segments) if position not in hits]
+
+    near = memory.near_matches([s["text"] for s in misses], target_language, glossary_version, version)
+    references: dict[int, list[FuzzyMatch]] = {}
+    reused = set()
+    for position, matches in near.items():
+        seg = misses[position]
+        for match in matches:
+            translated = reuse_numeric(match.source, match.translation, seg["text"])
+            if translated is not None:
+                seg["translated"] = translated
+                if on_segment is not None:
+                    on_segment(seg)
+                reused.add(position)
+                break
+        else:
+            references[id(seg)] = matches
+    if reused:
+        memory.record_numeric_reuse(len(reused), target_language)
+    return [s for position, s in enumerate(misses) if position not in reused], references
+
+
+def _prompt_overhead(target_language: str) -> int:
+    """Characters every prompt for target_language carries besides the segments (full style rules, instructions)."""
+    return len(_build_prompt([], target_language))
+
+
+def prompt_version(target_language: str) -> str:
+    """Fingerprint of the prompt template (and style rules) used for target_language."""
     if target_language == "es":
-        prompt = SPANISH_TRANSLATION_PROMPT_TEMPLATE.format(
-            style_rules=SPANISH_STYLE_RULES,
-            segments_json=json.dumps(texts, ensure_ascii=False),
-        )
+        material = SPANISH_TRANSLATION_PROMPT_TEMPLATE + rules_version()
     else:
-        prompt = TRANSLATION_PROMPT_TEMPLATE.format(
-            language_name=language_name,
+        material = TRANSLATION_PROMPT_TEMPLATE
+    return hashlib.sha256(material.encode()).hexdigest()[:16]
+
+
+def _build_prompt(
+    texts: list[str],
+    target_language: str,
+    references: list[FuzzyMatch] | None = None,
+) -> str:
+    references_block = _references_block(references or [])
+    if target_language == "es":
+        return SPANISH_TRANSLATION_PROMPT_TEMPLATE.format(
+            style_rules=spanish_style_rules(texts),
+            references=references_block,
             segments_json=json.dumps(texts, ensure_ascii=False),
         )
+    return TRANSLATION_PROMPT_TEMPLATE.format(
+        language_name=LANGUAGE_NAMES[target_language],
+        references=references_block,
+        segments_json=json.dumps(texts, ensure_ascii=False),
+    )
 
-    last_error = None
-    for attempt in range(MAX_RETRIES + 1):
-        output = run_claude_p(prompt, session_prefix="translator", timeout=SUBPROCESS_TIMEOUT)
-        if output is None:
-            last_error = "timeout"
-            logger.warning(
-                "Translation timed out (attempt %d/%d, batch=%d segments)",
-                attempt + 1, MAX_RETRIES + 1, len(batch),
+
+def _references_block(references: list[FuzzyMatch]) -> str:
+    if not references:
+        return ""
+    lines = [
+        f"- {json.dumps(m.source, ensure_ascii=False)} => {json.dumps(m.translation, ensure_ascii=False)}"
+        for m in references
+    ]
+    return (
+        "\nREFERENCE TRANSLATIONS\n"
+        "Approved translations of similar earlier segments. Keep their wording where the meaning is the same:\n"
+        + "\n".join(lines) + "\n"
+    )
+
+
+def _batch_references(
+    pending: list[dict], references: dict[int, list[FuzzyMatch]] | None
+) -> list[FuzzyMatch]:
+    """The best distinct matches for the segments in this prompt, up to MAX_REFERENCES."""
+    if not references:
+        return []
+    matches = [m for seg in pending for m in references.get(id(seg), [])]
+    matches.sort(key=lambda m: m.similarity, reverse=True)
+    unique: dict[str, FuzzyMatch] = {}
+    for match in matches:
+        unique.setdefault(match.source, match)
+    return list(unique.values())[:MAX_REFERENCES]
+
+
+def _translate_batch(
+    batch: list[dict] | Batch,
+    target_language: str,
+    on_segment: Callable[[dict], None] | None = None,
+    references: dict[int, list[FuzzyMatch]] | None = None,
+) -> None:
+    """
+    Translate a batch of segments in-place. Falls back to untranslated on failure.
+
+    Elements of the reply array are applied as they are parsed. If the reply
+    is cut off (timeout, or a truncated array), the elements that completed
+    are kept and only the remaining segments are retried; a finished reply
+    with an element that doesn't parse keeps the elements before it and sends
+    the rest straight to recovery. references maps id() of a segment to its
+    fuzzy-memory matches.
+
+    When a reply can't be used as-is, its elements are salvaged from fenced,
+    wrapped or prefixed JSON if they line up with the prompt. If that fails
+    too (a malformed element, a reply of the wrong length), the failing
+    segments are split in halves and retried until each bad segment is
+    isolated, within MAX_RECOVERY_CALLS extra calls; only segments that still
+    fail fall back to untranslated text with needs_review=True. Timeouts are
+    not bisected — a slow or unavailable model won't get faster with more calls.
+
+    A Batch from the planner brings its own timeout, and each attempt is
+    reported back to the planner; a plain list uses SUBPROCESS_TIMEOUT.
+    """
+    planned = batch if isinstance(batch, Batch) else None
+    segments = planned.segments if planned else batch
+    timeout = planned.timeout if planned else SUBPROCESS_TIMEOUT
+
+    failed, last_error, unavailable = _run_attempts(
+        segments, target_language, on_segment, references, timeout, planned, MAX_RETRIES + 1
+    )
+    if failed and not unavailable and len(segments) > 1:
+        before = len(failed)
+        budget = [MAX_RECOVERY_CALLS]
+        if len(failed) == 1:
+            failed = _recover(failed, target_language, on_segment, references, budget)
+        else:
+            failed = _bisect(failed, target_language, on_segment, references, budget)
+        if before > len(failed):
+            metrics.incr("translator.segments_recovered", before - len(failed), target_language=target_language)
+            logger.info(
+                "Recovered %d of %d failed segments by bisection (%d calls)",
+                before - len(failed), before, MAX_RECOVERY_CALLS - budget[0],
             )
-            continue
-        try:
-            translations = json.loads(output.strip())
-            if not isinstance(translations, list) or len(translations) != len(batch):
-                raise ValueError(
-                    f"Expected {len(batch)} translations, got "
-                    f"{'non-list' if not isinstance(translations, list) else len(translations)}"
-                )
-            for i, translated_text in enumerate(translations):
-                batch[i]["translated"] = str(translated_text)
-            return
-        except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
-            logger.warning("Translation returned invalid output: %s", e)
-            last_error = str(e)
-            break  # parse errors won't self-resolve — skip remaining retries
+    if not failed:
+        return
 
     logger.warning(
-        "Translation failed for batch of %d segments (last: %s) — returning untranslated",
-        len(batch), last_error,
+        "Translation failed for %d of %d segments (last: %s) — returning untranslated",
+        len(failed), len(segments), last_error,
     )
-    for seg in batch:
+    metrics.incr("translator.segments_fallback", len(failed), target_language=target_language)
+    for seg in failed:
         seg["translated"] = seg["text"]
         seg["needs_review"] = True
+        if on_segment is not None:
+            on_segment(seg)
+
+
+def _bisect(
+    segments: list[dict],
+    target_language: str,
+    on_segment: Callable[[dict], None] | None,
+    references: dict[int, list[FuzzyMatch]] | None,
+    budget: list[int],
+) -> list[dict]:
+    """Retry each half of a failed group separately. Returns the segments that still fail."""
+    mid = len(segments) // 2
+    return (
+        _recover(segments[:mid], target_language, on_segment, references, budget)
+        + _recover(segments[mid:], target_language, on_segment, references, budget)
+    )
+
+
+def _recover(
+    segments: list[dict],
+    target_language: str,
+    on_segment: Callable[[dict], None] | None,
+    references: dict[int, list[FuzzyMatch]] | None,
+    budget: list[int],
+) -> list[dict]:
+    if budget[0] <= 0:
+        return segments
+    budget[0] -= 1
+    timeout = get_planner().timeout_for(
+        target_language, sum(len(s["text"]) for s in segments), _prompt_overhead(target_language)
+    )
+    failed, _, unavailable = _run_attempts(
+        segments, target_language, on_segment, references, timeout, None, 1
+    )
+    if not failed or unavailable or len(segments) == 1:
+        return failed
+    if len(failed) == 1:
+        return _recover(failed, target_language, on_segment, references, budget)
+    return _bisect(failed, target_language, on_segment, references, budget)
+
+
+def _run_attempts(
+    segments: list[dict],
+    target_language: str,
+    on_segment: Callable[[dict], None] | None,
+    references: dict[int, list[FuzzyMatch]] | None,
+    timeout: int,
+    planned: Batch | None,
+    attempts: int,
+) -> tuple[list[dict], str | None, bool]:
+    """
+    Up to `attempts` claude calls for `segments`, keeping streamed prefixes of
+    cut-off replies. Returns (segments still untranslated, last error, whether
+    the last failure was the model not answering in time: no reply, or a
+    timeout that left a partial one).
+    """
+    pending = segments
+    last_error = None
+    for attempt in range(attempts):
+        prompt = _build_prompt(
+            [s["text"] for s in pending], target_language, _batch_references(pending, references)
+        )
+        stream = JSONArrayStream()
+        streamed = False
+        received: list[str | None] = []  # this attempt's elements; None where one was unusable
+
+        def on_output(chunk: str) -> None:
+            nonlocal streamed
+            streamed = True
+            for value in stream.feed(chunk):
+                text = _element_text(value)
+                received.append(text)
+                index = len(received) - 1
+                if index < len(pending) and text is not None:
+                    pending[index]["translated"] = text
+                    if on_segment is not None:
+                        on_segment(pending[index])
+
+        started = time.monotonic()
+        with capture_calls() as calls:
+            output = run_claude_p(
+                prompt, session_prefix="translator", timeout=timeout, on_output=on_output,
+                target_language=target_language,
+            )
+        duration = time.monotonic() - started
+        # `timeout` exits 124 but may leave a partial reply, so output alone can't tell
+        timed_out = any(call.failure in TIMEOUT_FAILURES for call in calls)
+        if planned is not None and (output is not None or timed_out):
+            # Other failures (no governor slot, spawn errors) say nothing about batch size
+            get_planner().observe(
+                target_language,
+                chars=sum(len(s["text"]) for s in pending),
+                duration=duration,
+                timeout=timeout,
+                timed_out=timed_out,
+                full=planned.full and attempt == 0,
+                overhead_chars=len(prompt) - sum(len(s["text"]) for s in pending),
+            )
+        if output is not None and not streamed:
+            on_output(output)  # backend didn't stream; parse the finished reply the same way
+        if output is not None and not timed_out:
+            stream.finish()
+
+        if stream.closed and len(received) == len(pending) and None not in received:
+            return [], None, False
+        if output is not None:
+            salvaged = _salvage_array(output)
+            if salvaged is not None and len(salvaged) == len(pending):
+                metrics.incr("translator.replies_salvaged", target_language=target_language)
+                for seg, text in zip(pending, salvaged):
+                    seg["translated"] = text
+                    if on_segment is not None:
+                        on_segment(seg)
+                return [], None, False
+
+        if stream.closed or (output is not None and not stream.started):
+            # Complete but unusable (wrong length, or not an array): nothing lines up
+            # reliably, and asking the same question again won't change the answer
+            if not stream.closed:
+                last_error = "reply is not a JSON array"
+            elif len(received) != len(pending):
+                last_error = f"Expected {len(pending)} translations, got {len(received)}"
+            else:
+                last_error = "reply has elements that are not text"
+            logger.warning("Translation returned invalid output: %s", last_error)
+            return pending, last_error, False
+
+        usable = received[: len(pending)]
+        arrived = usable.index(None) if None in usable else len(usable)  # an unusable element ends the prefix
+        if stream.malformed:
+            # Finished, but stuck on an element that will never parse: the elements before it
+            # line up, and the rest goes to recovery rather than the same question again
+            last_error = "reply has an element that is not valid JSON"
+            logger.warning("Translation returned invalid output: %s", last_error)
+            return pending[arrived:], last_error, False
+
+        # Cut off mid-array: keep what arrived, retry the rest
+        pending = pending[arrived:]
+        last_error = "timeout" if output is None or timed_out else "truncated output"
+        logger.warning(
+            "Translation %s (attempt %d/%d, batch=%d segments, %d kept)",
+            last_error, attempt + 1, attempts, len(segments), len(segments) - len(pending),
+        )
+        if not pending:
+            return [], None, False
+
+    return pending, last_error, output is None or timed_out
+
+
+def _element_text(value) -> str | None:
+    """A reply element as translated text: strings as-is, {"translation": ...}-style objects unwrapped."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        texts = [v for v in value.values() if isinstance(v, str)]
+        if "translation" in value and isinstance(value["translation"], str):
+            return value["translation"]
+        if len(texts) == 1:
+            return texts[0]
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return None
+
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE)
+
+
+def _salvage_array(output: str) -> list[str] | None:
+    """
+    Find a JSON array of translations in a reply the streaming parser couldn't use:
+    fenced blocks, an object wrapping the array, or an array after prose that
+    itself contains brackets. Returns None unless every element is usable text.
+    """
+    decoder = json.JSONDecoder()
+    candidates = [m.group(1) for m in _FENCE_RE.finditer(output)] + [output]
+    for candidate in candidates:
+        for start in [i for i, ch in enumerate(candidate) if ch in "[{"]:
+            try:
+                value, _ = decoder.raw_decode(candidate, start)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(value, dict):
+                lists = [v for v in value.values() if isinstance(v, list)]
+                value = lists[0] if len(lists) == 1 else None
+            if isinstance(value, list) and value:
+                texts = [_element_text(v) for v in value]
+                if all(t is not None for t in texts):
+                    return texts
+    return None